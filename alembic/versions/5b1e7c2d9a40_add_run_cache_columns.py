@@ -0,0 +1,29 @@
+"""Add LLM cache columns to runs.
+
+Revision ID: 5b1e7c2d9a40
+Revises: 3d4f0f63f3dd
+Create Date: 2025-01-09 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b1e7c2d9a40"
+down_revision = "3d4f0f63f3dd"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("runs", sa.Column("cache_key", sa.String(), nullable=True))
+    op.add_column("runs", sa.Column("cache_json", postgresql.JSONB(), nullable=True))
+    op.create_index("ix_runs_cache_key", "runs", ["cache_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runs_cache_key", table_name="runs")
+    op.drop_column("runs", "cache_json")
+    op.drop_column("runs", "cache_key")
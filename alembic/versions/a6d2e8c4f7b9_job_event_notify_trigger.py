@@ -0,0 +1,54 @@
+"""Publish job status changes with NOTIFY.
+
+Revision ID: a6d2e8c4f7b9
+Revises: f4c8a2d6b1e3
+Create Date: 2025-01-26 00:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a6d2e8c4f7b9"
+down_revision = "f4c8a2d6b1e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NOTIFY is delivered on commit and its payload is capped at 8000 bytes, so rows
+    # with large progress payloads are announced by id and status only.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_job_event() RETURNS trigger AS $$
+        DECLARE
+            payload text := row_to_json(NEW)::text;
+        BEGIN
+            IF octet_length(payload) > 7900 THEN
+                payload := json_build_object(
+                    'id', NEW.id, 'status', NEW.status, 'truncated', true
+                )::text;
+            END IF;
+            PERFORM pg_notify('job_events', payload);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER jobs_notify_event
+        AFTER UPDATE ON jobs
+        FOR EACH ROW
+        WHEN (
+            OLD.status IS DISTINCT FROM NEW.status
+            OR OLD.progress IS DISTINCT FROM NEW.progress
+            OR OLD.error IS DISTINCT FROM NEW.error
+        )
+        EXECUTE FUNCTION notify_job_event()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS jobs_notify_event ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS notify_job_event()")
@@ -0,0 +1,73 @@
+"""Key fact embeddings by (fact_id, embedding_model) and track embedding models.
+
+Revision ID: b7d3e9f1a2c4
+Revises: 5b1e7c2d9a40
+Create Date: 2025-01-16 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7d3e9f1a2c4"
+down_revision = "5b1e7c2d9a40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_constraint("fact_embeddings_pkey", "fact_embeddings", type_="primary")
+    op.create_primary_key("fact_embeddings_pkey", "fact_embeddings", ["fact_id", "embedding_model"])
+    op.create_table(
+        "embedding_models",
+        sa.Column("model", sa.String(), primary_key=True, nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("total_facts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("embedded_facts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_fact_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("activate_when_ready", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("activated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint(
+            "status IN ('BUILDING','READY','ACTIVE','RETIRED','FAILED')",
+            name="embedding_models_status_check",
+        ),
+    )
+    op.create_index(
+        "ix_embedding_models_single_active",
+        "embedding_models",
+        ["status"],
+        unique=True,
+        postgresql_where=sa.text("status = 'ACTIVE'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_embedding_models_single_active", table_name="embedding_models")
+    op.drop_table("embedding_models")
+    # Keep only the newest vector per fact before restoring the single-column key.
+    op.execute(
+        """
+        DELETE FROM fact_embeddings AS stale
+        USING fact_embeddings AS newer
+        WHERE stale.fact_id = newer.fact_id
+          AND (stale.created_at, stale.embedding_model)
+            < (newer.created_at, newer.embedding_model)
+        """
+    )
+    op.drop_constraint("fact_embeddings_pkey", "fact_embeddings", type_="primary")
+    op.create_primary_key("fact_embeddings_pkey", "fact_embeddings", ["fact_id"])
@@ -0,0 +1,25 @@
+"""Add a GIN full-text index on facts.content.
+
+Revision ID: d1a5c8e2f4b6
+Revises: b7d3e9f1a2c4
+Create Date: 2025-01-20 00:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d1a5c8e2f4b6"
+down_revision = "b7d3e9f1a2c4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_facts_content_fts "
+        "ON facts USING gin (to_tsvector('english'::regconfig, content))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_facts_content_fts")
@@ -0,0 +1,34 @@
+"""Add namespace generation counters for retrieval cache invalidation.
+
+Revision ID: e3b7f9a1c5d2
+Revises: d1a5c8e2f4b6
+Create Date: 2025-01-22 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e3b7f9a1c5d2"
+down_revision = "d1a5c8e2f4b6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "namespace_generations",
+        sa.Column("namespace", sa.String(), primary_key=True, nullable=False),
+        sa.Column("generation", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("namespace_generations")
@@ -0,0 +1,26 @@
+"""Add (created_at, id) indexes for keyset-paginated listings.
+
+Revision ID: f4c8a2d6b1e3
+Revises: e3b7f9a1c5d2
+Create Date: 2025-01-24 00:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f4c8a2d6b1e3"
+down_revision = "e3b7f9a1c5d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_runs_owner_created", "runs", ["owner_id", "created_at", "id"])
+    op.create_index("ix_runs_document_created", "runs", ["document_id", "created_at", "id"])
+    op.create_index("ix_metrics_snapshots_created", "metrics_snapshots", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_metrics_snapshots_created", table_name="metrics_snapshots")
+    op.drop_index("ix_runs_document_created", table_name="runs")
+    op.drop_index("ix_runs_owner_created", table_name="runs")
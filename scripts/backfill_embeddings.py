@@ -1,20 +1,45 @@
 import argparse
 import asyncio
+import logging
 
 from opus_blocks.tools.embeddings_backfill import run_backfill
 
 
-async def _run(owner_id: str | None, limit: int | None) -> None:
-    processed = await run_backfill(owner_id=owner_id, limit=limit)
-    print(f"Backfilled embeddings for {processed} facts.")
+async def _run(args: argparse.Namespace) -> None:
+    report = await run_backfill(
+        owner_id=args.owner_id,
+        limit=args.limit,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        checkpoint_path=args.checkpoint,
+        force=args.force,
+    )
+    print(
+        f"Backfilled embeddings for {report.processed} facts "
+        f"({report.skipped} already current) in {report.batches} batches, "
+        f"{report.elapsed_seconds:.1f}s, {report.facts_per_second:.1f} facts/s."
+    )
+    if report.last_id:
+        print(f"Last fact id: {report.last_id}")
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Backfill fact embeddings into vector store.")
     parser.add_argument("--owner-id", default=None, help="Limit to a specific owner UUID.")
     parser.add_argument("--limit", type=int, default=None, help="Limit number of facts.")
+    parser.add_argument("--batch-size", type=int, default=256, help="Facts per batch/commit.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Batches embedded at once.")
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="JSON checkpoint file; an existing one resumes after its last committed fact.",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Re-embed facts already on EMBEDDINGS_MODEL."
+    )
     args = parser.parse_args()
-    asyncio.run(_run(args.owner_id, args.limit))
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args))
 
 
 if __name__ == "__main__":
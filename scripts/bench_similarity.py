@@ -0,0 +1,64 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+from opus_blocks.vector_store.similarity import (
+    embedding_matrix,
+    normalize_vector,
+    rank_by_cosine,
+    top_k,
+)
+
+
+def _python_rank(query: list[float], rows: list[list[float]], k: int) -> list[tuple[int, float]]:
+    norm_q = math.sqrt(sum(x * x for x in query))
+    scored = []
+    for index, row in enumerate(rows):
+        dot = sum(x * y for x, y in zip(query, row, strict=False))
+        norm_r = math.sqrt(sum(x * x for x in row))
+        scored.append((index, dot / (norm_q * norm_r) if norm_q and norm_r else 0.0))
+    return sorted(scored, key=lambda item: item[1], reverse=True)[:k]
+
+
+def _time(func, repeat: int, *args) -> float:  # type: ignore[no-untyped-def]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cosine top-k: pure Python vs NumPy.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--python-max", type=int, default=10_000, help="Skip the Python baseline above this size."
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(args.dim).tolist()
+    normalized = normalize_vector(query)
+    for size in args.sizes:
+        rows = rng.standard_normal((size, args.dim), dtype=np.float32)
+        matrix = embedding_matrix(rows, args.dim)
+        scoring_ms = _time(lambda m, q: top_k(m @ q, args.k), args.repeat, matrix, normalized)
+        line = f"{size:>7} candidates: matmul+argpartition {scoring_ms:8.2f} ms"
+        if size <= args.python_max:
+            # Rows come back from Postgres as Python lists; include the matrix build.
+            row_lists = rows.tolist()
+            numpy_ms = _time(rank_by_cosine, args.repeat, query, row_lists, args.k)
+            python_ms = _time(_python_rank, 1, query, row_lists, args.k)
+            line += (
+                f" | numpy from lists {numpy_ms:8.2f} ms"
+                f" | pure python {python_ms:9.2f} ms ({python_ms / numpy_ms:.1f}x)"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
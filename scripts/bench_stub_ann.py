@@ -0,0 +1,76 @@
+import argparse
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from opus_blocks.vector_store.hnsw import HnswIndex
+from opus_blocks.vector_store.similarity import embedding_matrix, normalize_vector, top_k
+
+
+def _embeddings(rng: np.random.Generator, projection: np.ndarray, count: int) -> np.ndarray:
+    # Real embeddings occupy a low-dimensional manifold of their space; i.i.d. noise in
+    # every dimension would make all neighbours near-equidistant and recall meaningless.
+    latent = rng.standard_normal((count, projection.shape[0]))
+    noise = 0.05 * rng.standard_normal((count, projection.shape[1]))
+    return (latent @ projection + noise).astype(np.float32)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stub ANN (HNSW) recall@k and latency vs exact.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 10_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--intrinsic-dim", type=int, default=24)
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=100)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for size in args.sizes:
+        projection = rng.standard_normal((args.intrinsic_dim, args.dim)) / np.sqrt(args.dim)
+        rows = _embeddings(rng, projection, size)
+        queries = _embeddings(rng, projection, args.queries)
+        keys = [uuid.uuid4() for _ in range(size)]
+        matrix = embedding_matrix(rows, args.dim)
+
+        start = time.perf_counter()
+        truth = [
+            {keys[index] for index, _ in top_k(matrix @ normalize_vector(query), args.k)}
+            for query in queries
+        ]
+        exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+        index = HnswIndex(args.dim, m=args.m, ef_construction=args.ef_construction)
+        start = time.perf_counter()
+        index.add_many(zip(keys, rows, strict=True))
+        build_s = time.perf_counter() - start
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "index.npz"
+            index.save(path)
+            start = time.perf_counter()
+            HnswIndex.load(path)
+            load_ms = (time.perf_counter() - start) * 1000
+
+        print(
+            f"{size:>7} vectors x {args.dim}: build {build_s:7.1f} s | snapshot load "
+            f"{load_ms:7.1f} ms | exact in-memory {exact_ms:7.2f} ms/query"
+        )
+        for ef in args.ef_search:
+            start = time.perf_counter()
+            found = [{key for key, _ in index.search(query, args.k, ef=ef)} for query in queries]
+            search_ms = (time.perf_counter() - start) / len(queries) * 1000
+            recall = sum(
+                len(hits & expected) for hits, expected in zip(found, truth, strict=True)
+            ) / (args.k * len(queries))
+            print(
+                f"    ef_search={ef:<4} recall@{args.k} {recall:6.3f} | {search_ms:7.2f} ms/query"
+            )
+
+
+if __name__ == "__main__":
+    main()
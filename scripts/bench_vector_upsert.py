@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from opus_blocks.core.config import settings
+from opus_blocks.vector_store.base import VectorUpsert
+from opus_blocks.vector_store.chroma import ChromaVectorStore
+
+
+class _NoActiveModelSession:
+    # Embeddings are supplied, so the store only asks which model is active.
+    async def scalar(self, _statement: object) -> None:
+        return None
+
+
+_SESSION = _NoActiveModelSession()
+
+
+def _items(count: int, dim: int, rng: np.random.Generator) -> list[VectorUpsert]:
+    embeddings = rng.standard_normal((count, dim), dtype=np.float32).tolist()
+    return [
+        VectorUpsert(
+            fact_id=uuid.uuid4(), content=f"fact {index}", namespace="bench", embedding=embedding
+        )
+        for index, embedding in enumerate(embeddings)
+    ]
+
+
+async def _per_fact(store: ChromaVectorStore, items: list[VectorUpsert]) -> None:
+    for item in items:
+        await store.upsert_fact(
+            session=_SESSION,  # type: ignore[arg-type]
+            fact_id=item.fact_id,
+            content=item.content,
+            namespace=item.namespace,
+            embedding=item.embedding,
+        )
+
+
+async def _batched(store: ChromaVectorStore, items: list[VectorUpsert]) -> None:
+    await store.upsert_facts(session=_SESSION, items=items)  # type: ignore[arg-type]
+
+
+async def _run(sizes: list[int], dim: int) -> None:
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        line = f"{size:>6} facts:"
+        for label, index in (("per-fact", _per_fact), ("batched", _batched)):
+            with tempfile.TemporaryDirectory() as path:
+                settings.vector_persist_path = path
+                settings.vector_collection = "bench"
+                store = ChromaVectorStore()
+                items = _items(size, dim, rng)
+                start = time.perf_counter()
+                await index(store, items)
+                elapsed = time.perf_counter() - start
+                store.close()
+            line += f" | {label} {elapsed * 1000:9.1f} ms ({size / elapsed:8.0f} facts/s)"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chroma indexing: per-fact vs batched upserts.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 5_000])
+    parser.add_argument("--dim", type=int, default=1536)
+    args = parser.parse_args()
+    asyncio.run(_run(args.sizes, args.dim))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from opus_blocks.db import worker
+from opus_blocks.tasks.runtime import WorkerRuntime
+
+
+async def _task(queries: int) -> None:
+    async with worker.worker_session() as session:
+        for _ in range(queries):
+            await session.execute(text("SELECT 1"))
+
+
+def _bench_per_task_loop(tasks: int, queries: int) -> float:
+    start = time.perf_counter()
+    for _ in range(tasks):
+        asyncio.run(_task(queries))
+    return tasks / (time.perf_counter() - start)
+
+
+def _bench_persistent_loop(tasks: int, queries: int) -> float:
+    runtime = WorkerRuntime()
+    worker.init_worker_engine()
+    runtime.on_shutdown(worker.dispose_worker_engine)
+    runtime.run(_task(queries))
+    start = time.perf_counter()
+    for _ in range(tasks):
+        runtime.run(_task(queries))
+    rate = tasks / (time.perf_counter() - start)
+    runtime.stop()
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare worker tasks/sec: asyncio.run per task vs persistent loop."
+    )
+    parser.add_argument("--tasks", type=int, default=200, help="Tasks per mode.")
+    parser.add_argument("--queries", type=int, default=3, help="DB round trips per task.")
+    args = parser.parse_args()
+
+    per_task = _bench_per_task_loop(args.tasks, args.queries)
+    persistent = _bench_persistent_loop(args.tasks, args.queries)
+    print(f"asyncio.run per task: {per_task:.1f} tasks/sec")
+    print(f"persistent loop:      {persistent:.1f} tasks/sec ({persistent / per_task:.1f}x)")
+    print(f"pool stats: {worker.get_pool_stats()}")
+
+
+if __name__ == "__main__":
+    main()
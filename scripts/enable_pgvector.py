@@ -0,0 +1,30 @@
+import argparse
+import asyncio
+import logging
+
+from opus_blocks.tools.pgvector_schema import run_enable_pgvector
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert fact_embeddings to vector(VECTOR_DIMENSIONS) with an HNSW index."
+    )
+    parser.add_argument(
+        "--drop-mismatched",
+        action="store_true",
+        help="Delete embeddings of another dimension instead of failing (backfill afterwards).",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    result = asyncio.run(run_enable_pgvector(drop_mismatched=args.drop_mismatched))
+    if result["converted"]:
+        print(
+            f"Converted fact_embeddings.embedding to {result['column_type']} "
+            f"({result['dropped']} mismatched embeddings dropped)."
+        )
+    else:
+        print(f"fact_embeddings.embedding is already {result['column_type']}.")
+
+
+if __name__ == "__main__":
+    main()
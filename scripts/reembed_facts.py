@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+import logging
+
+from opus_blocks.services.embedding_models import EmbeddingModelError
+from opus_blocks.services.jobs import enqueue_job
+from opus_blocks.tools.reembed import run_activate, run_reembed, run_start_reembed
+
+
+async def _start(args: argparse.Namespace) -> None:
+    record = await run_start_reembed(args.model, activate_when_ready=args.activate_when_ready)
+    print(f"Re-embedding {record.total_facts} facts with {record.model}.")
+    if args.enqueue:
+        enqueue_job("reembed_facts", record.model)
+        print(f"Queued reembed_facts; progress is at GET /api/v1/embeddings/models/{record.model}")
+        return
+    result = await run_reembed(record.model, batch_size=args.batch_size)
+    if result is not None:
+        print(
+            f"{result['model']} is {result['status']} with "
+            f"{result['embedded_facts']}/{result['total_facts']} facts embedded."
+        )
+
+
+async def _activate(args: argparse.Namespace) -> None:
+    record = await run_activate(args.model, force=args.force)
+    print(f"{record.model} is {record.status}.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build fact embeddings for a new model and switch retrieval to it."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    start = commands.add_parser("start", help="Embed every fact with MODEL next to the active one.")
+    start.add_argument("model")
+    start.add_argument(
+        "--activate-when-ready", action="store_true", help="Switch to MODEL once it is built."
+    )
+    start.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Facts per committed batch (defaults to EMBEDDINGS_REEMBED_BATCH_ROWS).",
+    )
+    start.add_argument(
+        "--enqueue", action="store_true", help="Run on a worker instead of in this process."
+    )
+    start.set_defaults(handler=_start)
+    activate = commands.add_parser("activate", help="Switch retrieval to MODEL.")
+    activate.add_argument("model")
+    activate.add_argument(
+        "--force", action="store_true", help="Activate even if MODEL is not READY."
+    )
+    activate.set_defaults(handler=_activate)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(args.handler(args))
+    except EmbeddingModelError as exc:
+        parser.exit(1, f"{exc}\n")
+
+
+if __name__ == "__main__":
+    main()
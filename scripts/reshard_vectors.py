@@ -0,0 +1,21 @@
+import argparse
+
+from opus_blocks.tools.vector_reshard import run_reshard
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move Chroma records into the collections VECTOR_SHARD_MODE maps them to."
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report what would move without writing."
+    )
+    args = parser.parse_args()
+    moved = run_reshard(batch_size=args.batch_size, dry_run=args.dry_run)
+    verb = "Would move" if args.dry_run else "Moved"
+    print(f"{verb} {sum(moved.values())} vectors into {len(moved)} collections.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import argparse
+import asyncio
+
+from opus_blocks.tools.embedding_cache_warmup import run_warmup
+
+
+async def _run(owner_id: str | None, limit: int | None) -> None:
+    warmed = await run_warmup(owner_id=owner_id, limit=limit)
+    print(f"Warmed embedding cache with {warmed} vectors.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Preload the embedding cache from existing fact_embeddings rows."
+    )
+    parser.add_argument("--owner-id", default=None, help="Limit to a specific owner UUID.")
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Max vectors (defaults to cache size)."
+    )
+    args = parser.parse_args()
+    asyncio.run(_run(args.owner_id, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import uuid
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -7,9 +7,15 @@ from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from opus_blocks.core.config import settings
 from opus_blocks.core.security import decode_access_token
 from opus_blocks.db.session import get_session
 from opus_blocks.models.user import User
+from opus_blocks.services.principal_cache import (
+    Principal,
+    get_principal_cache,
+    record_trusted_claims,
+)
 
 DbSession = Annotated[AsyncSession, Depends(get_session)]
 
@@ -18,10 +24,7 @@ bearer_scheme = HTTPBearer()
 BearerCredentials = Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)]
 
 
-async def get_current_user(
-    credentials: BearerCredentials,
-    session: DbSession,
-) -> User:
+def _token_claims(credentials: HTTPAuthorizationCredentials) -> tuple[uuid.UUID, dict[str, Any]]:
     payload = decode_access_token(credentials.credentials)
     if not payload or "sub" not in payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
@@ -32,12 +35,43 @@ async def get_current_user(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         ) from exc
+    return user_id, payload
+
+
+async def get_current_user(
+    credentials: BearerCredentials,
+    session: DbSession,
+) -> Principal:
+    user_id, _ = _token_claims(credentials)
+    cache = get_principal_cache()
+    principal = cache.get(user_id) if cache is not None else None
+    if principal is not None:
+        return principal
 
     result = await session.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    principal = Principal(id=user.id, email=user.email)
+    if cache is not None:
+        cache.set(principal)
+    return principal
+
+
+async def get_read_user(
+    credentials: BearerCredentials,
+    session: DbSession,
+) -> Principal:
+    # Read-only routes may trust the signed claims outright: a deleted user keeps read
+    # access to their own rows until the token expires, and no lookup is made.
+    if settings.auth_trust_token_claims:
+        user_id, payload = _token_claims(credentials)
+        email = payload.get("email")
+        if isinstance(email, str):
+            record_trusted_claims()
+            return Principal(id=user_id, email=email)
+    return await get_current_user(credentials, session)
 
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+ReadUser = Annotated[Principal, Depends(get_read_user)]
@@ -0,0 +1,48 @@
+from collections.abc import AsyncIterator
+from typing import Annotated, Any, Literal
+
+from fastapi import Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from opus_blocks.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, fetch_page, stream_rows
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+type ListFormat = Literal["json", "ndjson"]
+
+PageLimit = Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)]
+PageCursor = Annotated[str | None, Query()]
+PageFormat = Annotated[ListFormat, Query(alias="format")]
+
+
+async def list_response[T: BaseModel](
+    session: AsyncSession,
+    query: Select[Any],
+    item: type[T],
+    *,
+    response: Response,
+    limit: int | None,
+    output: ListFormat,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> list[T] | StreamingResponse:
+    # JSON returns one page and the cursor of the next in X-Next-Cursor. NDJSON streams
+    # every row after the cursor (up to `limit` if given) straight off a server-side
+    # cursor, one object per line, without building the list in memory.
+    if output == "ndjson":
+        if limit is not None:
+            query = query.limit(limit)
+
+        async def lines() -> AsyncIterator[str]:
+            async for row in stream_rows(session, query):
+                yield item.model_validate(dict(row)).model_dump_json(exclude_unset=True) + "\n"
+
+        return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+    rows, next_cursor = await fetch_page(session, query, limit=limit or page_size)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [item.model_validate(dict(row)) for row in rows]
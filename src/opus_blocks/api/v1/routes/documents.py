@@ -1,27 +1,36 @@
+from collections.abc import AsyncIterator
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, UploadFile, status
+from fastapi import APIRouter, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 
-from opus_blocks.api.deps import CurrentUser, DbSession
+from opus_blocks.api.deps import CurrentUser, DbSession, ReadUser
+from opus_blocks.api.pagination import PageCursor, PageFormat, PageLimit, list_response
 from opus_blocks.core.config import settings
 from opus_blocks.core.rate_limit import rate_limit
 from opus_blocks.schemas.document import DocumentRead
 from opus_blocks.schemas.fact import FactRead, FactWithSpanRead
 from opus_blocks.schemas.job import JobRead
-from opus_blocks.schemas.run import RunRead
+from opus_blocks.schemas.run import RunHeavyField, RunListItem
 from opus_blocks.schemas.span import FactSpanCreate, SpanRead
-from opus_blocks.services.documents import create_document, get_document
+from opus_blocks.services.documents import UPLOAD_CHUNK_BYTES, create_document, get_document
 from opus_blocks.services.facts import (
     create_fact_with_span,
     list_document_facts,
     list_document_facts_with_spans,
 )
 from opus_blocks.services.jobs import create_job, enqueue_job
-from opus_blocks.services.runs import list_document_runs
+from opus_blocks.services.runs import runs_list_query
 
 router = APIRouter(prefix="/documents")
 
 
+async def _read_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        yield chunk
+
+
 @router.post("/upload", response_model=DocumentRead, status_code=status.HTTP_201_CREATED)
 @rate_limit(settings.rate_limit_upload)
 async def upload_document(
@@ -29,12 +38,14 @@ async def upload_document(
     session: DbSession,
     current_user: CurrentUser,
 ) -> DocumentRead:
-    content = await file.read()
-    if not content:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty upload")
+    if file.size is not None and file.size > settings.upload_max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Upload exceeds {settings.upload_max_bytes} bytes",
+        )
 
     filename = file.filename or "upload.bin"
-    document = await create_document(session, current_user.id, filename, content)
+    document = await create_document(session, current_user.id, filename, _read_chunks(file))
     return DocumentRead.model_validate(document)
 
 
@@ -42,7 +53,7 @@ async def upload_document(
 async def get_document_endpoint(
     document_id: UUID,
     session: DbSession,
-    current_user: CurrentUser,
+    current_user: ReadUser,
 ) -> DocumentRead:
     document = await get_document(session, current_user.id, document_id)
     if not document:
@@ -70,21 +81,32 @@ async def extract_facts(
     return JobRead.model_validate(job)
 
 
-@router.get("/{document_id}/runs", response_model=list[RunRead])
+@router.get(
+    "/{document_id}/runs", response_model=list[RunListItem], response_model_exclude_unset=True
+)
 async def list_document_runs_endpoint(
     document_id: UUID,
     session: DbSession,
-    current_user: CurrentUser,
-) -> list[RunRead]:
-    runs = await list_document_runs(session, owner_id=current_user.id, document_id=document_id)
-    return [RunRead.model_validate(run) for run in runs]
+    current_user: ReadUser,
+    response: Response,
+    include: Annotated[list[RunHeavyField] | None, Query()] = None,
+    limit: PageLimit = None,
+    cursor: PageCursor = None,
+    output: PageFormat = "json",
+) -> list[RunListItem] | StreamingResponse:
+    query = runs_list_query(
+        owner_id=current_user.id, document_id=document_id, include=include or (), cursor=cursor
+    )
+    return await list_response(
+        session, query, RunListItem, response=response, limit=limit, output=output
+    )
 
 
 @router.get("/{document_id}/facts", response_model=list[FactRead])
 async def list_facts(
     document_id: UUID,
     session: DbSession,
-    current_user: CurrentUser,
+    current_user: ReadUser,
 ) -> list[FactRead]:
     facts = await list_document_facts(session, owner_id=current_user.id, document_id=document_id)
     return [FactRead.model_validate(fact) for fact in facts]
@@ -94,7 +116,7 @@ async def list_facts(
 async def list_facts_with_spans(
     document_id: UUID,
     session: DbSession,
-    current_user: CurrentUser,
+    current_user: ReadUser,
 ) -> list[FactWithSpanRead]:
     facts = await list_document_facts_with_spans(
         session, owner_id=current_user.id, document_id=document_id
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException, status
+
+from opus_blocks.api.deps import DbSession, ReadUser
+from opus_blocks.schemas.embedding_model import ActiveEmbeddingModelRead, EmbeddingModelRead
+from opus_blocks.services.embedding_models import (
+    get_active_embedding_model,
+    get_embedding_model,
+    list_embedding_models,
+)
+
+# Starting and activating models changes state shared by every user, so those run from
+# scripts/reembed_facts.py; the API only reports progress.
+router = APIRouter(prefix="/embeddings")
+
+
+@router.get("/active", response_model=ActiveEmbeddingModelRead)
+async def get_active_model(session: DbSession, current_user: ReadUser) -> ActiveEmbeddingModelRead:
+    return ActiveEmbeddingModelRead(model=await get_active_embedding_model(session))
+
+
+@router.get("/models", response_model=list[EmbeddingModelRead])
+async def list_models(session: DbSession, current_user: ReadUser) -> list[EmbeddingModelRead]:
+    models = await list_embedding_models(session)
+    return [EmbeddingModelRead.model_validate(model) for model in models]
+
+
+@router.get("/models/{model}", response_model=EmbeddingModelRead)
+async def get_model_progress(
+    model: str, session: DbSession, current_user: ReadUser
+) -> EmbeddingModelRead:
+    record = await get_embedding_model(session, model)
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Embedding model not found"
+        )
+    return EmbeddingModelRead.model_validate(record)
@@ -1,9 +1,18 @@
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from opus_blocks.api.deps import CurrentUser, DbSession
+from opus_blocks.api.deps import DbSession, ReadUser
+from opus_blocks.core.config import settings
 from opus_blocks.schemas.job import JobRead
+from opus_blocks.services.job_events import (
+    TERMINAL_JOB_STATUSES,
+    get_job_event_hub,
+    job_event_stream,
+    next_job_event,
+    refresh_job,
+)
 from opus_blocks.services.jobs import get_job
 
 router = APIRouter(prefix="/jobs")
@@ -13,10 +22,61 @@ router = APIRouter(prefix="/jobs")
 async def get_job_status(
     job_id: UUID,
     session: DbSession,
-    current_user: CurrentUser,
+    current_user: ReadUser,
+    wait: float = Query(default=0, ge=0, le=settings.job_events_max_wait_seconds),
 ) -> JobRead:
+    if not wait:
+        job = await get_job(session, current_user.id, job_id)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+        return JobRead.model_validate(job)
+
+    # Long-poll: answer as soon as the job changes (or after `wait` seconds). Subscribe
+    # before reading so a transition in between is not missed.
+    hub = get_job_event_hub()
+    queue = await hub.subscribe(session, job_id)
+    try:
+        job = await get_job(session, current_user.id, job_id)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+        current = JobRead.model_validate(job)
+        if current.status in TERMINAL_JOB_STATUSES:
+            return current
+        await session.close()
+        event = await next_job_event(queue, timeout=wait)
+        if event is None:
+            return current
+        refreshed = await refresh_job(session, current_user.id, current, event)
+        if refreshed is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+        return refreshed
+    finally:
+        hub.unsubscribe(job_id, queue)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: UUID,
+    session: DbSession,
+    current_user: ReadUser,
+) -> StreamingResponse:
+    hub = get_job_event_hub()
+    queue = await hub.subscribe(session, job_id)
     job = await get_job(session, current_user.id, job_id)
     if not job:
+        hub.unsubscribe(job_id, queue)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
-
-    return JobRead.model_validate(job)
+    current = JobRead.model_validate(job)
+    # The stream holds no pooled connection while it waits for events.
+    await session.close()
+    return StreamingResponse(
+        job_event_stream(
+            session,
+            current_user.id,
+            current,
+            queue,
+            heartbeat_seconds=settings.job_events_heartbeat_seconds,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
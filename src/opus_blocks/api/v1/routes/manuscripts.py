@@ -1,12 +1,14 @@
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 
-from opus_blocks.api.deps import CurrentUser, DbSession
+from opus_blocks.api.deps import CurrentUser, DbSession, ReadUser
+from opus_blocks.api.pagination import PageCursor, PageFormat, PageLimit, list_response
 from opus_blocks.schemas.fact import FactRead, FactWithSpanRead
 from opus_blocks.schemas.manuscript import ManuscriptCreate, ManuscriptRead
 from opus_blocks.schemas.span import SpanRead
-from opus_blocks.services.facts import list_manuscript_facts, list_manuscript_facts_with_spans
+from opus_blocks.services.facts import list_manuscript_facts_with_spans, manuscript_facts_query
 from opus_blocks.services.manuscripts import create_manuscript, get_manuscript
 from opus_blocks.services.manuscripts_documents import add_document_to_manuscript
 
@@ -25,7 +27,7 @@ async def create_manuscript_endpoint(
 
 @router.get("/{manuscript_id}", response_model=ManuscriptRead)
 async def get_manuscript_endpoint(
-    manuscript_id: UUID, session: DbSession, user: CurrentUser
+    manuscript_id: UUID, session: DbSession, user: ReadUser
 ) -> ManuscriptRead:
     manuscript = await get_manuscript(session, owner_id=user.id, manuscript_id=manuscript_id)
     if not manuscript:
@@ -52,17 +54,25 @@ async def attach_document(
 async def list_manuscript_facts_endpoint(
     manuscript_id: UUID,
     session: DbSession,
-    user: CurrentUser,
-) -> list[FactRead]:
-    facts = await list_manuscript_facts(session, owner_id=user.id, manuscript_id=manuscript_id)
-    return [FactRead.model_validate(fact) for fact in facts]
+    user: ReadUser,
+    response: Response,
+    limit: PageLimit = None,
+    cursor: PageCursor = None,
+    output: PageFormat = "json",
+) -> list[FactRead] | StreamingResponse:
+    query = await manuscript_facts_query(
+        session, owner_id=user.id, manuscript_id=manuscript_id, cursor=cursor
+    )
+    return await list_response(
+        session, query, FactRead, response=response, limit=limit, output=output
+    )
 
 
 @router.get("/{manuscript_id}/facts/with-spans", response_model=list[FactWithSpanRead])
 async def list_manuscript_facts_with_spans_endpoint(
     manuscript_id: UUID,
     session: DbSession,
-    user: CurrentUser,
+    user: ReadUser,
 ) -> list[FactWithSpanRead]:
     facts = await list_manuscript_facts_with_spans(
         session, owner_id=user.id, manuscript_id=manuscript_id
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
+from fastapi.responses import StreamingResponse
 
 from opus_blocks.api.deps import DbSession
+from opus_blocks.api.pagination import PageCursor, PageFormat, list_response
+from opus_blocks.retrieval.cache import get_retrieval_cache_stats
+from opus_blocks.retrieval.stats import get_retrieval_stats
 from opus_blocks.schemas.alerts import AlertEventRead
 from opus_blocks.schemas.metrics import MetricsOverview, MetricsSnapshotRead
 from opus_blocks.services.alerts import list_alerts
-from opus_blocks.services.metrics import compute_metrics, default_window, list_snapshots
+from opus_blocks.services.metrics import compute_metrics, default_window, snapshots_list_query
+from opus_blocks.services.principal_cache import get_principal_cache_stats
+from opus_blocks.vector_store.executor import get_vector_executor_stats
 
 router = APIRouter(prefix="/metrics")
 
@@ -20,10 +26,22 @@ async def metrics_overview(
 
 @router.get("/snapshots", response_model=list[MetricsSnapshotRead])
 async def metrics_snapshots(
-    session: DbSession, limit: int = Query(default=30, ge=1, le=200)
-) -> list[MetricsSnapshotRead]:
-    snapshots = await list_snapshots(session, limit=limit)
-    return [MetricsSnapshotRead.model_validate(item) for item in snapshots]
+    session: DbSession,
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=200),
+    cursor: PageCursor = None,
+    output: PageFormat = "json",
+) -> list[MetricsSnapshotRead] | StreamingResponse:
+    query = snapshots_list_query(cursor=cursor)
+    return await list_response(
+        session,
+        query,
+        MetricsSnapshotRead,
+        response=response,
+        limit=limit,
+        output=output,
+        page_size=30,
+    )
 
 
 @router.get("/alerts", response_model=list[AlertEventRead])
@@ -32,3 +50,23 @@ async def metrics_alerts(
 ) -> list[AlertEventRead]:
     alerts = await list_alerts(session, limit=limit)
     return [AlertEventRead.model_validate(item) for item in alerts]
+
+
+@router.get("/vector-store")
+async def metrics_vector_store() -> dict:
+    return get_vector_executor_stats()
+
+
+@router.get("/retrieval")
+async def metrics_retrieval() -> dict:
+    return get_retrieval_stats()
+
+
+@router.get("/retrieval-cache")
+async def metrics_retrieval_cache() -> dict:
+    return get_retrieval_cache_stats()
+
+
+@router.get("/auth-cache")
+async def metrics_auth_cache() -> dict:
+    return get_principal_cache_stats()
@@ -2,7 +2,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, status
 
-from opus_blocks.api.deps import CurrentUser, DbSession
+from opus_blocks.api.deps import CurrentUser, DbSession, ReadUser
 from opus_blocks.core.config import settings
 from opus_blocks.core.rate_limit import rate_limit
 from opus_blocks.retrieval import get_retriever
@@ -19,10 +19,10 @@ from opus_blocks.services.jobs import create_job, enqueue_job
 from opus_blocks.services.paragraphs import (
     create_paragraph,
     get_paragraph,
+    load_paragraph_view,
     update_paragraph_verification,
 )
 from opus_blocks.services.runs import create_run, list_paragraph_runs
-from opus_blocks.services.sentences import list_paragraph_sentences, list_sentence_fact_links
 
 router = APIRouter(prefix="/paragraphs")
 
@@ -42,7 +42,7 @@ async def create_paragraph_endpoint(
 
 @router.get("/{paragraph_id}", response_model=ParagraphRead)
 async def get_paragraph_endpoint(
-    paragraph_id: UUID, session: DbSession, user: CurrentUser
+    paragraph_id: UUID, session: DbSession, user: ReadUser
 ) -> ParagraphRead:
     paragraph = await get_paragraph(session, owner_id=user.id, paragraph_id=paragraph_id)
     if not paragraph:
@@ -114,7 +114,7 @@ async def verify_paragraph(paragraph_id: UUID, session: DbSession, user: Current
 
 
 @router.get("/{paragraph_id}/runs", response_model=list[RunRead])
-async def list_runs(paragraph_id: UUID, session: DbSession, user: CurrentUser) -> list[RunRead]:
+async def list_runs(paragraph_id: UUID, session: DbSession, user: ReadUser) -> list[RunRead]:
     runs = await list_paragraph_runs(session, owner_id=user.id, paragraph_id=paragraph_id)
     return [RunRead.model_validate(run) for run in runs]
 
@@ -131,35 +131,22 @@ async def verify_paragraph_rollup(
 
 @router.get("/{paragraph_id}/view", response_model=ParagraphView)
 async def get_paragraph_view(
-    paragraph_id: UUID, session: DbSession, user: CurrentUser
+    paragraph_id: UUID, session: DbSession, user: ReadUser
 ) -> ParagraphView:
-    paragraph = await get_paragraph(session, owner_id=user.id, paragraph_id=paragraph_id)
-    if not paragraph:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Paragraph not found")
-
-    sentences = await list_paragraph_sentences(session, owner_id=user.id, paragraph_id=paragraph_id)
-    links: list[SentenceFactLinkRead] = []
-    for sentence in sentences:
-        sentence_links = await list_sentence_fact_links(
-            session, owner_id=user.id, sentence_id=sentence.id
-        )
-        links.extend(SentenceFactLinkRead.model_validate(link) for link in sentence_links)
-
-    facts = await list_manuscript_facts(
-        session, owner_id=user.id, manuscript_id=paragraph.manuscript_id
+    paragraph, sentences, links, facts = await load_paragraph_view(
+        session, owner_id=user.id, paragraph_id=paragraph_id
     )
-
     return ParagraphView(
         paragraph=ParagraphRead.model_validate(paragraph),
         sentences=[SentenceRead.model_validate(sentence) for sentence in sentences],
-        links=links,
+        links=[SentenceFactLinkRead.model_validate(link) for link in links],
         facts=[FactRead.model_validate(fact) for fact in facts],
     )
 
 
 @router.get("/{paragraph_id}/suggest-facts", response_model=list[FactSuggestion])
 async def suggest_facts(
-    paragraph_id: UUID, session: DbSession, user: CurrentUser
+    paragraph_id: UUID, session: DbSession, user: ReadUser
 ) -> list[FactSuggestion]:
     paragraph = await get_paragraph(session, owner_id=user.id, paragraph_id=paragraph_id)
     if not paragraph:
@@ -1,27 +1,38 @@
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Response
+from fastapi.responses import StreamingResponse
 
-from opus_blocks.api.deps import CurrentUser, DbSession
-from opus_blocks.schemas.run import RunRead
-from opus_blocks.services.runs import list_runs_filtered
+from opus_blocks.api.deps import DbSession, ReadUser
+from opus_blocks.api.pagination import PageCursor, PageFormat, PageLimit, list_response
+from opus_blocks.schemas.run import RunHeavyField, RunListItem
+from opus_blocks.services.runs import runs_list_query
 
 router = APIRouter(prefix="/runs")
 
 
-@router.get("", response_model=list[RunRead])
+@router.get("", response_model=list[RunListItem], response_model_exclude_unset=True)
 async def list_runs(
     session: DbSession,
-    user: CurrentUser,
+    user: ReadUser,
+    response: Response,
     run_type: str | None = None,
     paragraph_id: UUID | None = None,
     document_id: UUID | None = None,
-) -> list[RunRead]:
-    runs = await list_runs_filtered(
-        session,
+    include: Annotated[list[RunHeavyField] | None, Query()] = None,
+    limit: PageLimit = None,
+    cursor: PageCursor = None,
+    output: PageFormat = "json",
+) -> list[RunListItem] | StreamingResponse:
+    query = runs_list_query(
         owner_id=user.id,
         run_type=run_type,
         paragraph_id=paragraph_id,
         document_id=document_id,
+        include=include or (),
+        cursor=cursor,
+    )
+    return await list_response(
+        session, query, RunListItem, response=response, limit=limit, output=output
     )
-    return [RunRead.model_validate(run) for run in runs]
@@ -2,7 +2,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, status
 
-from opus_blocks.api.deps import CurrentUser, DbSession
+from opus_blocks.api.deps import CurrentUser, DbSession, ReadUser
 from opus_blocks.core.config import settings
 from opus_blocks.schemas.job import JobRead
 from opus_blocks.schemas.sentence import SentenceCreate, SentenceRead, SentenceUpdate
@@ -32,7 +32,7 @@ async def create_sentence_endpoint(
 
 @router.get("/paragraph/{paragraph_id}", response_model=list[SentenceRead])
 async def list_sentences_endpoint(
-    paragraph_id: UUID, session: DbSession, user: CurrentUser
+    paragraph_id: UUID, session: DbSession, user: ReadUser
 ) -> list[SentenceRead]:
     sentences = await list_paragraph_sentences(session, owner_id=user.id, paragraph_id=paragraph_id)
     return [SentenceRead.model_validate(sentence) for sentence in sentences]
@@ -48,7 +48,7 @@ async def create_sentence_fact_link_endpoint(
 
 @router.get("/{sentence_id}/links", response_model=list[SentenceFactLinkRead])
 async def list_sentence_fact_links_endpoint(
-    sentence_id: UUID, session: DbSession, user: CurrentUser
+    sentence_id: UUID, session: DbSession, user: ReadUser
 ) -> list[SentenceFactLinkRead]:
     links = await list_sentence_fact_links(session, owner_id=user.id, sentence_id=sentence_id)
     return [SentenceFactLinkRead.model_validate(link) for link in links]
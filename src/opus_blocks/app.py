@@ -1,16 +1,56 @@
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 
 from opus_blocks.api.v1.router import api_router
 from opus_blocks.core.config import settings
 from opus_blocks.core.logging import configure_logging
 from opus_blocks.core.rate_limit import apply_rate_limiting
+from opus_blocks.db.pagination import InvalidCursorError
+from opus_blocks.services.documents import EmptyUploadError, UploadTooLargeError
+from opus_blocks.services.job_events import close_job_event_hub
+from opus_blocks.vector_store import close_vector_stores
+from opus_blocks.vector_store.executor import VectorStoreBusyError
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    await close_job_event_hub()
+    close_vector_stores()
+
+
+async def _handle_vector_store_busy(_: Request, exc: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _handle_invalid_cursor(_: Request, exc: Exception) -> JSONResponse:
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+
+
+async def _handle_upload_too_large(_: Request, exc: Exception) -> JSONResponse:
+    return JSONResponse(status_code=status.HTTP_413_CONTENT_TOO_LARGE, content={"detail": str(exc)})
+
+
+async def _handle_empty_upload(_: Request, exc: Exception) -> JSONResponse:
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
 
 
 def create_app() -> FastAPI:
     configure_logging(settings.environment)
 
-    app = FastAPI(title=settings.app_name, version=settings.app_version)
+    app = FastAPI(title=settings.app_name, version=settings.app_version, lifespan=lifespan)
     apply_rate_limiting(app)
+    app.add_exception_handler(VectorStoreBusyError, _handle_vector_store_busy)
+    app.add_exception_handler(InvalidCursorError, _handle_invalid_cursor)
+    app.add_exception_handler(UploadTooLargeError, _handle_upload_too_large)
+    app.add_exception_handler(EmptyUploadError, _handle_empty_upload)
     app.include_router(api_router, prefix="/api/v1")
     return app
 
@@ -0,0 +1,28 @@
+import bisect
+from dataclasses import dataclass, field
+from typing import Any
+
+# Upper bounds in milliseconds; the final bucket is unbounded.
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+@dataclass
+class LatencyHistogram:
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        count = sum(self.counts)
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["le_inf"]
+        return {
+            "count": count,
+            "avg_ms": self.total_ms / count if count else None,
+            "max_ms": self.max_ms,
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
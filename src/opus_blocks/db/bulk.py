@@ -0,0 +1,30 @@
+from collections.abc import Sequence
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from opus_blocks.db.base import Base
+
+# asyncpg caps a statement at 32767 bind parameters; keep each VALUES list well under it.
+BULK_INSERT_BATCH_ROWS = 1000
+
+
+async def insert_rows(
+    session: AsyncSession,
+    model: type[Base],
+    rows: Sequence[dict],
+    *,
+    conflict_columns: Sequence[str] = ("id",),
+    update_columns: Sequence[str] = (),
+    batch_rows: int = BULK_INSERT_BATCH_ROWS,
+) -> None:
+    for start in range(0, len(rows), batch_rows):
+        statement = insert(model).values(list(rows[start : start + batch_rows]))
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={column: statement.excluded[column] for column in update_columns},
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=list(conflict_columns))
+        await session.execute(statement)
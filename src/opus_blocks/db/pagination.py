@@ -0,0 +1,74 @@
+import base64
+import binascii
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Rows pulled per round trip from the server-side cursor while streaming.
+STREAM_BATCH_ROWS = 500
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+
+def keyset_paginate(
+    query: Select[Any],
+    *,
+    created_at: InstrumentedAttribute[datetime],
+    row_id: InstrumentedAttribute[UUID],
+    cursor: str | None,
+    descending: bool = False,
+) -> Select[Any]:
+    # Orders by (created_at, id) and resumes strictly after the cursor's row, so pages
+    # stay stable while rows are inserted and never need an OFFSET scan.
+    if descending:
+        query = query.order_by(created_at.desc(), row_id.desc())
+    else:
+        query = query.order_by(created_at.asc(), row_id.asc())
+    if cursor is None:
+        return query
+    position = decode_cursor(cursor)
+    key = tuple_(created_at, row_id)
+    return query.where(key < position if descending else key > position)
+
+
+async def fetch_page(
+    session: AsyncSession, query: Select[Any], *, limit: int
+) -> tuple[list[RowMapping], str | None]:
+    # Reads one extra row to learn whether another page exists.
+    rows = list((await session.execute(query.limit(limit + 1))).mappings().all())
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last["created_at"], last["id"])
+
+
+async def stream_rows(
+    session: AsyncSession, query: Select[Any], *, batch_rows: int = STREAM_BATCH_ROWS
+) -> AsyncIterator[RowMapping]:
+    result = await session.stream(query.execution_options(yield_per=batch_rows))
+    async for row in result.mappings():
+        yield row
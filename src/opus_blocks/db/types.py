@@ -0,0 +1,61 @@
+from typing import Any
+
+from sqlalchemy import Dialect, Float
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import TypeDecorator, UserDefinedType
+
+
+def parse_vector(value: str) -> list[float]:
+    body = value.strip()[1:-1]
+    return [float(item) for item in body.split(",")] if body else []
+
+
+def format_vector(value: list[float]) -> str:
+    return "[" + ",".join(repr(float(item)) for item in value) + "]"
+
+
+class EmbeddingArray(TypeDecorator[list[float]]):
+    # float8[] on the stub schema; after scripts/enable_pgvector.py the column is
+    # vector(n), which accepts float8[] binds via its assignment cast and is read as text.
+    impl = ARRAY(Float)
+    cache_ok = True
+
+    def result_processor(self, dialect: Dialect, coltype: Any) -> Any:
+        # asyncpg already returns float8[] as a list; the array processor would reject
+        # the vector type oid, so results are handled here for both column types.
+        def process(value: Any) -> list[float] | None:
+            if isinstance(value, str):
+                return parse_vector(value)
+            return value
+
+        return process
+
+
+class Vector(UserDefinedType[list[float]]):
+    cache_ok = True
+
+    def __init__(self, dimensions: int | None = None) -> None:
+        self.dimensions = dimensions
+
+    def get_col_spec(self, **kw: Any) -> str:
+        return f"vector({self.dimensions})" if self.dimensions else "vector"
+
+    def bind_processor(self, dialect: Dialect) -> Any:
+        def process(value: list[float] | None) -> str | None:
+            return None if value is None else format_vector(value)
+
+        return process
+
+    def result_processor(self, dialect: Dialect, coltype: Any) -> Any:
+        def process(value: str | None) -> list[float] | None:
+            return None if value is None else parse_vector(value)
+
+        return process
+
+
+# distance setting -> (SQL operator, HNSW operator class)
+PGVECTOR_DISTANCES = {
+    "cosine": ("<=>", "vector_cosine_ops"),
+    "l2": ("<->", "vector_l2_ops"),
+    "inner_product": ("<#>", "vector_ip_ops"),
+}
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from opus_blocks.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    checkout_wait_ms_total: float = 0.0
+    checkout_wait_ms_max: float = 0.0
+    saturated_checkouts: int = 0
+    exhausted_checkouts: int = 0
+    checkout_timeouts: int = 0
+
+    def record_checkout(self, wait_ms: float, *, saturated: bool, exhausted: bool) -> None:
+        self.checkouts += 1
+        self.checkout_wait_ms_total += wait_ms
+        self.checkout_wait_ms_max = max(self.checkout_wait_ms_max, wait_ms)
+        if saturated:
+            self.saturated_checkouts += 1
+        if exhausted:
+            self.exhausted_checkouts += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        payload: dict[str, Any] = asdict(self)
+        payload["checkout_wait_ms_avg"] = (
+            self.checkout_wait_ms_total / self.checkouts if self.checkouts else None
+        )
+        return payload
+
+
+_pool_stats = PoolStats()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    def _do_get(self) -> Any:
+        # saturated: every base slot is busy; exhausted: overflow is used up too.
+        saturated = self.checkedin() == 0 and self.overflow() >= 0
+        exhausted = saturated and self.overflow() >= self._max_overflow
+        start_time = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            _pool_stats.checkout_timeouts += 1
+            raise
+        wait_ms = (time.perf_counter() - start_time) * 1000
+        _pool_stats.record_checkout(wait_ms, saturated=saturated, exhausted=exhausted)
+        return connection
+
+
+_engine: AsyncEngine | None = None
+_session_factory: async_sessionmaker[AsyncSession] | None = None
+_engine_loop: asyncio.AbstractEventLoop | None = None
+
+
+def build_worker_engine() -> AsyncEngine:
+    return create_async_engine(
+        settings.database_url,
+        pool_pre_ping=True,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.worker_db_pool_size,
+        max_overflow=settings.worker_db_max_overflow,
+        pool_timeout=settings.worker_db_pool_timeout,
+    )
+
+
+def init_worker_engine() -> None:
+    global _engine, _session_factory
+    if _engine is not None:
+        return
+    _engine = build_worker_engine()
+    _session_factory = async_sessionmaker(_engine, expire_on_commit=False)
+
+
+async def dispose_worker_engine() -> None:
+    global _engine, _session_factory, _engine_loop
+    if _engine is None:
+        return
+    # Connections can only be closed on the loop that opened them.
+    loop_alive = _engine_loop is asyncio.get_running_loop()
+    await _engine.dispose(close=loop_alive)
+    logger.info("Worker database pool disposed: %s", get_pool_stats())
+    _engine = None
+    _session_factory = None
+    _engine_loop = None
+
+
+async def _bind_engine_to_running_loop(engine: AsyncEngine) -> None:
+    global _engine_loop
+    loop = asyncio.get_running_loop()
+    if _engine_loop is loop:
+        return
+    if _engine_loop is not None:
+        # asyncpg connections cannot cross event loops, so a new loop gets a new pool.
+        await engine.dispose(close=False)
+    _engine_loop = loop
+
+
+@asynccontextmanager
+async def worker_session() -> AsyncIterator[AsyncSession]:
+    # Outside a worker process (scripts, tests) fall back to a short-lived engine.
+    if _engine is None or _session_factory is None:
+        engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                yield session
+        finally:
+            await engine.dispose()
+        return
+
+    await _bind_engine_to_running_loop(_engine)
+    async with _session_factory() as session:
+        yield session
+
+
+def get_pool_stats() -> dict[str, Any]:
+    stats = _pool_stats.snapshot()
+    pool = _engine.sync_engine.pool if _engine is not None else None
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            {
+                "pool_size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        )
+    return stats
+
+
+def reset_pool_stats() -> None:
+    global _pool_stats
+    _pool_stats = PoolStats()
@@ -0,0 +1,230 @@
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any, Protocol
+
+from redis.asyncio import Redis
+from sqlalchemy import select
+
+from opus_blocks.core.config import settings
+from opus_blocks.db.worker import worker_session
+from opus_blocks.models.run import Run
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    outputs: dict
+    token_prompt: int | None = None
+    token_completion: int | None = None
+    cost_usd: float | None = None
+    latency_ms: int | None = None
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "outputs": self.outputs,
+                "token_prompt": self.token_prompt,
+                "token_completion": self.token_completion,
+                "cost_usd": self.cost_usd,
+                "latency_ms": self.latency_ms,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, payload: str | bytes) -> "CachedResponse":
+        data = json.loads(payload)
+        return cls(
+            outputs=data["outputs"],
+            token_prompt=data.get("token_prompt"),
+            token_completion=data.get("token_completion"),
+            cost_usd=data.get("cost_usd"),
+            latency_ms=data.get("latency_ms"),
+        )
+
+
+def build_cache_key(
+    *, stage: str, model: str, prompt_version: str, system_prompt: str, user_prompt: str
+) -> str:
+    prompt_hash = hashlib.sha256(f"{system_prompt}\x00{user_prompt}".encode()).hexdigest()
+    return f"llm:{stage}:{model}:{prompt_version}:{prompt_hash}"
+
+
+class LLMResponseCache(Protocol):
+    name: str
+
+    async def get(self, key: str) -> CachedResponse | None: ...
+
+    async def set(self, key: str, response: CachedResponse) -> None: ...
+
+
+class InMemoryLLMCache:
+    name = "memory"
+
+    def __init__(self, *, max_entries: int, ttl_seconds: int) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+
+    async def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if self._ttl_seconds > 0 and time.monotonic() - stored_at > self._ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(response)
+
+    async def set(self, key: str, response: CachedResponse) -> None:
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+class RedisLLMCache:
+    name = "redis"
+
+    def __init__(self, *, url: str, ttl_seconds: int) -> None:
+        self._client = Redis.from_url(url)
+        self._ttl_seconds = ttl_seconds
+
+    async def get(self, key: str) -> CachedResponse | None:
+        payload = await self._client.get(key)
+        if payload is None:
+            return None
+        return CachedResponse.from_json(payload)
+
+    async def set(self, key: str, response: CachedResponse) -> None:
+        # Size-bounded eviction is left to the Redis maxmemory policy.
+        await self._client.set(key, response.to_json(), ex=self._ttl_seconds or None)
+
+
+class RunsTableLLMCache:
+    name = "runs"
+
+    def __init__(self, *, ttl_seconds: int) -> None:
+        self._ttl_seconds = ttl_seconds
+
+    async def get(self, key: str) -> CachedResponse | None:
+        query = select(Run).where(Run.cache_key == key)
+        if self._ttl_seconds > 0:
+            cutoff = datetime.now(tz=UTC) - timedelta(seconds=self._ttl_seconds)
+            query = query.where(Run.created_at >= cutoff)
+        async with worker_session() as session:
+            run = await session.scalar(query.order_by(Run.created_at.desc()).limit(1))
+        if run is None or not run.outputs_json:
+            return None
+        cache_json = run.cache_json or {}
+        return CachedResponse(
+            outputs=run.outputs_json,
+            token_prompt=run.token_prompt or cache_json.get("saved_token_prompt"),
+            token_completion=run.token_completion or cache_json.get("saved_token_completion"),
+            cost_usd=run.cost_usd,
+            latency_ms=run.latency_ms,
+        )
+
+    async def set(self, key: str, response: CachedResponse) -> None:
+        # Tasks persist the run (with its cache key) after the output passes validation.
+        return None
+
+
+@dataclass
+class LLMCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    saved_tokens: int = 0
+    saved_latency_ms: int = 0
+    by_stage: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    def record(self, stage: str, status: str, saved: CachedResponse | None = None) -> None:
+        stage_counts = self.by_stage.setdefault(stage, {"hits": 0, "misses": 0, "bypassed": 0})
+        if status == "hit":
+            self.hits += 1
+            stage_counts["hits"] += 1
+            if saved is not None:
+                self.saved_tokens += (saved.token_prompt or 0) + (saved.token_completion or 0)
+                self.saved_latency_ms += saved.latency_ms or 0
+        elif status == "bypass":
+            self.bypassed += 1
+            stage_counts["bypassed"] += 1
+        else:
+            self.misses += 1
+            stage_counts["misses"] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "saved_tokens": self.saved_tokens,
+            "saved_latency_ms": self.saved_latency_ms,
+            "by_stage": {stage: dict(counts) for stage, counts in self.by_stage.items()},
+        }
+
+
+_cache_stats = LLMCacheStats()
+_caches: dict[tuple[str, str, int, int], LLMResponseCache] = {}
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    if not settings.llm_cache_enabled:
+        return None
+    backend = settings.llm_cache_backend.lower()
+    cache_key = (
+        backend,
+        settings.llm_cache_redis_url or settings.redis_url,
+        settings.llm_cache_ttl_seconds,
+        settings.llm_cache_max_entries,
+    )
+    cache = _caches.get(cache_key)
+    if cache is not None:
+        return cache
+    if backend == "memory":
+        cache = InMemoryLLMCache(
+            max_entries=settings.llm_cache_max_entries,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+        )
+    elif backend == "redis":
+        cache = RedisLLMCache(
+            url=settings.llm_cache_redis_url or settings.redis_url,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+        )
+    elif backend == "runs":
+        cache = RunsTableLLMCache(ttl_seconds=settings.llm_cache_ttl_seconds)
+    else:
+        raise ValueError(f"Unsupported LLM cache backend: {settings.llm_cache_backend}")
+    _caches[cache_key] = cache
+    return cache
+
+
+def get_llm_cache_stats() -> LLMCacheStats:
+    return _cache_stats
+
+
+_bypass_cache: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_llm_cache() -> Iterator[None]:
+    # Skip cache reads (the fresh response still refreshes the entry).
+    token = _bypass_cache.set(True)
+    try:
+        yield
+    finally:
+        _bypass_cache.reset(token)
+
+
+def llm_cache_bypassed() -> bool:
+    return _bypass_cache.get()
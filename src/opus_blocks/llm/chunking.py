@@ -0,0 +1,193 @@
+from dataclasses import dataclass
+
+from opus_blocks.llm.provider import LLMMetadata, LLMResult
+from opus_blocks.schemas.agent_contracts import normalize_fact_content
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    index: int
+    start_char: int
+    end_char: int
+    text: str
+    page_offsets: list[dict[str, int]]
+
+
+def _cut_point(text: str, start: int, end: int, page_offsets: list[dict[str, int]]) -> int:
+    # Prefer page boundaries, then paragraph breaks, then whitespace, within the
+    # back half of the window so chunks stay close to the budget.
+    floor = start + (end - start) // 2
+    page_ends = [offset["end_char"] for offset in page_offsets if floor < offset["end_char"] <= end]
+    if page_ends:
+        return max(page_ends)
+    for separator in ("\n\n", "\n", " "):
+        index = text.rfind(separator, floor, end)
+        if index != -1:
+            return index + len(separator)
+    return end
+
+
+def _chunk_page_offsets(
+    page_offsets: list[dict[str, int]], start: int, end: int
+) -> list[dict[str, int]]:
+    return [
+        {
+            "page": offset["page"],
+            "start_char": max(offset["start_char"], start) - start,
+            "end_char": min(offset["end_char"], end) - start,
+        }
+        for offset in page_offsets
+        if offset["start_char"] < end and offset["end_char"] > start
+    ]
+
+
+def split_source_text(
+    text: str,
+    page_offsets: list[dict[str, int]],
+    *,
+    max_chars: int,
+    overlap_chars: int,
+) -> list[TextChunk]:
+    if max_chars <= 0 or len(text) <= max_chars:
+        return [TextChunk(0, 0, len(text), text, list(page_offsets))]
+
+    overlap_chars = max(0, min(overlap_chars, max_chars // 2))
+    chunks: list[TextChunk] = []
+    start = 0
+    while start < len(text):
+        end = min(start + max_chars, len(text))
+        if end < len(text):
+            end = _cut_point(text, start, end, page_offsets)
+        chunks.append(
+            TextChunk(
+                index=len(chunks),
+                start_char=start,
+                end_char=end,
+                text=text[start:end],
+                page_offsets=_chunk_page_offsets(page_offsets, start, end),
+            )
+        )
+        if end >= len(text):
+            break
+        next_start = end - overlap_chars
+        whitespace = text.find(" ", next_start, end)
+        if whitespace != -1:
+            next_start = whitespace + 1
+        start = max(next_start, start + 1)
+    return chunks
+
+
+def _page_for_offset(page_offsets: list[dict[str, int]], offset: int) -> int | None:
+    for page in page_offsets:
+        if page["start_char"] <= offset < page["end_char"]:
+            return page["page"]
+    return None
+
+
+def remap_source_span(
+    span: dict, chunk: TextChunk, document_page_offsets: list[dict[str, int]]
+) -> dict:
+    remapped = dict(span)
+    start_char = span.get("start_char")
+    end_char = span.get("end_char")
+    if start_char is None or end_char is None:
+        return remapped
+    length = len(chunk.text)
+    start_char = min(max(start_char, 0), length)
+    end_char = min(max(end_char, start_char), length)
+    remapped["start_char"] = chunk.start_char + start_char
+    remapped["end_char"] = chunk.start_char + end_char
+    if remapped.get("page") is None:
+        remapped["page"] = _page_for_offset(document_page_offsets, remapped["start_char"])
+    return remapped
+
+
+def merge_librarian_outputs(
+    outputs: list[dict],
+    chunks: list[TextChunk],
+    document_page_offsets: list[dict[str, int]],
+) -> dict:
+    facts: dict[str, dict] = {}
+    uncertain: dict[str, dict] = {}
+    for output, chunk in zip(outputs, chunks, strict=True):
+        for fact in output.get("facts", []):
+            key = normalize_fact_content(fact["content"])
+            merged = {
+                **fact,
+                "source_span": remap_source_span(
+                    fact.get("source_span") or {}, chunk, document_page_offsets
+                ),
+            }
+            existing = facts.get(key)
+            if existing is None or merged["confidence"] > existing["confidence"]:
+                facts[key] = merged
+        for fact in output.get("uncertain_facts", []):
+            key = normalize_fact_content(fact["content"])
+            if key in uncertain:
+                continue
+            uncertain[key] = {
+                **fact,
+                "source_span": remap_source_span(
+                    fact.get("source_span") or {}, chunk, document_page_offsets
+                ),
+            }
+    return {
+        "facts": list(facts.values()),
+        "uncertain_facts": [fact for key, fact in uncertain.items() if key not in facts],
+    }
+
+
+def _sum_optional(values: list[int | None]) -> int | None:
+    present = [value for value in values if value is not None]
+    return sum(present) if present else None
+
+
+def _merge_cache(results: list[LLMResult]) -> dict | None:
+    caches = [result.metadata.cache for result in results if result.metadata.cache]
+    if not caches:
+        return None
+    # A merged result has no single prompt, so it carries no "key": chunked runs store no
+    # cache_key and the runs backend never serves them. Per-chunk keys are kept for tracing.
+    merged: dict = {
+        "backend": caches[0].get("backend"),
+        "key": None,
+        "chunk_keys": [cache.get("key") for cache in caches],
+        "chunks": len(results),
+    }
+    for field in (
+        "hits",
+        "misses",
+        "bypassed",
+        "saved_token_prompt",
+        "saved_token_completion",
+        "saved_latency_ms",
+    ):
+        merged[field] = sum(cache.get(field) or 0 for cache in caches)
+    return merged
+
+
+def merge_librarian_results(
+    results: list[LLMResult],
+    chunks: list[TextChunk],
+    document_page_offsets: list[dict[str, int]],
+) -> LLMResult:
+    first = results[0].metadata
+    costs = [result.metadata.cost_usd for result in results]
+    present_costs = [cost for cost in costs if cost is not None]
+    latencies = [result.metadata.latency_ms for result in results]
+    present_latencies = [latency for latency in latencies if latency is not None]
+    metadata = LLMMetadata(
+        provider=first.provider,
+        model=first.model,
+        prompt_version=first.prompt_version,
+        token_prompt=_sum_optional([result.metadata.token_prompt for result in results]),
+        token_completion=_sum_optional([result.metadata.token_completion for result in results]),
+        cost_usd=sum(present_costs) if present_costs else None,
+        # Chunks run concurrently, so wall-clock latency is the slowest chunk.
+        latency_ms=max(present_latencies) if present_latencies else None,
+        cache=_merge_cache(results),
+    )
+    outputs = merge_librarian_outputs(
+        [result.outputs for result in results], chunks, document_page_offsets
+    )
+    return LLMResult(outputs=outputs, metadata=metadata)
@@ -1,10 +1,23 @@
+import asyncio
 import json
+import os
 import time
-from dataclasses import dataclass
+import weakref
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from typing import Protocol
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from opus_blocks.core.config import settings
+from opus_blocks.llm.cache import (
+    CachedResponse,
+    build_cache_key,
+    get_llm_cache,
+    get_llm_cache_stats,
+    llm_cache_bypassed,
+)
 from opus_blocks.llm.prompts import loader
 from opus_blocks.llm.token_budget import assert_token_budget
 
@@ -18,6 +31,7 @@ class LLMMetadata:
     token_completion: int | None = None
     cost_usd: float | None = None
     latency_ms: int | None = None
+    cache: dict | None = None
 
 
 @dataclass(frozen=True)
@@ -26,6 +40,35 @@ class LLMResult:
     metadata: LLMMetadata
 
 
+class AsyncLLMProvider(Protocol):
+    async def extract_facts(self, *, inputs: dict) -> LLMResult: ...
+
+    async def generate_paragraph(self, *, inputs: dict) -> LLMResult: ...
+
+    async def verify_paragraph(self, *, inputs: dict) -> LLMResult: ...
+
+
+_llm_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@asynccontextmanager
+async def llm_concurrency_slot() -> AsyncIterator[None]:
+    limit = settings.llm_max_concurrency
+    if limit <= 0:
+        yield
+        return
+    # One semaphore per event loop; a worker process runs a single long-lived loop.
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(limit)
+        _llm_semaphores[loop] = semaphore
+    async with semaphore:
+        yield
+
+
 class StubLLMProvider:
     def __init__(self, provider: str, model: str, prompt_version: str) -> None:
         self._provider = provider
@@ -37,7 +80,7 @@ class StubLLMProvider:
             provider=self._provider, model=self._model, prompt_version=self._prompt_version
         )
 
-    def extract_facts(self, *, inputs: dict) -> LLMResult:
+    async def extract_facts(self, *, inputs: dict) -> LLMResult:
         document_id = inputs.get("document_id")
         outputs = {
             "facts": [
@@ -85,7 +128,7 @@ class StubLLMProvider:
         }
         return LLMResult(outputs=outputs, metadata=self._metadata())
 
-    def generate_paragraph(self, *, inputs: dict) -> LLMResult:
+    async def generate_paragraph(self, *, inputs: dict) -> LLMResult:
         section = inputs.get("paragraph_spec", {}).get("section", "")
         intent = inputs.get("paragraph_spec", {}).get("intent", "")
         allowed_facts = inputs.get("allowed_facts", [])
@@ -116,7 +159,7 @@ class StubLLMProvider:
         outputs = {"paragraph": paragraph_payload}
         return LLMResult(outputs=outputs, metadata=self._metadata())
 
-    def verify_paragraph(self, *, inputs: dict) -> LLMResult:
+    async def verify_paragraph(self, *, inputs: dict) -> LLMResult:
         sentence_inputs = inputs.get("sentences", [])
         results: list[dict] = []
         for sentence in sentence_inputs:
@@ -141,12 +184,14 @@ class StubLLMProvider:
 
 class OpenAIProvider:
     def __init__(self, api_key: str, model: str, prompt_version: str) -> None:
-        self._client = OpenAI(api_key=api_key)
+        self._client = AsyncOpenAI(api_key=api_key)
         self._model = model
         self._prompt_version = prompt_version
         self._prompt_loader = loader.PromptLoader()
 
-    def _metadata(self, start_time: float, usage: object | None) -> LLMMetadata:
+    def _metadata(
+        self, start_time: float, usage: object | None, cache: dict | None = None
+    ) -> LLMMetadata:
         latency_ms = int((time.perf_counter() - start_time) * 1000)
         token_prompt = getattr(usage, "prompt_tokens", None) if usage else None
         token_completion = getattr(usage, "completion_tokens", None) if usage else None
@@ -157,56 +202,124 @@ class OpenAIProvider:
             token_prompt=token_prompt,
             token_completion=token_completion,
             latency_ms=latency_ms,
+            cache=cache,
         )
 
-    def _request(self, *, system_prompt: str, user_prompt: str, stage: str) -> LLMResult:
+    async def _request(self, *, system_prompt: str, user_prompt: str, stage: str) -> LLMResult:
         assert_token_budget(stage, system_prompt, user_prompt)
-        start_time = time.perf_counter()
-        response = self._client.chat.completions.create(
-            model=self._model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0,
-        )
+        cache = get_llm_cache()
+        cache_info: dict | None = None
+        if cache is not None:
+            start_time = time.perf_counter()
+            cache_key = build_cache_key(
+                stage=stage,
+                model=self._model,
+                prompt_version=self._prompt_version,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+            )
+            status = "bypass" if llm_cache_bypassed() else "miss"
+            cached = await cache.get(cache_key) if status == "miss" else None
+            if cached is not None:
+                status = "hit"
+            get_llm_cache_stats().record(stage, status, cached)
+            cache_info = _cache_counters(cache.name, cache_key, status, cached)
+            if cached is not None:
+                metadata = self._metadata(start_time, None, cache_info)
+                return LLMResult(
+                    outputs=cached.outputs,
+                    metadata=replace(metadata, token_prompt=0, token_completion=0),
+                )
+
+        async with llm_concurrency_slot():
+            start_time = time.perf_counter()
+            response = await self._client.chat.completions.create(
+                model=self._model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format={"type": "json_object"},
+                temperature=0,
+            )
         content = response.choices[0].message.content if response.choices else ""
         try:
             outputs = json.loads(content or "{}")
         except json.JSONDecodeError as exc:
             raise ValueError("OpenAI response was not valid JSON") from exc
-        metadata = self._metadata(start_time, response.usage)
+        metadata = self._metadata(start_time, response.usage, cache_info)
+        if cache is not None and cache_info is not None:
+            await cache.set(
+                cache_info["key"],
+                CachedResponse(
+                    outputs=outputs,
+                    token_prompt=metadata.token_prompt,
+                    token_completion=metadata.token_completion,
+                    cost_usd=metadata.cost_usd,
+                    latency_ms=metadata.latency_ms,
+                ),
+            )
         return LLMResult(outputs=outputs, metadata=metadata)
 
-    def extract_facts(self, *, inputs: dict) -> LLMResult:
+    async def extract_facts(self, *, inputs: dict) -> LLMResult:
         system_prompt = self._prompt_loader.render("librarian", inputs)
         user_prompt = "Return JSON only."
-        return self._request(
+        return await self._request(
             system_prompt=system_prompt, user_prompt=user_prompt, stage="librarian"
         )
 
-    def generate_paragraph(self, *, inputs: dict) -> LLMResult:
+    async def generate_paragraph(self, *, inputs: dict) -> LLMResult:
         system_prompt = self._prompt_loader.render("writer", inputs)
         user_prompt = "Return JSON only."
-        return self._request(system_prompt=system_prompt, user_prompt=user_prompt, stage="writer")
+        return await self._request(
+            system_prompt=system_prompt, user_prompt=user_prompt, stage="writer"
+        )
 
-    def verify_paragraph(self, *, inputs: dict) -> LLMResult:
+    async def verify_paragraph(self, *, inputs: dict) -> LLMResult:
         system_prompt = self._prompt_loader.render("verifier", inputs)
         user_prompt = "Return JSON only."
-        return self._request(system_prompt=system_prompt, user_prompt=user_prompt, stage="verifier")
+        return await self._request(
+            system_prompt=system_prompt, user_prompt=user_prompt, stage="verifier"
+        )
+
 
+def _cache_counters(backend: str, key: str, status: str, cached: CachedResponse | None) -> dict:
+    return {
+        "backend": backend,
+        "key": key,
+        "hits": int(status == "hit"),
+        "misses": int(status == "miss"),
+        "bypassed": int(status == "bypass"),
+        "saved_token_prompt": cached.token_prompt if cached else 0,
+        "saved_token_completion": cached.token_completion if cached else 0,
+        "saved_latency_ms": cached.latency_ms if cached else 0,
+    }
 
-def get_llm_provider() -> StubLLMProvider | OpenAIProvider:
+
+_openai_providers: dict[tuple[int, str, str, str], OpenAIProvider] = {}
+
+
+def get_llm_provider() -> AsyncLLMProvider:
     provider_name = settings.llm_provider.lower()
     if provider_name == "openai" and settings.llm_use_openai:
         if not settings.openai_api_key:
             raise ValueError("openai_api_key must be set when llm_use_openai is true")
-        return OpenAIProvider(
-            api_key=settings.openai_api_key,
-            model=settings.llm_model,
-            prompt_version=settings.llm_prompt_version,
+        # Reuse the client (and its keep-alive connections) per process and configuration.
+        cache_key = (
+            os.getpid(),
+            settings.openai_api_key,
+            settings.llm_model,
+            settings.llm_prompt_version,
         )
+        provider = _openai_providers.get(cache_key)
+        if provider is None:
+            provider = OpenAIProvider(
+                api_key=settings.openai_api_key,
+                model=settings.llm_model,
+                prompt_version=settings.llm_prompt_version,
+            )
+            _openai_providers[cache_key] = provider
+        return provider
     if provider_name in {"openai", "stub", "test"}:
         return StubLLMProvider(
             provider=provider_name,
@@ -11,6 +11,10 @@ def estimate_tokens(text: str) -> int:
     return max(1, math.ceil(len(text) / _CHARS_PER_TOKEN))
 
 
+def chars_for_tokens(tokens: int) -> int:
+    return max(0, tokens) * _CHARS_PER_TOKEN
+
+
 def assert_token_budget(stage: str, system_prompt: str, user_prompt: str) -> None:
     if stage == "librarian":
         budget = settings.llm_token_budget_librarian
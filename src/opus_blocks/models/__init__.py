@@ -1,12 +1,14 @@
 from opus_blocks.models.alert_event import AlertEvent
 from opus_blocks.models.dead_letter import DeadLetter
 from opus_blocks.models.document import Document
+from opus_blocks.models.embedding_model import EmbeddingModel
 from opus_blocks.models.fact import Fact
 from opus_blocks.models.fact_embedding import FactEmbedding
 from opus_blocks.models.job import Job
 from opus_blocks.models.manuscript import Manuscript
 from opus_blocks.models.manuscript_document import ManuscriptDocument
 from opus_blocks.models.metrics_snapshot import MetricsSnapshot
+from opus_blocks.models.namespace_generation import NamespaceGeneration
 from opus_blocks.models.paragraph import Paragraph
 from opus_blocks.models.run import Run
 from opus_blocks.models.sentence import Sentence
@@ -18,12 +20,14 @@ __all__ = [
     "AlertEvent",
     "Document",
     "DeadLetter",
+    "EmbeddingModel",
     "Fact",
     "FactEmbedding",
     "Job",
     "Manuscript",
     "ManuscriptDocument",
     "MetricsSnapshot",
+    "NamespaceGeneration",
     "Paragraph",
     "Run",
     "Sentence",
@@ -1,13 +1,28 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, CheckConstraint, DateTime, Float, ForeignKey, String
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    String,
+    literal_column,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
+from sqlalchemy.sql.elements import ColumnClause
 
 from opus_blocks.db.base import Base
 
+# Full-text queries must use the same configuration as the index to be able to use it.
+FACT_FTS_CONFIG = "english"
+
+FACT_FTS_REGCONFIG: ColumnClause[str] = literal_column(f"'{FACT_FTS_CONFIG}'::regconfig")
+
 
 class Fact(Base):
     __tablename__ = "facts"
@@ -47,4 +62,9 @@ class Fact(Base):
             "(source_type = 'PDF' AND document_id IS NOT NULL) OR (source_type = 'MANUAL')",
             name="facts_pdf_document_check",
         ),
+        Index(
+            "ix_facts_content_fts",
+            func.to_tsvector(FACT_FTS_REGCONFIG, content),
+            postgresql_using="gin",
+        ),
     )
@@ -1,12 +1,13 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, String
-from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
 from opus_blocks.db.base import Base
+from opus_blocks.db.types import EmbeddingArray
 
 
 class FactEmbedding(Base):
@@ -18,9 +19,10 @@ class FactEmbedding(Base):
         primary_key=True,
     )
     vector_id: Mapped[str] = mapped_column(String, nullable=False)
-    embedding_model: Mapped[str] = mapped_column(String, nullable=False)
+    # One row per (fact, model) so a new model can be built alongside the active one.
+    embedding_model: Mapped[str] = mapped_column(String, primary_key=True)
     namespace: Mapped[str] = mapped_column(String, nullable=False, index=True)
-    embedding: Mapped[list[float]] = mapped_column(ARRAY(Float), nullable=False)
+    embedding: Mapped[list[float]] = mapped_column(EmbeddingArray, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
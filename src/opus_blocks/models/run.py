@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import CheckConstraint, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
@@ -42,6 +42,8 @@ class Run(Base):
     cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
     latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     trace_id: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+    cache_key: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+    cache_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -52,4 +54,7 @@ class Run(Base):
             "run_type IN ('LIBRARIAN','WRITER','VERIFIER','REWRITER')",
             name="runs_type_check",
         ),
+        # Keyset pagination walks these in (created_at, id) order.
+        Index("ix_runs_owner_created", "owner_id", "created_at", "id"),
+        Index("ix_runs_document_created", "document_id", "created_at", "id"),
     )
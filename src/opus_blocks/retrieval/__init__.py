@@ -1,7 +1,22 @@
 """Retrieval interfaces and default implementations."""
 
+from opus_blocks.core.config import settings
+from opus_blocks.retrieval.base import Retriever
+from opus_blocks.retrieval.cache import CachedRetriever, get_retrieval_cache
+from opus_blocks.retrieval.hybrid import HybridRetriever
 from opus_blocks.retrieval.vector import VectorStoreRetriever
 
 
-def get_retriever() -> VectorStoreRetriever:
-    return VectorStoreRetriever()
+def get_retriever() -> Retriever:
+    backend = settings.retrieval_backend.lower()
+    retriever: Retriever
+    if backend == "vector":
+        retriever = VectorStoreRetriever()
+    elif backend == "hybrid":
+        retriever = HybridRetriever()
+    else:
+        raise ValueError(f"Unsupported retrieval backend: {settings.retrieval_backend}")
+    cache = get_retrieval_cache()
+    if cache is None:
+        return retriever
+    return CachedRetriever(retriever, cache, backend=backend)
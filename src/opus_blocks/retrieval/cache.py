@@ -0,0 +1,137 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from opus_blocks.core.config import settings
+from opus_blocks.retrieval.base import RetrievedFact, Retriever
+from opus_blocks.retrieval.stats import record_retrieval_stage
+from opus_blocks.services.namespace_generations import get_namespace_generation
+
+
+def retrieval_cache_key(
+    *, backend: str, owner_id: UUID, query: str, allowed_fact_ids: list[UUID], limit: int
+) -> str:
+    # Same normalization as embedding lookups; the allowed set is order-independent.
+    query_hash = hashlib.sha256(query.strip().lower().encode("utf-8")).hexdigest()
+    facts_hash = hashlib.sha256(
+        b"".join(sorted(fact_id.bytes for fact_id in set(allowed_fact_ids)))
+    ).hexdigest()
+    return f"retrieval:{backend}:{owner_id}:{limit}:{query_hash}:{facts_hash}"
+
+
+@dataclass
+class RetrievalCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    evictions: int = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
+
+
+class RetrievalCache:
+    def __init__(self, *, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[int, tuple[RetrievedFact, ...]]] = OrderedDict()
+        self.stats = RetrievalCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, generation: int) -> list[RetrievedFact] | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] != generation:
+            # A fact in the namespace changed since this result was computed.
+            del self._entries[key]
+            self.stats.stale += 1
+            entry = None
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return list(entry[1])
+
+    def set(self, key: str, generation: int, results: list[RetrievedFact]) -> None:
+        self._entries[key] = (generation, tuple(results))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+
+class CachedRetriever(Retriever):
+    def __init__(self, retriever: Retriever, cache: RetrievalCache, *, backend: str) -> None:
+        self._retriever = retriever
+        self._cache = cache
+        self._backend = backend
+
+    async def retrieve(
+        self,
+        *,
+        session: AsyncSession,
+        owner_id: UUID,
+        query: str,
+        allowed_fact_ids: list[UUID],
+        limit: int = 10,
+    ) -> list[RetrievedFact]:
+        started = time.perf_counter()
+        key = retrieval_cache_key(
+            backend=self._backend,
+            owner_id=owner_id,
+            query=query,
+            allowed_fact_ids=allowed_fact_ids,
+            limit=limit,
+        )
+        # Read before retrieving: if a write lands meanwhile, the entry is stored under
+        # the old generation and the next lookup recomputes it.
+        generation = await get_namespace_generation(session, f"user:{owner_id}")
+        cached = self._cache.get(key, generation)
+        if cached is not None:
+            record_retrieval_stage(
+                "cache", elapsed_ms=(time.perf_counter() - started) * 1000, candidates=len(cached)
+            )
+            return cached
+        results = await self._retriever.retrieve(
+            session=session,
+            owner_id=owner_id,
+            query=query,
+            allowed_fact_ids=allowed_fact_ids,
+            limit=limit,
+        )
+        self._cache.set(key, generation, results)
+        return results
+
+
+_retrieval_cache: RetrievalCache | None = None
+
+
+def get_retrieval_cache() -> RetrievalCache | None:
+    global _retrieval_cache
+    if settings.retrieval_cache_max_entries <= 0:
+        return None
+    if _retrieval_cache is None or _retrieval_cache._max_entries != (
+        settings.retrieval_cache_max_entries
+    ):
+        _retrieval_cache = RetrievalCache(max_entries=settings.retrieval_cache_max_entries)
+    return _retrieval_cache
+
+
+def get_retrieval_cache_stats() -> dict[str, Any]:
+    cache = get_retrieval_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "size": len(cache), **cache.stats.snapshot()}
@@ -0,0 +1,121 @@
+import logging
+import time
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlalchemy import Text, cast, func, select
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from opus_blocks.core.config import settings
+from opus_blocks.models.fact import FACT_FTS_REGCONFIG, Fact
+from opus_blocks.retrieval.base import RetrievedFact, Retriever
+from opus_blocks.retrieval.stats import record_retrieval_stage
+from opus_blocks.retrieval.vector import VectorStoreRetriever
+
+logger = logging.getLogger(__name__)
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[UUID]], *, k: int = 60
+) -> list[tuple[UUID, float]]:
+    # score(d) = sum over lists of 1 / (k + rank), rank starting at 1. Ties keep the
+    # order in which ids were first seen, so the earlier list wins.
+    scores: dict[UUID, float] = {}
+    for ranking in rankings:
+        for rank, fact_id in enumerate(ranking, start=1):
+            scores[fact_id] = scores.get(fact_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+async def lexical_top_k(
+    session: AsyncSession,
+    query: str,
+    *,
+    owner_id: UUID,
+    allowed_fact_ids: list[UUID],
+    limit: int,
+) -> list[tuple[UUID, float]]:
+    if not allowed_fact_ids or limit <= 0:
+        return []
+    # plainto_tsquery ANDs every term; OR them instead so a fact matching only the
+    # exact gene name or dosage still ranks, with ts_rank_cd rewarding more matches.
+    tsquery = cast(
+        func.replace(cast(func.plainto_tsquery(FACT_FTS_REGCONFIG, query), Text), " & ", " | "),
+        TSQUERY,
+    )
+    document = func.to_tsvector(FACT_FTS_REGCONFIG, Fact.content)
+    rank = func.ts_rank_cd(document, tsquery)
+    result = await session.execute(
+        select(Fact.id, rank)
+        .where(
+            Fact.id.in_(allowed_fact_ids),
+            Fact.owner_id == owner_id,
+            document.op("@@")(tsquery),
+        )
+        .order_by(rank.desc(), Fact.id)
+        .limit(limit)
+    )
+    return [(row[0], float(row[1])) for row in result.all()]
+
+
+class HybridRetriever(Retriever):
+    def __init__(self, *, candidates: int | None = None, rrf_k: int | None = None) -> None:
+        self._candidates = candidates or settings.retrieval_hybrid_candidates
+        self._rrf_k = rrf_k or settings.retrieval_rrf_k
+        self._vector = VectorStoreRetriever()
+
+    async def retrieve(
+        self,
+        *,
+        session: AsyncSession,
+        owner_id: UUID,
+        query: str,
+        allowed_fact_ids: list[UUID],
+        limit: int = 10,
+    ) -> list[RetrievedFact]:
+        if not allowed_fact_ids:
+            return []
+        candidates = max(limit, self._candidates)
+
+        started = time.perf_counter()
+        lexical = await lexical_top_k(
+            session,
+            query,
+            owner_id=owner_id,
+            allowed_fact_ids=allowed_fact_ids,
+            limit=candidates,
+        )
+        lexical_done = time.perf_counter()
+        record_retrieval_stage(
+            "lexical", elapsed_ms=(lexical_done - started) * 1000, candidates=len(lexical)
+        )
+
+        vector = await self._vector.retrieve(
+            session=session,
+            owner_id=owner_id,
+            query=query,
+            allowed_fact_ids=allowed_fact_ids,
+            limit=candidates,
+        )
+        vector_done = time.perf_counter()
+        record_retrieval_stage(
+            "vector", elapsed_ms=(vector_done - lexical_done) * 1000, candidates=len(vector)
+        )
+
+        fused = reciprocal_rank_fusion(
+            [[fact_id for fact_id, _ in lexical], [item.fact_id for item in vector]],
+            k=self._rrf_k,
+        )[:limit]
+        fusion_done = time.perf_counter()
+        record_retrieval_stage(
+            "fusion", elapsed_ms=(fusion_done - vector_done) * 1000, candidates=len(fused)
+        )
+        logger.debug(
+            "Hybrid retrieval: %s lexical + %s vector candidates -> %s results in %.1fms",
+            len(lexical),
+            len(vector),
+            len(fused),
+            (fusion_done - started) * 1000,
+        )
+        return [RetrievedFact(fact_id=fact_id, score=score) for fact_id, score in fused]
@@ -0,0 +1,51 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from opus_blocks.core.latency import LatencyHistogram
+
+
+@dataclass
+class RetrievalStageStats:
+    latency_ms: LatencyHistogram = field(default_factory=LatencyHistogram)
+    queries: int = 0
+    candidates: int = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "latency_ms": self.latency_ms.snapshot(),
+            "queries": self.queries,
+            "candidates": self.candidates,
+            "avg_candidates": self.candidates / self.queries if self.queries else None,
+        }
+
+
+@dataclass
+class RetrievalStats:
+    stages: dict[str, RetrievalStageStats] = field(default_factory=dict)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {name: stage.snapshot() for name, stage in sorted(self.stages.items())}
+
+
+_stats = RetrievalStats()
+_stats_lock = threading.Lock()
+
+
+def record_retrieval_stage(stage: str, *, elapsed_ms: float, candidates: int) -> None:
+    with _stats_lock:
+        stats = _stats.stages.setdefault(stage, RetrievalStageStats())
+        stats.latency_ms.observe(elapsed_ms)
+        stats.queries += 1
+        stats.candidates += candidates
+
+
+def get_retrieval_stats() -> dict[str, Any]:
+    with _stats_lock:
+        return _stats.snapshot()
+
+
+def reset_retrieval_stats() -> None:
+    global _stats
+    with _stats_lock:
+        _stats = RetrievalStats()
@@ -4,6 +4,10 @@ from uuid import UUID
 from pydantic import BaseModel, Field, model_validator
 
 
+def normalize_fact_content(content: str) -> str:
+    return content.strip().lower()
+
+
 class SourceSpanOutput(BaseModel):
     document_id: UUID
     page: int | None = None
@@ -41,7 +45,7 @@ class LibrarianOutput(BaseModel):
 
     @model_validator(mode="after")
     def validate_unique_facts(self) -> "LibrarianOutput":
-        normalized = [fact.content.strip().lower() for fact in self.facts]
+        normalized = [normalize_fact_content(fact.content) for fact in self.facts]
         if len(set(normalized)) != len(normalized):
             raise ValueError("facts must be unique by normalized content")
         return self
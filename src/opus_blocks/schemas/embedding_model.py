@@ -0,0 +1,32 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, computed_field
+
+
+class EmbeddingModelRead(BaseModel):
+    model: str
+    status: str
+    total_facts: int
+    embedded_facts: int
+    last_fact_id: UUID | None = None
+    activate_when_ready: bool
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+    activated_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def progress(self) -> float | None:
+        if not self.total_facts:
+            return None
+        return min(1.0, self.embedded_facts / self.total_facts)
+
+
+class ActiveEmbeddingModelRead(BaseModel):
+    model: str
+
+    model_config = ConfigDict(protected_namespaces=())
@@ -1,4 +1,5 @@
 from datetime import datetime
+from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
 
@@ -23,7 +24,7 @@ class MetricsOverview(BaseModel):
 
 
 class MetricsSnapshotRead(BaseModel):
-    id: str
+    id: UUID
     window_start: datetime
     window_end: datetime
     metrics_json: dict
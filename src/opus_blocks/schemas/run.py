@@ -1,10 +1,13 @@
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
 
+type RunHeavyField = Literal["inputs_json", "outputs_json", "cache_json"]
 
-class RunRead(BaseModel):
+
+class RunSummaryRead(BaseModel):
     id: UUID
     owner_id: UUID | None
     paragraph_id: UUID | None
@@ -14,13 +17,25 @@ class RunRead(BaseModel):
     model: str
     prompt_version: str
     input_hash: str
-    inputs_json: dict
-    outputs_json: dict
     token_prompt: int | None
     token_completion: int | None
     cost_usd: float | None
     latency_ms: int | None
     trace_id: str | None
+    cache_key: str | None = None
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RunRead(RunSummaryRead):
+    inputs_json: dict
+    outputs_json: dict
+    cache_json: dict | None = None
+
+
+class RunListItem(RunSummaryRead):
+    # Heavy JSON columns are only present when requested with `include`.
+    inputs_json: dict | None = None
+    outputs_json: dict | None = None
+    cache_json: dict | None = None
@@ -1,16 +1,83 @@
+import asyncio
 import hashlib
+import os
+import uuid
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO
 from uuid import UUID
 
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from opus_blocks.core.config import settings
 from opus_blocks.models.document import Document
 
+UPLOAD_CHUNK_BYTES = 1024 * 1024
 
-def _compute_hash(content: bytes) -> str:
-    return hashlib.sha256(content).hexdigest()
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+class EmptyUploadError(ValueError):
+    pass
+
+
+@dataclass
+class StagedUpload:
+    path: Path
+    content_hash: str
+    size: int
+
+
+def _write_chunk(handle: BinaryIO, hasher: "hashlib._Hash", chunk: bytes) -> None:
+    hasher.update(chunk)
+    handle.write(chunk)
+
+
+def _staging_path() -> Path:
+    # Staged under the storage root so the final rename stays on one filesystem.
+    return Path(settings.storage_root) / ".incoming" / f"{uuid.uuid4()}.part"
+
+
+def _discard(path: Path) -> None:
+    path.unlink(missing_ok=True)
+
+
+def _move_into_place(staged: Path, storage_path: Path) -> None:
+    storage_path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(staged, storage_path)
+
+
+def _discard_stored(storage_path: Path) -> None:
+    storage_path.unlink(missing_ok=True)
+    try:
+        storage_path.parent.rmdir()
+    except OSError:
+        pass
+
+
+async def stage_upload(chunks: AsyncIterable[bytes], *, max_bytes: int) -> StagedUpload:
+    # Hashes and writes each chunk off the event loop, so only one chunk is ever held
+    # in memory; stops reading as soon as the upload exceeds `max_bytes`.
+    path = _staging_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with path.open("wb") as handle:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+                await asyncio.to_thread(_write_chunk, handle, hasher, chunk)
+    except BaseException:
+        await asyncio.to_thread(_discard, path)
+        raise
+    return StagedUpload(path=path, content_hash=hasher.hexdigest(), size=size)
 
 
 def build_storage_path(owner_id: str, document_id: str, filename: str) -> Path:
@@ -33,32 +100,48 @@ async def create_document(
     session: AsyncSession,
     owner_id: UUID,
     filename: str,
-    content: bytes,
+    chunks: AsyncIterable[bytes],
 ) -> Document:
-    content_hash = _compute_hash(content)
-    existing = await get_document_by_hash(session, owner_id, content_hash)
-    if existing:
-        return existing
-
-    document = Document(
-        owner_id=owner_id,
-        source_type="PDF",
-        filename=filename,
-        content_hash=content_hash,
-        storage_uri="",
-        status="UPLOADED",
-    )
-    session.add(document)
-    await session.flush()
+    staged = await stage_upload(chunks, max_bytes=settings.upload_max_bytes)
+    try:
+        if staged.size == 0:
+            raise EmptyUploadError("Empty upload")
+        existing = await get_document_by_hash(session, owner_id, staged.content_hash)
+        if existing:
+            return existing
 
-    storage_path = build_storage_path(str(owner_id), str(document.id), filename)
-    storage_path.parent.mkdir(parents=True, exist_ok=True)
-    storage_path.write_bytes(content)
-    document.storage_uri = str(storage_path)
+        document = Document(
+            owner_id=owner_id,
+            source_type="PDF",
+            filename=filename,
+            content_hash=staged.content_hash,
+            storage_uri="",
+            status="UPLOADED",
+        )
+        session.add(document)
+        try:
+            await session.flush()
+        except IntegrityError:
+            # A concurrent upload of the same file won the (owner_id, content_hash) race.
+            await session.rollback()
+            existing = await get_document_by_hash(session, owner_id, staged.content_hash)
+            if existing is None:
+                raise
+            return existing
 
-    await session.commit()
-    await session.refresh(document)
-    return document
+        storage_path = build_storage_path(str(owner_id), str(document.id), filename)
+        await asyncio.to_thread(_move_into_place, staged.path, storage_path)
+        document.storage_uri = str(storage_path)
+        try:
+            await session.commit()
+        except Exception:
+            # The row never committed, so nothing will ever point at the stored file.
+            await asyncio.to_thread(_discard_stored, storage_path)
+            raise
+        await session.refresh(document)
+        return document
+    finally:
+        await asyncio.to_thread(_discard, staged.path)
 
 
 async def get_document(session: AsyncSession, owner_id: UUID, document_id: UUID) -> Document | None:
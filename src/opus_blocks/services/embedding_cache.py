@@ -0,0 +1,155 @@
+import hashlib
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from redis.asyncio import Redis
+
+from opus_blocks.core.config import settings
+
+
+def embedding_cache_key(normalized_text: str, model: str) -> str:
+    digest = hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+    return f"emb:{model}:{digest}"
+
+
+@dataclass
+class EmbeddingCacheStats:
+    memory_hits: int = 0
+    persistent_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    warmed: int = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.memory_hits + self.persistent_hits + self.misses
+        hits = self.memory_hits + self.persistent_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "warmed": self.warmed,
+            "hit_rate": hits / lookups if lookups else None,
+        }
+
+
+class RedisEmbeddingStore:
+    def __init__(self, *, url: str, ttl_seconds: int) -> None:
+        self._client = Redis.from_url(url)
+        self._ttl_seconds = ttl_seconds
+
+    async def get_many(self, keys: list[str]) -> list[list[float] | None]:
+        if not keys:
+            return []
+        payloads = await self._client.mget(keys)
+        return [_unpack(payload) if payload is not None else None for payload in payloads]
+
+    async def set_many(self, items: dict[str, list[float]]) -> None:
+        if not items:
+            return
+        # Size-bounded eviction is left to the TTL and the Redis maxmemory policy.
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, embedding in items.items():
+                pipe.set(key, _pack(embedding), ex=self._ttl_seconds or None)
+            await pipe.execute()
+
+
+def _pack(embedding: list[float]) -> bytes:
+    return array("f", embedding).tobytes()
+
+
+def _unpack(payload: bytes | str) -> list[float]:
+    values = array("f")
+    values.frombytes(payload if isinstance(payload, bytes) else payload.encode("latin-1"))
+    return values.tolist()
+
+
+class EmbeddingCache:
+    def __init__(self, *, max_entries: int, persistent: RedisEmbeddingStore | None = None) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        self._persistent = persistent
+        self.stats = EmbeddingCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, embedding: list[float]) -> None:
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        missing: list[str] = []
+        for key in keys:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                missing.append(key)
+                continue
+            self._entries.move_to_end(key)
+            found[key] = embedding
+            self.stats.memory_hits += 1
+        if missing and self._persistent is not None:
+            for key, embedding in zip(
+                missing, await self._persistent.get_many(missing), strict=True
+            ):
+                if embedding is None:
+                    continue
+                found[key] = embedding
+                self._remember(key, embedding)
+                self.stats.persistent_hits += 1
+        self.stats.misses += len(keys) - len(found)
+        return found
+
+    async def set_many(self, items: dict[str, list[float]], *, persist: bool = True) -> None:
+        for key, embedding in items.items():
+            self._remember(key, embedding)
+        if persist and self._persistent is not None:
+            await self._persistent.set_many(items)
+
+
+_embedding_cache: EmbeddingCache | None = None
+_embedding_cache_config: tuple[str, int, str, int] | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    global _embedding_cache, _embedding_cache_config
+    if settings.embeddings_cache_max_entries <= 0:
+        return None
+    backend = settings.embeddings_cache_backend.lower()
+    redis_url = settings.embeddings_cache_redis_url or settings.redis_url
+    config = (
+        backend,
+        settings.embeddings_cache_max_entries,
+        redis_url,
+        settings.embeddings_cache_ttl_seconds,
+    )
+    if _embedding_cache is not None and _embedding_cache_config == config:
+        return _embedding_cache
+    if backend == "memory":
+        persistent = None
+    elif backend == "redis":
+        persistent = RedisEmbeddingStore(
+            url=redis_url, ttl_seconds=settings.embeddings_cache_ttl_seconds
+        )
+    else:
+        raise ValueError(
+            f"Unsupported embeddings cache backend: {settings.embeddings_cache_backend}"
+        )
+    _embedding_cache = EmbeddingCache(
+        max_entries=settings.embeddings_cache_max_entries, persistent=persistent
+    )
+    _embedding_cache_config = config
+    return _embedding_cache
+
+
+def get_embedding_cache_stats() -> dict[str, Any]:
+    cache = get_embedding_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "size": len(cache), **cache.stats.snapshot()}
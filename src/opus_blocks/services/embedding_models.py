@@ -0,0 +1,122 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from opus_blocks.core.config import settings
+from opus_blocks.models.embedding_model import EmbeddingModel
+from opus_blocks.models.fact import Fact
+from opus_blocks.models.fact_embedding import FactEmbedding
+from opus_blocks.services.namespace_generations import ALL_NAMESPACES, bump_namespace_generation
+
+_BUILD_STATUSES = ("BUILDING", "READY")
+
+
+class EmbeddingModelError(ValueError):
+    pass
+
+
+async def get_active_embedding_model(session: AsyncSession) -> str:
+    # Until a model has been activated explicitly, EMBEDDINGS_MODEL serves retrieval.
+    active = await session.scalar(
+        select(EmbeddingModel.model).where(EmbeddingModel.status == "ACTIVE")
+    )
+    return active or settings.embeddings_model
+
+
+async def get_write_models(session: AsyncSession) -> tuple[str, list[str]]:
+    # New facts are embedded with the active model and with every model being built,
+    # so a re-embed never misses facts created while it runs.
+    rows = await session.execute(
+        select(EmbeddingModel.model, EmbeddingModel.status).where(
+            EmbeddingModel.status.in_(("ACTIVE", *_BUILD_STATUSES))
+        )
+    )
+    active = settings.embeddings_model
+    building: list[str] = []
+    for model, model_status in rows:
+        if model_status == "ACTIVE":
+            active = model
+        else:
+            building.append(model)
+    return active, [model for model in building if model != active]
+
+
+async def list_embedding_models(session: AsyncSession) -> list[EmbeddingModel]:
+    result = await session.execute(
+        select(EmbeddingModel).order_by(EmbeddingModel.created_at.desc())
+    )
+    return list(result.scalars().all())
+
+
+async def get_embedding_model(session: AsyncSession, model: str) -> EmbeddingModel | None:
+    return await session.get(EmbeddingModel, model)
+
+
+async def count_embeddable_facts(session: AsyncSession) -> int:
+    return (
+        await session.scalar(
+            select(func.count()).select_from(Fact).where(Fact.owner_id.is_not(None))
+        )
+        or 0
+    )
+
+
+async def count_embedded_facts(session: AsyncSession, model: str) -> int:
+    return (
+        await session.scalar(
+            select(func.count())
+            .select_from(FactEmbedding)
+            .where(FactEmbedding.embedding_model == model)
+        )
+        or 0
+    )
+
+
+async def start_reembed(
+    session: AsyncSession, model: str, *, activate_when_ready: bool = False
+) -> EmbeddingModel:
+    if model == await get_active_embedding_model(session):
+        raise EmbeddingModelError(f"{model} is already the active embedding model")
+    record = await session.get(EmbeddingModel, model)
+    if record is None:
+        record = EmbeddingModel(model=model, status="BUILDING")
+        session.add(record)
+    record.status = "BUILDING"
+    record.error = None
+    record.last_fact_id = None
+    record.activate_when_ready = activate_when_ready
+    record.total_facts = await count_embeddable_facts(session)
+    record.embedded_facts = await count_embedded_facts(session, model)
+    await session.commit()
+    await session.refresh(record)
+    return record
+
+
+async def activate_embedding_model(
+    session: AsyncSession, model: str, *, force: bool = False
+) -> EmbeddingModel:
+    record = await session.get(EmbeddingModel, model, with_for_update=True)
+    if record is None:
+        raise EmbeddingModelError(f"Embedding model {model} not found")
+    if record.status == "ACTIVE":
+        return record
+    if record.status != "READY" and not force:
+        raise EmbeddingModelError(f"Embedding model {model} is {record.status}, not READY")
+    previous = await get_active_embedding_model(session)
+    if previous != model and await session.get(EmbeddingModel, previous) is None:
+        # Record the implicit EMBEDDINGS_MODEL so it can be switched back to.
+        session.add(EmbeddingModel(model=previous, status="RETIRED"))
+    # Both updates commit together; retrieval sees either the old or the new model.
+    await session.execute(
+        update(EmbeddingModel)
+        .where(EmbeddingModel.status == "ACTIVE")
+        .values(status="RETIRED")
+        .execution_options(synchronize_session=False)
+    )
+    record.status = "ACTIVE"
+    record.activated_at = datetime.now(tz=UTC)
+    bump_namespace_generation(session, ALL_NAMESPACES)
+    await session.commit()
+    await session.refresh(record)
+    return record
@@ -1,12 +1,20 @@
+import asyncio
 import hashlib
+import weakref
+from collections.abc import Awaitable, Callable
 from uuid import UUID
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from opus_blocks.core.config import settings
+from opus_blocks.db.bulk import insert_rows
+from opus_blocks.llm.token_budget import estimate_tokens
 from opus_blocks.models.fact_embedding import FactEmbedding
+from opus_blocks.services.embedding_cache import embedding_cache_key, get_embedding_cache
+from opus_blocks.services.embedding_models import get_write_models
+from opus_blocks.services.namespace_generations import bump_namespace_generation
 
 
 async def upsert_fact_embedding(
@@ -19,7 +27,11 @@ async def upsert_fact_embedding(
     embedding: list[float],
     commit: bool = True,
 ) -> FactEmbedding:
-    result = await session.execute(select(FactEmbedding).where(FactEmbedding.fact_id == fact_id))
+    result = await session.execute(
+        select(FactEmbedding).where(
+            FactEmbedding.fact_id == fact_id, FactEmbedding.embedding_model == embedding_model
+        )
+    )
     embedding_record = result.scalar_one_or_none()
     if embedding_record:
         embedding_record.vector_id = vector_id
@@ -43,14 +55,41 @@ async def upsert_fact_embedding(
     return embedding_record
 
 
-def embed_text(text: str) -> list[float]:
-    normalized = text.strip().lower()
-    if settings.embeddings_provider == "openai" and settings.embeddings_use_openai:
-        if not settings.openai_api_key:
-            raise ValueError("openai_api_key must be set when embeddings_use_openai is true")
-        client = OpenAI(api_key=settings.openai_api_key)
-        response = client.embeddings.create(model=settings.embeddings_model, input=normalized)
-        return list(response.data[0].embedding)
+async def bulk_upsert_fact_embeddings(
+    session: AsyncSession,
+    items: list[tuple[UUID, list[float]]],
+    *,
+    embedding_model: str,
+    namespace: str,
+) -> None:
+    rows = [
+        {
+            "fact_id": fact_id,
+            "vector_id": str(fact_id),
+            "embedding_model": embedding_model,
+            "namespace": namespace,
+            "embedding": embedding,
+        }
+        for fact_id, embedding in items
+    ]
+    await insert_rows(
+        session,
+        FactEmbedding,
+        rows,
+        conflict_columns=("fact_id", "embedding_model"),
+        update_columns=("vector_id", "namespace", "embedding"),
+    )
+
+
+def _normalize(text: str) -> str:
+    return text.strip().lower()
+
+
+def _use_openai_embeddings() -> bool:
+    return settings.embeddings_provider == "openai" and settings.embeddings_use_openai
+
+
+def _stub_embedding(normalized: str) -> list[float]:
     if "alpha" in normalized:
         return [1.0, 0.0, 0.0]
     if "beta" in normalized:
@@ -59,21 +98,191 @@ def embed_text(text: str) -> list[float]:
     return [digest[0] / 255.0, digest[1] / 255.0, digest[2] / 255.0]
 
 
+# httpx connection pools are bound to the loop that opened them; keep one client per loop.
+_embedding_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, tuple[str, AsyncOpenAI]
+] = weakref.WeakKeyDictionary()
+
+
+def _get_embedding_client() -> AsyncOpenAI:
+    if not settings.openai_api_key:
+        raise ValueError("openai_api_key must be set when embeddings_use_openai is true")
+    loop = asyncio.get_running_loop()
+    cached = _embedding_clients.get(loop)
+    if cached is not None and cached[0] == settings.openai_api_key:
+        return cached[1]
+    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    _embedding_clients[loop] = (settings.openai_api_key, client)
+    return client
+
+
+def split_embedding_batches(
+    texts: list[str], *, max_items: int, max_tokens: int
+) -> list[list[str]]:
+    batches: list[list[str]] = []
+    current: list[str] = []
+    current_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        over_items = max_items > 0 and len(current) >= max_items
+        over_tokens = max_tokens > 0 and current_tokens + tokens > max_tokens
+        if current and (over_items or over_tokens):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _embed_openai_batch(batch: list[str], model: str) -> list[list[float]]:
+    client = _get_embedding_client()
+    response = await client.embeddings.create(model=model, input=batch)
+    ordered = sorted(response.data, key=lambda item: item.index)
+    return [list(item.embedding) for item in ordered]
+
+
+async def embed_texts(texts: list[str], *, model: str | None = None) -> list[list[float]]:
+    model = model or settings.embeddings_model
+    normalized = [_normalize(text) for text in texts]
+    if not _use_openai_embeddings():
+        return [_stub_embedding(text) for text in normalized]
+    unique = list(dict.fromkeys(normalized))
+    if not unique:
+        return []
+    by_text: dict[str, list[float]] = {}
+    cache = get_embedding_cache()
+    if cache is not None:
+        keys = {text: embedding_cache_key(text, model) for text in unique}
+        cached = await cache.get_many(list(keys.values()))
+        by_text = {text: cached[key] for text, key in keys.items() if key in cached}
+    pending = [text for text in unique if text not in by_text]
+    batches = split_embedding_batches(
+        pending,
+        max_items=settings.embeddings_batch_max_items,
+        max_tokens=settings.embeddings_batch_max_tokens,
+    )
+    results = await asyncio.gather(*(_embed_openai_batch(batch, model) for batch in batches))
+    fresh = {
+        text: embedding
+        for batch, embeddings in zip(batches, results, strict=True)
+        for text, embedding in zip(batch, embeddings, strict=True)
+    }
+    if cache is not None and fresh:
+        await cache.set_many({embedding_cache_key(text, model): vec for text, vec in fresh.items()})
+    by_text.update(fresh)
+    return [by_text[text] for text in normalized]
+
+
+async def fill_missing_embeddings(
+    contents: list[str], embeddings: list[list[float] | None], *, model: str | None = None
+) -> list[list[float]]:
+    missing = [
+        content for content, embedding in zip(contents, embeddings, strict=True) if not embedding
+    ]
+    computed = iter(await embed_texts(missing, model=model))
+    return [embedding or next(computed) for embedding in embeddings]
+
+
+type EmbedBatch = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+class EmbeddingCoalescer:
+    def __init__(self, embed_batch: EmbedBatch, *, window_ms: float, max_items: int) -> None:
+        self._embed_batch = embed_batch
+        self._window_seconds = max(0.0, window_ms) / 1000
+        self._max_items = max_items
+        self._pending: list[tuple[str, asyncio.Future[list[float]]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+
+    async def embed(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[float]] = loop.create_future()
+        self._pending.append((text, future))
+        if self._max_items > 0 and len(self._pending) >= self._max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _run(self, batch: list[tuple[str, asyncio.Future[list[float]]]]) -> None:
+        try:
+            embeddings = await self._embed_batch([text for text, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), embedding in zip(batch, embeddings, strict=True):
+            if not future.done():
+                future.set_result(embedding)
+
+
+_coalescers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, EmbeddingCoalescer]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_coalescer(model: str) -> EmbeddingCoalescer:
+    by_model = _coalescers.setdefault(asyncio.get_running_loop(), {})
+    coalescer = by_model.get(model)
+    if coalescer is None:
+
+        async def embed_batch(texts: list[str]) -> list[list[float]]:
+            return await embed_texts(texts, model=model)
+
+        coalescer = EmbeddingCoalescer(
+            embed_batch,
+            window_ms=settings.embeddings_coalesce_window_ms,
+            max_items=settings.embeddings_batch_max_items,
+        )
+        by_model[model] = coalescer
+    return coalescer
+
+
+async def embed_text(text: str, *, model: str | None = None) -> list[float]:
+    if not _use_openai_embeddings():
+        return _stub_embedding(_normalize(text))
+    # Concurrent single-text callers on this loop share one upstream request.
+    return await _get_coalescer(model or settings.embeddings_model).embed(text)
+
+
 async def upsert_fact_embedding_for_content(
     session: AsyncSession,
     fact_id: UUID,
     *,
     content: str,
     namespace: str,
-    embedding_model: str,
     commit: bool = True,
 ) -> FactEmbedding:
-    embedding = embed_text(content)
+    active_model, building_models = await get_write_models(session)
+    for model in building_models:
+        await bulk_upsert_fact_embeddings(
+            session,
+            [(fact_id, await embed_text(content, model=model))],
+            embedding_model=model,
+            namespace=namespace,
+        )
+    embedding = await embed_text(content, model=active_model)
     record = await upsert_fact_embedding(
         session,
         fact_id,
         vector_id=str(fact_id),
-        embedding_model=embedding_model,
+        embedding_model=active_model,
         namespace=namespace,
         embedding=embedding,
         commit=commit,
@@ -88,4 +297,76 @@ async def upsert_fact_embedding_for_content(
         namespace=namespace,
         embedding=embedding,
     )
+    bump_namespace_generation(session, namespace)
+    if commit:
+        await session.commit()
     return record
+
+
+async def embed_contents_for_write(
+    session: AsyncSession, contents: list[str]
+) -> tuple[str, dict[str, list[list[float]]]]:
+    # Embeds for the active model and every model being built, keyed by model name.
+    active_model, building_models = await get_write_models(session)
+    by_model = {model: await embed_texts(contents, model=model) for model in building_models}
+    by_model[active_model] = await embed_texts(contents, model=active_model)
+    return active_model, by_model
+
+
+async def write_fact_embeddings(
+    session: AsyncSession,
+    items: list[tuple[UUID, str]],
+    *,
+    namespace: str,
+    active_model: str,
+    embeddings_by_model: dict[str, list[list[float]]],
+) -> None:
+    for model, embeddings in embeddings_by_model.items():
+        await bulk_upsert_fact_embeddings(
+            session,
+            [
+                (fact_id, embedding)
+                for (fact_id, _), embedding in zip(items, embeddings, strict=True)
+            ],
+            embedding_model=model,
+            namespace=namespace,
+        )
+    from opus_blocks.vector_store import get_vector_store
+    from opus_blocks.vector_store.base import VectorUpsert
+    from opus_blocks.vector_store.stub import StubVectorStore
+
+    store = get_vector_store()
+    # The stub store reads fact_embeddings directly, which the bulk upsert already wrote.
+    if not isinstance(store, StubVectorStore):
+        await store.upsert_facts(
+            session=session,
+            items=[
+                VectorUpsert(
+                    fact_id=fact_id, content=content, namespace=namespace, embedding=embedding
+                )
+                for (fact_id, content), embedding in zip(
+                    items, embeddings_by_model[active_model], strict=True
+                )
+            ],
+        )
+    bump_namespace_generation(session, namespace)
+
+
+async def upsert_fact_embeddings_for_contents(
+    session: AsyncSession,
+    items: list[tuple[UUID, str]],
+    *,
+    namespace: str,
+) -> None:
+    if not items:
+        return
+    active_model, embeddings_by_model = await embed_contents_for_write(
+        session, [content for _, content in items]
+    )
+    await write_fact_embeddings(
+        session,
+        items,
+        namespace=namespace,
+        active_model=active_model,
+        embeddings_by_model=embeddings_by_model,
+    )
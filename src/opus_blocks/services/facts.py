@@ -1,10 +1,13 @@
+import uuid
+from typing import Any
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from opus_blocks.core.config import settings
+from opus_blocks.db.bulk import insert_rows
+from opus_blocks.db.pagination import keyset_paginate
 from opus_blocks.models.document import Document
 from opus_blocks.models.fact import Fact
 from opus_blocks.models.manuscript import Manuscript
@@ -12,7 +15,11 @@ from opus_blocks.models.manuscript_document import ManuscriptDocument
 from opus_blocks.models.span import Span
 from opus_blocks.schemas.fact import ManualFactCreate
 from opus_blocks.schemas.span import FactSpanCreate
-from opus_blocks.services.embeddings import upsert_fact_embedding_for_content
+from opus_blocks.services.embeddings import (
+    upsert_fact_embedding_for_content,
+    upsert_fact_embeddings_for_contents,
+)
+from opus_blocks.services.namespace_generations import bump_namespace_generation
 from opus_blocks.vector_store import get_vector_store
 
 
@@ -47,12 +54,75 @@ async def create_manual_fact(
             session,
             fact.id,
             content=fact.content,
-            embedding_model=settings.embeddings_model,
             namespace=f"user:{owner_id}",
         )
     return fact
 
 
+async def bulk_create_librarian_facts(
+    session: AsyncSession, owner_id: UUID, document_id: UUID, output_payload: dict
+) -> list[UUID]:
+    span_rows: list[dict] = []
+    fact_rows: list[dict] = []
+
+    def _span_id(fact_payload: dict) -> UUID | None:
+        span_data = fact_payload.get("source_span") or {}
+        if span_data.get("page") is None:
+            return None
+        span_id = uuid.uuid4()
+        span_rows.append(
+            {
+                "id": span_id,
+                "document_id": document_id,
+                "page": span_data.get("page"),
+                "start_char": span_data.get("start_char"),
+                "end_char": span_data.get("end_char"),
+                "quote": span_data.get("quote"),
+            }
+        )
+        return span_id
+
+    for fact_payload in output_payload.get("facts", []):
+        fact_rows.append(
+            {
+                "id": uuid.uuid4(),
+                "owner_id": owner_id,
+                "document_id": document_id,
+                "span_id": _span_id(fact_payload),
+                "source_type": fact_payload.get("source_type", "PDF"),
+                "content": fact_payload["content"],
+                "qualifiers": fact_payload.get("qualifiers", {}),
+                "confidence": fact_payload["confidence"],
+                "is_uncertain": False,
+                "created_by": "LIBRARIAN",
+            }
+        )
+    for fact_payload in output_payload.get("uncertain_facts", []):
+        fact_rows.append(
+            {
+                "id": uuid.uuid4(),
+                "owner_id": owner_id,
+                "document_id": document_id,
+                "span_id": _span_id(fact_payload),
+                "source_type": "PDF",
+                "content": fact_payload["content"],
+                "qualifiers": {"reason": fact_payload.get("reason")},
+                "confidence": 0.0,
+                "is_uncertain": True,
+                "created_by": "LIBRARIAN",
+            }
+        )
+
+    await insert_rows(session, Span, span_rows)
+    await insert_rows(session, Fact, fact_rows)
+    await upsert_fact_embeddings_for_contents(
+        session,
+        [(row["id"], row["content"]) for row in fact_rows],
+        namespace=f"user:{owner_id}",
+    )
+    return [row["id"] for row in fact_rows]
+
+
 async def list_document_facts(
     session: AsyncSession, owner_id: UUID, document_id: UUID
 ) -> list[Fact]:
@@ -85,15 +155,33 @@ async def list_document_facts_with_spans(
     return list(facts_result.tuples().all())
 
 
-async def list_manuscript_facts(
-    session: AsyncSession, owner_id: UUID, manuscript_id: UUID
-) -> list[Fact]:
+async def _require_manuscript(session: AsyncSession, owner_id: UUID, manuscript_id: UUID) -> None:
     manuscript_result = await session.execute(
         select(Manuscript).where(Manuscript.id == manuscript_id, Manuscript.owner_id == owner_id)
     )
     if not manuscript_result.scalar_one_or_none():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Manuscript not found")
 
+
+async def manuscript_facts_query(
+    session: AsyncSession, owner_id: UUID, manuscript_id: UUID, *, cursor: str | None = None
+) -> Select[Any]:
+    await _require_manuscript(session, owner_id, manuscript_id)
+    query = (
+        select(*Fact.__table__.columns)
+        .join(ManuscriptDocument, Fact.document_id == ManuscriptDocument.document_id)
+        .where(
+            ManuscriptDocument.manuscript_id == manuscript_id,
+            Fact.owner_id == owner_id,
+        )
+    )
+    return keyset_paginate(query, created_at=Fact.created_at, row_id=Fact.id, cursor=cursor)
+
+
+async def list_manuscript_facts(
+    session: AsyncSession, owner_id: UUID, manuscript_id: UUID
+) -> list[Fact]:
+    await _require_manuscript(session, owner_id, manuscript_id)
     facts_result = await session.execute(
         select(Fact)
         .join(ManuscriptDocument, Fact.document_id == ManuscriptDocument.document_id)
@@ -108,12 +196,7 @@ async def list_manuscript_facts(
 async def list_manuscript_facts_with_spans(
     session: AsyncSession, owner_id: UUID, manuscript_id: UUID
 ) -> list[tuple[Fact, Span | None]]:
-    manuscript_result = await session.execute(
-        select(Manuscript).where(Manuscript.id == manuscript_id, Manuscript.owner_id == owner_id)
-    )
-    if not manuscript_result.scalar_one_or_none():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Manuscript not found")
-
+    await _require_manuscript(session, owner_id, manuscript_id)
     facts_result = await session.execute(
         select(Fact, Span)
         .join(ManuscriptDocument, Fact.document_id == ManuscriptDocument.document_id)
@@ -172,7 +255,6 @@ async def create_fact_with_span(
         session,
         fact.id,
         content=fact.content,
-        embedding_model=settings.embeddings_model,
         namespace=f"user:{owner_id}",
     )
     return fact
@@ -190,4 +272,5 @@ async def delete_fact(session: AsyncSession, owner_id: UUID, fact_id: UUID) -> N
     store = get_vector_store()
     await store.delete_fact(session=session, fact_id=fact.id, namespace=namespace)
     await session.delete(fact)
+    bump_namespace_generation(session, namespace)
     await session.commit()
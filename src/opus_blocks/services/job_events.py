@@ -0,0 +1,225 @@
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from opus_blocks.core.config import settings
+from opus_blocks.models.job import Job
+from opus_blocks.schemas.job import JobRead
+from opus_blocks.services.jobs import get_job
+
+logger = logging.getLogger(__name__)
+
+# The jobs_notify_event trigger publishes committed status/progress/error changes on
+# this channel; workers publish in-flight retries on it directly (JobEventPublisher).
+JOB_EVENTS_CHANNEL = "job_events"
+TERMINAL_JOB_STATUSES = frozenset({"SUCCEEDED", "FAILED", "CANCELLED"})
+
+# NOTIFY payloads are capped at 8000 bytes; larger events only carry the id and status
+# and listeners re-read the job.
+_MAX_PAYLOAD_BYTES = 7900
+_SUBSCRIBER_QUEUE_SIZE = 64
+
+
+def job_event_payload(event: dict[str, Any]) -> str:
+    payload = json.dumps(event, default=str, separators=(",", ":"))
+    if len(payload.encode("utf-8")) <= _MAX_PAYLOAD_BYTES:
+        return payload
+    return json.dumps({"id": event["id"], "status": event["status"], "truncated": True})
+
+
+class JobEventPublisher:
+    # Workers announce in-flight retries on one autocommit connection per process. It sits
+    # outside the worker pool, so concurrent retries never take pooled connections, and
+    # delivery is best effort: a failure is logged and never fails the job.
+    def __init__(self) -> None:
+        self._connection: asyncpg.Connection | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = asyncio.Lock()
+
+    async def publish(self, job: Job) -> None:
+        payload = job_event_payload(
+            {"id": str(job.id), "status": job.status, "progress": job.progress, "error": job.error}
+        )
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._connection = None
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        try:
+            async with self._lock:
+                if self._connection is None or self._connection.is_closed():
+                    url = make_url(settings.database_url).set(drivername="postgresql")
+                    self._connection = await asyncpg.connect(
+                        url.render_as_string(hide_password=False)
+                    )
+                await self._connection.execute(
+                    "SELECT pg_notify($1, $2)", JOB_EVENTS_CHANNEL, payload
+                )
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError, TimeoutError) as exc:
+            logger.warning("Failed to publish event for job %s: %s", job.id, exc)
+
+    async def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None and self._loop is asyncio.get_running_loop():
+            await connection.close()
+
+
+_publisher = JobEventPublisher()
+
+
+async def publish_job_event(job: Job) -> None:
+    await _publisher.publish(job)
+
+
+async def close_job_event_publisher() -> None:
+    await _publisher.close()
+
+
+def apply_job_event(job: JobRead, event: dict[str, Any]) -> JobRead | None:
+    # None means the event cannot be applied locally and the job must be re-read.
+    if event.get("truncated") or event.get("resync"):
+        return None
+    return JobRead.model_validate({**job.model_dump(), **event})
+
+
+class JobEventHub:
+    # One LISTEN connection per process fans job events out to in-process subscribers,
+    # so waiting clients cost no queries until their job changes.
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[asyncio.Queue[dict[str, Any]]]] = {}
+        self._connection: asyncpg.Connection | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self, session: AsyncSession, job_id: UUID) -> asyncio.Queue[dict[str, Any]]:
+        await self.listen(session)
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=_SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(str(job_id), set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: UUID, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        queues = self._subscribers.get(str(job_id))
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[str(job_id)]
+
+    def subscriber_count(self, job_id: UUID) -> int:
+        return len(self._subscribers.get(str(job_id), ()))
+
+    async def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None and self._loop is asyncio.get_running_loop():
+            await connection.close()
+
+    async def listen(self, session: AsyncSession) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # asyncpg connections cannot cross event loops; the old one is abandoned.
+            self._connection = None
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return
+            url = session.get_bind().engine.url.set(drivername="postgresql")
+            connection = await asyncpg.connect(url.render_as_string(hide_password=False))
+            await connection.add_listener(JOB_EVENTS_CHANNEL, self._dispatch)
+            connection.add_termination_listener(self._on_terminated)
+            self._connection = connection
+
+    def _dispatch(self, _connection: object, _pid: int, _channel: str, payload: object) -> None:
+        try:
+            event = json.loads(str(payload))
+        except ValueError:
+            return
+        for queue in list(self._subscribers.get(str(event.get("id")), ())):
+            self._offer(queue, event)
+
+    def _on_terminated(self, connection: object) -> None:
+        # Events may have been missed while disconnected; subscribers re-read their job
+        # and the next subscribe reconnects.
+        if connection is not self._connection:
+            return
+        self._connection = None
+        for queues in list(self._subscribers.values()):
+            for queue in list(queues):
+                self._offer(queue, {"resync": True})
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue[dict[str, Any]], event: dict[str, Any]) -> None:
+        if queue.full():
+            # A slow consumer only needs the latest state; make it re-read.
+            queue.get_nowait()
+            event = {**event, "resync": True}
+        queue.put_nowait(event)
+
+
+_hub = JobEventHub()
+
+
+def get_job_event_hub() -> JobEventHub:
+    return _hub
+
+
+async def close_job_event_hub() -> None:
+    await _hub.close()
+
+
+async def next_job_event(
+    queue: asyncio.Queue[dict[str, Any]], *, timeout: float
+) -> dict[str, Any] | None:
+    try:
+        return await asyncio.wait_for(queue.get(), timeout=timeout)
+    except TimeoutError:
+        return None
+
+
+async def refresh_job(
+    session: AsyncSession, owner_id: UUID, job: JobRead, event: dict[str, Any]
+) -> JobRead | None:
+    updated = apply_job_event(job, event)
+    if updated is not None:
+        return updated
+    record = await get_job(session, owner_id, job.id)
+    # Release the pooled connection again while the client keeps waiting.
+    await session.close()
+    return JobRead.model_validate(record) if record is not None else None
+
+
+def _sse(job: JobRead) -> str:
+    return f"event: job\ndata: {job.model_dump_json()}\n\n"
+
+
+async def job_event_stream(
+    session: AsyncSession,
+    owner_id: UUID,
+    job: JobRead,
+    queue: asyncio.Queue[dict[str, Any]],
+    *,
+    heartbeat_seconds: float,
+) -> AsyncIterator[str]:
+    hub = get_job_event_hub()
+    current: JobRead | None = job
+    try:
+        yield _sse(job)
+        while current is not None and current.status not in TERMINAL_JOB_STATUSES:
+            event = await next_job_event(queue, timeout=heartbeat_seconds)
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            if event.get("resync"):
+                await hub.listen(session)
+            current = await refresh_job(session, owner_id, current, event)
+            if current is not None:
+                yield _sse(current)
+    finally:
+        hub.unsubscribe(job.id, queue)
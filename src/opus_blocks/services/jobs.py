@@ -38,7 +38,7 @@ async def get_job(session: AsyncSession, owner_id: UUID, job_id: UUID) -> Job |
     return result.scalar_one_or_none()
 
 
-def enqueue_job(task_name: str, *args: UUID) -> None:
+def enqueue_job(task_name: str, *args: UUID | str) -> None:
     if not settings.jobs_enqueue_enabled:
         logger.debug("Job dispatch disabled; skipping %s", task_name)
         return
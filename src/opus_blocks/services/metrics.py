@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
 from statistics import quantiles
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from opus_blocks.db.pagination import keyset_paginate
 from opus_blocks.models.job import Job
 from opus_blocks.models.metrics_snapshot import MetricsSnapshot
 from opus_blocks.models.paragraph import Paragraph
@@ -140,11 +142,14 @@ async def create_snapshot(
     return snapshot
 
 
-async def list_snapshots(session: AsyncSession, *, limit: int = 30) -> list[MetricsSnapshot]:
-    result = await session.execute(
-        select(MetricsSnapshot).order_by(MetricsSnapshot.created_at.desc()).limit(limit)
+def snapshots_list_query(*, cursor: str | None = None) -> Select[Any]:
+    return keyset_paginate(
+        select(*MetricsSnapshot.__table__.columns),
+        created_at=MetricsSnapshot.created_at,
+        row_id=MetricsSnapshot.id,
+        cursor=cursor,
+        descending=True,
     )
-    return list(result.scalars().all())
 
 
 def default_window(hours: int = 24) -> tuple[datetime, datetime]:
@@ -0,0 +1,47 @@
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from opus_blocks.models.namespace_generation import NamespaceGeneration
+
+# Bumped when something changes results for every namespace (e.g. the active model).
+ALL_NAMESPACES = "*"
+
+_PENDING_BUMPS = "pending_namespace_bumps"
+
+
+def bump_namespace_generation(session: AsyncSession, namespace: str) -> None:
+    # Deferred to the end of the writer's transaction: each namespace it touched is bumped
+    # once, in sorted order, just before commit. The new generation still only becomes
+    # visible together with the data it covers, but the row locks are taken in one order
+    # and held only for the commit, so writers spanning several namespaces cannot deadlock.
+    session.info.setdefault(_PENDING_BUMPS, set()).add(namespace)
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_pending_bumps(session: Session) -> None:
+    pending = session.info.pop(_PENDING_BUMPS, None)
+    for namespace in sorted(pending or ()):
+        statement = insert(NamespaceGeneration).values(namespace=namespace, generation=1)
+        statement = statement.on_conflict_do_update(
+            index_elements=["namespace"],
+            set_={"generation": NamespaceGeneration.generation + 1, "updated_at": func.now()},
+        )
+        session.execute(statement)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_bumps(session: Session, previous_transaction: SessionTransaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_BUMPS, None)
+
+
+async def get_namespace_generation(session: AsyncSession, namespace: str) -> int:
+    # Both counters only grow, so their sum changes whenever either is bumped.
+    value = await session.scalar(
+        select(func.coalesce(func.sum(NamespaceGeneration.generation), 0)).where(
+            NamespaceGeneration.namespace.in_((namespace, ALL_NAMESPACES))
+        )
+    )
+    return int(value or 0)
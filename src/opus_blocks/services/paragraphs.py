@@ -9,6 +9,7 @@ from opus_blocks.models.fact import Fact
 from opus_blocks.models.manuscript import Manuscript
 from opus_blocks.models.paragraph import Paragraph
 from opus_blocks.models.sentence import Sentence
+from opus_blocks.models.sentence_fact_link import SentenceFactLink
 from opus_blocks.schemas.paragraph import ParagraphSpecInput
 
 
@@ -74,6 +75,41 @@ async def get_paragraph(
     return result.scalar_one_or_none()
 
 
+async def load_paragraph_view(
+    session: AsyncSession, owner_id: UUID, paragraph_id: UUID
+) -> tuple[Paragraph, list[Sentence], list[SentenceFactLink], list[Fact]]:
+    # Ownership is checked once on the paragraph; each collection is then one
+    # set-based query, so the cost does not grow with the number of sentences.
+    paragraph = await get_paragraph(session, owner_id=owner_id, paragraph_id=paragraph_id)
+    if not paragraph:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Paragraph not found")
+
+    sentences_result = await session.execute(
+        select(Sentence).where(Sentence.paragraph_id == paragraph.id).order_by(Sentence.order.asc())
+    )
+    sentences = list(sentences_result.scalars().all())
+
+    links_result = await session.execute(
+        select(SentenceFactLink)
+        .join(Sentence, SentenceFactLink.sentence_id == Sentence.id)
+        .where(Sentence.paragraph_id == paragraph.id)
+        .order_by(Sentence.order.asc(), SentenceFactLink.created_at.asc())
+    )
+    links = list(links_result.scalars().all())
+
+    # Only facts the view can show: those cited by a sentence or allowed by the spec.
+    fact_ids = {link.fact_id for link in links} | set(paragraph.allowed_fact_ids or [])
+    facts: list[Fact] = []
+    if fact_ids:
+        facts_result = await session.execute(
+            select(Fact)
+            .where(Fact.id.in_(fact_ids), Fact.owner_id == owner_id)
+            .order_by(Fact.created_at.asc(), Fact.id.asc())
+        )
+        facts = list(facts_result.scalars().all())
+    return paragraph, sentences, links, facts
+
+
 async def update_paragraph_verification(
     session: AsyncSession, owner_id: UUID, paragraph_id: UUID
 ) -> Paragraph:
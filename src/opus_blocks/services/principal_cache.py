@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import event
+
+from opus_blocks.core.config import settings
+from opus_blocks.models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: UUID
+    email: str
+
+
+@dataclass
+class PrincipalCacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
+
+
+class PrincipalCache:
+    # Authenticated users by token subject. Entries live for `ttl_seconds`, which bounds
+    # how long another process can keep serving a user changed or deleted elsewhere;
+    # changes made through this process's ORM invalidate immediately.
+    def __init__(self, *, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[UUID, tuple[float, Principal]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = PrincipalCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: UUID) -> Principal | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                self.stats.expired += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, principal: Principal) -> None:
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self._ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, user_id: UUID) -> None:
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.stats.invalidations += 1
+
+
+_principal_cache: PrincipalCache | None = None
+# Requests authenticated from token claims alone, without the cache or a query.
+_trusted_claims = 0
+
+
+def get_principal_cache() -> PrincipalCache | None:
+    global _principal_cache
+    if settings.auth_principal_cache_max_entries <= 0:
+        return None
+    if _principal_cache is None or (
+        _principal_cache._max_entries != settings.auth_principal_cache_max_entries
+        or _principal_cache._ttl_seconds != settings.auth_principal_cache_ttl_seconds
+    ):
+        _principal_cache = PrincipalCache(
+            max_entries=settings.auth_principal_cache_max_entries,
+            ttl_seconds=settings.auth_principal_cache_ttl_seconds,
+        )
+    return _principal_cache
+
+
+def record_trusted_claims() -> None:
+    global _trusted_claims
+    _trusted_claims += 1
+
+
+def get_principal_cache_stats() -> dict[str, Any]:
+    cache = get_principal_cache()
+    if cache is None:
+        return {"enabled": False, "trusted_claims": _trusted_claims}
+    return {
+        "enabled": True,
+        "size": len(cache),
+        **cache.stats.snapshot(),
+        "trusted_claims": _trusted_claims,
+    }
+
+
+def invalidate_principal(user_id: UUID) -> None:
+    cache = get_principal_cache()
+    if cache is not None:
+        cache.invalidate(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(_mapper: Any, _connection: Any, target: User) -> None:
+    invalidate_principal(target.id)
@@ -1,15 +1,22 @@
 import hashlib
 import json
 import uuid
+from collections.abc import Collection
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import KeyedColumnElement
 
+from opus_blocks.db.pagination import keyset_paginate
 from opus_blocks.models.manuscript import Manuscript
 from opus_blocks.models.paragraph import Paragraph
 from opus_blocks.models.run import Run
 
+# Listings leave these JSONB columns out unless the caller asks for them.
+RUN_HEAVY_COLUMNS = ("inputs_json", "outputs_json", "cache_json")
+
 
 def _hash_inputs(payload: dict) -> str:
     normalized = json.dumps(payload, sort_keys=True, separators=(",", ":"))
@@ -32,6 +39,7 @@ async def create_run(
     cost_usd: float | None = None,
     latency_ms: int | None = None,
     trace_id: str | None = None,
+    cache_json: dict | None = None,
 ) -> Run:
     run = Run(
         owner_id=owner_id,
@@ -49,6 +57,8 @@ async def create_run(
         cost_usd=cost_usd,
         latency_ms=latency_ms,
         trace_id=trace_id or str(uuid.uuid4()),
+        cache_key=cache_json.get("key") if cache_json else None,
+        cache_json=cache_json,
     )
     session.add(run)
     await session.commit()
@@ -76,6 +86,7 @@ async def update_run_outputs(
     token_completion: int | None = None,
     cost_usd: float | None = None,
     latency_ms: int | None = None,
+    cache_json: dict | None = None,
 ) -> Run:
     result = await session.execute(select(Run).where(Run.id == run_id))
     run = result.scalar_one()
@@ -84,6 +95,8 @@ async def update_run_outputs(
     run.token_completion = token_completion
     run.cost_usd = cost_usd
     run.latency_ms = latency_ms
+    run.cache_key = cache_json.get("key") if cache_json else None
+    run.cache_json = cache_json
     session.add(run)
     await session.commit()
     await session.refresh(run)
@@ -103,28 +116,28 @@ async def list_paragraph_runs(
     return list(result.scalars().all())
 
 
-async def list_document_runs(session: AsyncSession, owner_id: UUID, document_id: UUID) -> list[Run]:
-    result = await session.execute(
-        select(Run)
-        .where(Run.document_id == document_id, Run.owner_id == owner_id)
-        .order_by(Run.created_at.asc())
-    )
-    return list(result.scalars().all())
+def _run_columns(include: Collection[str]) -> list[KeyedColumnElement[Any]]:
+    return [
+        column
+        for column in Run.__table__.columns
+        if column.name not in RUN_HEAVY_COLUMNS or column.name in include
+    ]
 
 
-async def list_runs_filtered(
-    session: AsyncSession,
+def runs_list_query(
     owner_id: UUID,
     run_type: str | None = None,
     paragraph_id: UUID | None = None,
     document_id: UUID | None = None,
-) -> list[Run]:
-    query = select(Run).where(Run.owner_id == owner_id)
+    *,
+    include: Collection[str] = (),
+    cursor: str | None = None,
+) -> Select[Any]:
+    query = select(*_run_columns(include)).where(Run.owner_id == owner_id)
     if run_type:
         query = query.where(Run.run_type == run_type)
     if paragraph_id:
         query = query.where(Run.paragraph_id == paragraph_id)
     if document_id:
         query = query.where(Run.document_id == document_id)
-    result = await session.execute(query.order_by(Run.created_at.asc()))
-    return list(result.scalars().all())
+    return keyset_paginate(query, created_at=Run.created_at, row_id=Run.id, cursor=cursor)
@@ -1,6 +1,15 @@
 from celery import Celery
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 
 from opus_blocks.core.config import settings
+from opus_blocks.db.worker import dispose_worker_engine, init_worker_engine
+from opus_blocks.tasks.runtime import get_worker_runtime
+from opus_blocks.vector_store import close_vector_stores
 
 celery_app = Celery(
     "opus_blocks",
@@ -11,3 +20,23 @@ celery_app.conf.task_track_started = True
 celery_app.conf.task_serializer = "json"
 celery_app.conf.accept_content = ["json"]
 celery_app.conf.result_serializer = "json"
+
+
+# worker_init covers solo/thread pools; prefork children also get worker_process_init.
+# The runtime loop itself starts lazily on the first task, after any fork.
+@worker_init.connect
+@worker_process_init.connect
+def _init_worker_process(**_: object) -> None:
+    # Imported here: job_events reaches celery_app through services.jobs.
+    from opus_blocks.services.job_events import close_job_event_publisher
+
+    init_worker_engine()
+    get_worker_runtime().on_shutdown(dispose_worker_engine)
+    get_worker_runtime().on_shutdown(close_job_event_publisher)
+
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**_: object) -> None:
+    get_worker_runtime().stop()
+    close_vector_stores()
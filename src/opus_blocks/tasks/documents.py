@@ -6,33 +6,36 @@ from pathlib import Path
 from uuid import UUID
 
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
 from opus_blocks.contracts.agent_contracts import validate_librarian_output
-from opus_blocks.core.circuit_breaker import CircuitBreakerOpen, get_llm_circuit_breaker
+from opus_blocks.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerOpen,
+    get_llm_circuit_breaker,
+)
 from opus_blocks.core.config import settings
-from opus_blocks.llm.provider import get_llm_provider
+from opus_blocks.db.worker import worker_session
+from opus_blocks.llm.cache import bypass_llm_cache
+from opus_blocks.llm.chunking import TextChunk, merge_librarian_results, split_source_text
+from opus_blocks.llm.provider import AsyncLLMProvider, LLMResult, get_llm_provider
+from opus_blocks.llm.token_budget import chars_for_tokens
 from opus_blocks.models.document import Document
 from opus_blocks.models.fact import Fact
 from opus_blocks.models.job import Job
-from opus_blocks.models.span import Span
 from opus_blocks.services.dead_letters import create_dead_letter
-from opus_blocks.services.embeddings import upsert_fact_embedding_for_content
+from opus_blocks.services.facts import bulk_create_librarian_facts
+from opus_blocks.services.job_events import publish_job_event
 from opus_blocks.services.runs import create_run
 from opus_blocks.tasks.celery_app import celery_app
+from opus_blocks.tasks.runtime import run_in_worker
 
 
-def _build_session_factory() -> tuple[async_sessionmaker, AsyncEngine]:
-    engine = create_async_engine(settings.database_url, pool_pre_ping=True)
-    session_factory = async_sessionmaker(engine, expire_on_commit=False)
-    return session_factory, engine
-
-
-def _bump_retry(job: Job, reason: str) -> None:
+async def _bump_retry(job: Job, reason: str) -> None:
     progress = dict(job.progress or {})
     progress["retries"] = progress.get("retries", 0) + 1
     progress["last_retry_reason"] = reason
     job.progress = progress
+    await publish_job_event(job)
 
 
 def _extract_pdf_text(content: bytes) -> tuple[str, list[dict[str, int]]]:
@@ -82,13 +85,70 @@ def _load_source_text(document: Document) -> tuple[str, str, list[dict[str, int]
     return text, content_hash, page_offsets
 
 
+class _ChunkContractError(ValueError):
+    def __init__(self, message: str, outputs: dict) -> None:
+        super().__init__(message)
+        self.outputs = outputs
+
+
+def _chunk_inputs(provider_inputs: dict, chunk: TextChunk, chunk_count: int) -> dict:
+    return {
+        **provider_inputs,
+        "source_text": chunk.text,
+        "span_map": {
+            "page_offsets": chunk.page_offsets,
+            "chunk": {"index": chunk.index, "count": chunk_count},
+        },
+    }
+
+
+async def _extract_chunk(
+    provider: AsyncLLMProvider,
+    breaker: CircuitBreaker,
+    job: Job,
+    inputs: dict,
+    *,
+    enforce_contract: bool,
+) -> LLMResult:
+    label = f"chunk {inputs['span_map']['chunk']['index']}"
+    try:
+        breaker.allow_request()
+        result = await provider.extract_facts(inputs=inputs)
+    except CircuitBreakerOpen:
+        raise
+    except Exception as exc:
+        breaker.record_failure()
+        await _bump_retry(job, f"extract_facts ({label}): {exc}")
+        try:
+            breaker.allow_request()
+            result = await provider.extract_facts(inputs=inputs)
+        except CircuitBreakerOpen:
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+    breaker.record_success()
+    if not enforce_contract:
+        return result
+
+    try:
+        validate_librarian_output(result.outputs)
+    except ValueError as exc:
+        await _bump_retry(job, f"librarian_contract ({label}): {exc}")
+        with bypass_llm_cache():
+            result = await provider.extract_facts(inputs=inputs)
+        try:
+            validate_librarian_output(result.outputs)
+        except ValueError as retry_exc:
+            raise _ChunkContractError(f"{label}: {retry_exc}", result.outputs) from retry_exc
+    return result
+
+
 async def run_extract_facts_job(job_id: UUID, document_id: UUID) -> None:
-    session_factory, engine = _build_session_factory()
-    async with session_factory() as session:
+    async with worker_session() as session:
         job = await session.scalar(select(Job).where(Job.id == job_id))
         document = await session.scalar(select(Document).where(Document.id == document_id))
         if not job or not document:
-            await engine.dispose()
             return
 
         job.status = "RUNNING"
@@ -110,40 +170,55 @@ async def run_extract_facts_job(job_id: UUID, document_id: UUID) -> None:
         }
         provider = get_llm_provider()
         breaker = get_llm_circuit_breaker()
-        try:
-            breaker.allow_request()
-            llm_result = provider.extract_facts(inputs=provider_inputs)
-        except Exception as exc:
-            if isinstance(exc, CircuitBreakerOpen):
+        # Re-extractions of documents that already have facts are not contract-checked.
+        existing_facts = await session.scalar(
+            select(Fact.id).where(Fact.document_id == document.id).limit(1)
+        )
+        enforce_contract = not existing_facts and job.owner_id is not None
+        chunks = split_source_text(
+            source_text,
+            page_offsets,
+            max_chars=chars_for_tokens(settings.librarian_chunk_tokens),
+            overlap_chars=chars_for_tokens(settings.librarian_chunk_overlap_tokens),
+        )
+        if len(chunks) > 1:
+            inputs_json["chunks"] = [
+                {"index": chunk.index, "start_char": chunk.start_char, "end_char": chunk.end_char}
+                for chunk in chunks
+            ]
+            semaphore = asyncio.Semaphore(max(1, settings.librarian_chunk_concurrency))
+
+            async def _bounded(chunk: TextChunk) -> LLMResult:
+                async with semaphore:
+                    return await _extract_chunk(
+                        provider,
+                        breaker,
+                        job,
+                        _chunk_inputs(provider_inputs, chunk, len(chunks)),
+                        enforce_contract=enforce_contract,
+                    )
+
+            results = await asyncio.gather(
+                *(_bounded(chunk) for chunk in chunks), return_exceptions=True
+            )
+            failure = next((item for item in results if isinstance(item, BaseException)), None)
+            if failure is not None:
                 job.status = "FAILED"
                 document.status = "FAILED_EXTRACTION"
-                job.error = str(exc)
                 session.add(job)
                 session.add(document)
-                await session.commit()
-                await engine.dispose()
-                return
-            breaker.record_failure()
-            _bump_retry(job, f"extract_facts: {exc}")
-            try:
-                breaker.allow_request()
-                llm_result = provider.extract_facts(inputs=provider_inputs)
-            except Exception as retry_exc:
-                if isinstance(retry_exc, CircuitBreakerOpen):
-                    job.status = "FAILED"
-                    document.status = "FAILED_EXTRACTION"
-                    job.error = str(retry_exc)
-                    session.add(job)
-                    session.add(document)
+                if isinstance(failure, CircuitBreakerOpen):
+                    job.error = str(failure)
                     await session.commit()
-                    await engine.dispose()
                     return
-                breaker.record_failure()
-                job.status = "FAILED"
-                document.status = "FAILED_EXTRACTION"
-                job.error = f"LLM extract failed: {retry_exc}"
-                session.add(job)
-                session.add(document)
+                if isinstance(failure, _ChunkContractError):
+                    job.error = f"Librarian contract validation failed: {failure}"
+                    job.progress = {
+                        **(job.progress or {}),
+                        "invalid_outputs": failure.outputs,
+                    }
+                else:
+                    job.error = f"LLM extract failed: {failure}"
                 await create_dead_letter(
                     session,
                     job_id=job.id,
@@ -152,31 +227,42 @@ async def run_extract_facts_job(job_id: UUID, document_id: UUID) -> None:
                     error=job.error,
                     retry_count=job.progress.get("retries", 0),
                 )
-                await engine.dispose()
                 return
-        breaker.record_success()
-        output_payload = llm_result.outputs
-
-        existing_facts = await session.scalar(
-            select(Fact.id).where(Fact.document_id == document.id).limit(1)
-        )
-        if not existing_facts and job.owner_id:
+            llm_result = merge_librarian_results(
+                [item for item in results if isinstance(item, LLMResult)], chunks, page_offsets
+            )
+            output_payload = llm_result.outputs
+        else:
             try:
-                validate_librarian_output(output_payload)
-            except ValueError as exc:
-                _bump_retry(job, f"librarian_contract: {exc}")
+                breaker.allow_request()
+                llm_result = await provider.extract_facts(inputs=provider_inputs)
+            except Exception as exc:
+                if isinstance(exc, CircuitBreakerOpen):
+                    job.status = "FAILED"
+                    document.status = "FAILED_EXTRACTION"
+                    job.error = str(exc)
+                    session.add(job)
+                    session.add(document)
+                    await session.commit()
+                    return
+                breaker.record_failure()
+                await _bump_retry(job, f"extract_facts: {exc}")
                 try:
-                    llm_result = provider.extract_facts(inputs=provider_inputs)
-                    output_payload = llm_result.outputs
-                    validate_librarian_output(output_payload)
-                except ValueError as retry_exc:
+                    breaker.allow_request()
+                    llm_result = await provider.extract_facts(inputs=provider_inputs)
+                except Exception as retry_exc:
+                    if isinstance(retry_exc, CircuitBreakerOpen):
+                        job.status = "FAILED"
+                        document.status = "FAILED_EXTRACTION"
+                        job.error = str(retry_exc)
+                        session.add(job)
+                        session.add(document)
+                        await session.commit()
+                        return
+                    breaker.record_failure()
                     job.status = "FAILED"
                     document.status = "FAILED_EXTRACTION"
-                    job.error = f"Librarian contract validation failed: {retry_exc}"
-                    job.progress = {
-                        **(job.progress or {}),
-                        "invalid_outputs": output_payload,
-                    }
+                    job.error = f"LLM extract failed: {retry_exc}"
                     session.add(job)
                     session.add(document)
                     await create_dead_letter(
@@ -187,8 +273,39 @@ async def run_extract_facts_job(job_id: UUID, document_id: UUID) -> None:
                         error=job.error,
                         retry_count=job.progress.get("retries", 0),
                     )
-                    await engine.dispose()
                     return
+            breaker.record_success()
+            output_payload = llm_result.outputs
+
+            if enforce_contract:
+                try:
+                    validate_librarian_output(output_payload)
+                except ValueError as exc:
+                    await _bump_retry(job, f"librarian_contract: {exc}")
+                    try:
+                        with bypass_llm_cache():
+                            llm_result = await provider.extract_facts(inputs=provider_inputs)
+                        output_payload = llm_result.outputs
+                        validate_librarian_output(output_payload)
+                    except ValueError as retry_exc:
+                        job.status = "FAILED"
+                        document.status = "FAILED_EXTRACTION"
+                        job.error = f"Librarian contract validation failed: {retry_exc}"
+                        job.progress = {
+                            **(job.progress or {}),
+                            "invalid_outputs": output_payload,
+                        }
+                        session.add(job)
+                        session.add(document)
+                        await create_dead_letter(
+                            session,
+                            job_id=job.id,
+                            task_name="extract_facts",
+                            payload_json=inputs_json,
+                            error=job.error,
+                            retry_count=job.progress.get("retries", 0),
+                        )
+                        return
 
         if job.owner_id:
             await create_run(
@@ -206,81 +323,11 @@ async def run_extract_facts_job(job_id: UUID, document_id: UUID) -> None:
                 token_completion=llm_result.metadata.token_completion,
                 cost_usd=llm_result.metadata.cost_usd,
                 latency_ms=llm_result.metadata.latency_ms,
+                cache_json=llm_result.metadata.cache,
                 trace_id=job.trace_id,
             )
 
-            for fact_payload in output_payload.get("facts", []):
-                span_data = fact_payload.get("source_span") or {}
-                span_id = None
-                if span_data.get("page") is not None:
-                    span = Span(
-                        document_id=document.id,
-                        page=span_data.get("page"),
-                        start_char=span_data.get("start_char"),
-                        end_char=span_data.get("end_char"),
-                        quote=span_data.get("quote"),
-                    )
-                    session.add(span)
-                    await session.flush()
-                    span_id = span.id
-                fact = Fact(
-                    owner_id=job.owner_id,
-                    document_id=document.id,
-                    span_id=span_id,
-                    source_type=fact_payload.get("source_type", "PDF"),
-                    content=fact_payload["content"],
-                    qualifiers=fact_payload.get("qualifiers", {}),
-                    confidence=fact_payload["confidence"],
-                    is_uncertain=False,
-                    created_by="LIBRARIAN",
-                )
-                session.add(fact)
-                await session.flush()
-                await upsert_fact_embedding_for_content(
-                    session,
-                    fact.id,
-                    content=fact.content,
-                    embedding_model=settings.embeddings_model,
-                    namespace=f"user:{job.owner_id}",
-                    commit=False,
-                )
-
-            for fact_payload in output_payload.get("uncertain_facts", []):
-                span_data = fact_payload.get("source_span") or {}
-                span_id = None
-                if span_data.get("page") is not None:
-                    span = Span(
-                        document_id=document.id,
-                        page=span_data.get("page"),
-                        start_char=span_data.get("start_char"),
-                        end_char=span_data.get("end_char"),
-                        quote=span_data.get("quote"),
-                    )
-                    session.add(span)
-                    await session.flush()
-                    span_id = span.id
-                qualifiers = {"reason": fact_payload.get("reason")}
-                fact = Fact(
-                    owner_id=job.owner_id,
-                    document_id=document.id,
-                    span_id=span_id,
-                    source_type="PDF",
-                    content=fact_payload["content"],
-                    qualifiers=qualifiers,
-                    confidence=0.0,
-                    is_uncertain=True,
-                    created_by="LIBRARIAN",
-                )
-                session.add(fact)
-                await session.flush()
-                await upsert_fact_embedding_for_content(
-                    session,
-                    fact.id,
-                    content=fact.content,
-                    embedding_model=settings.embeddings_model,
-                    namespace=f"user:{job.owner_id}",
-                    commit=False,
-                )
+            await bulk_create_librarian_facts(session, job.owner_id, document.id, output_payload)
 
         document.status = "FACTS_READY"
         job.status = "SUCCEEDED"
@@ -288,9 +335,7 @@ async def run_extract_facts_job(job_id: UUID, document_id: UUID) -> None:
         session.add(job)
         await session.commit()
 
-    await engine.dispose()
-
 
 @celery_app.task(name="extract_facts")
 def extract_facts(job_id: str, document_id: str) -> None:
-    asyncio.run(run_extract_facts_job(uuid.UUID(job_id), uuid.UUID(document_id)))
+    run_in_worker(run_extract_facts_job(uuid.UUID(job_id), uuid.UUID(document_id)))
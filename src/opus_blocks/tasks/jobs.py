@@ -1,6 +1,56 @@
+from opus_blocks.db.worker import get_pool_stats
+from opus_blocks.llm.cache import get_llm_cache_stats
+from opus_blocks.retrieval.cache import get_retrieval_cache_stats
+from opus_blocks.retrieval.stats import get_retrieval_stats
+from opus_blocks.services.embedding_cache import get_embedding_cache_stats
 from opus_blocks.tasks.celery_app import celery_app
+from opus_blocks.tasks.runtime import run_in_worker
+from opus_blocks.tools.embedding_cache_warmup import run_warmup
+from opus_blocks.tools.reembed import run_reembed
+from opus_blocks.vector_store.executor import get_vector_executor_stats
 
 
 @celery_app.task(name="ping")
 def ping() -> str:
     return "pong"
+
+
+@celery_app.task(name="worker_pool_stats")
+def worker_pool_stats() -> dict:
+    return get_pool_stats()
+
+
+@celery_app.task(name="llm_cache_stats")
+def llm_cache_stats() -> dict:
+    return get_llm_cache_stats().snapshot()
+
+
+@celery_app.task(name="embedding_cache_stats")
+def embedding_cache_stats() -> dict:
+    return get_embedding_cache_stats()
+
+
+@celery_app.task(name="reembed_facts")
+def reembed_facts(model: str) -> dict | None:
+    return run_in_worker(run_reembed(model))
+
+
+@celery_app.task(name="retrieval_cache_stats")
+def retrieval_cache_stats() -> dict:
+    return get_retrieval_cache_stats()
+
+
+@celery_app.task(name="retrieval_stats")
+def retrieval_stats() -> dict:
+    return get_retrieval_stats()
+
+
+@celery_app.task(name="vector_executor_stats")
+def vector_executor_stats() -> dict:
+    return get_vector_executor_stats()
+
+
+@celery_app.task(name="warm_embedding_cache")
+def warm_embedding_cache(owner_id: str | None = None, limit: int | None = None) -> int:
+    # Runs on the worker so its in-process tier is populated, not just Redis.
+    return run_in_worker(run_warmup(owner_id=owner_id, limit=limit))
@@ -1,16 +1,15 @@
-import asyncio
 import uuid
 from uuid import UUID
 
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
 from opus_blocks.contracts.agent_contracts import (
     validate_verifier_output,
     validate_writer_output,
 )
 from opus_blocks.core.circuit_breaker import CircuitBreakerOpen, get_llm_circuit_breaker
-from opus_blocks.core.config import settings
+from opus_blocks.db.worker import worker_session
+from opus_blocks.llm.cache import bypass_llm_cache
 from opus_blocks.llm.provider import get_llm_provider
 from opus_blocks.models.fact import Fact
 from opus_blocks.models.job import Job
@@ -19,30 +18,25 @@ from opus_blocks.models.sentence import Sentence
 from opus_blocks.models.sentence_fact_link import SentenceFactLink
 from opus_blocks.retrieval import get_retriever
 from opus_blocks.services.dead_letters import create_dead_letter
+from opus_blocks.services.job_events import publish_job_event
 from opus_blocks.services.runs import get_latest_run_by_type, update_run_outputs
 from opus_blocks.tasks.celery_app import celery_app
+from opus_blocks.tasks.runtime import run_in_worker
 
 
-def _build_session_factory() -> tuple[async_sessionmaker, AsyncEngine]:
-    engine = create_async_engine(settings.database_url, pool_pre_ping=True)
-    session_factory = async_sessionmaker(engine, expire_on_commit=False)
-    return session_factory, engine
-
-
-def _bump_retry(job: Job, reason: str) -> None:
+async def _bump_retry(job: Job, reason: str) -> None:
     progress = dict(job.progress or {})
     progress["retries"] = progress.get("retries", 0) + 1
     progress["last_retry_reason"] = reason
     job.progress = progress
+    await publish_job_event(job)
 
 
 async def run_generate_job(job_id: UUID, paragraph_id: UUID) -> None:
-    session_factory, engine = _build_session_factory()
-    async with session_factory() as session:
+    async with worker_session() as session:
         job = await session.scalar(select(Job).where(Job.id == job_id))
         paragraph = await session.scalar(select(Paragraph).where(Paragraph.id == paragraph_id))
         if not job or not paragraph:
-            await engine.dispose()
             return
 
         job.status = "RUNNING"
@@ -94,7 +88,7 @@ async def run_generate_job(job_id: UUID, paragraph_id: UUID) -> None:
             breaker = get_llm_circuit_breaker()
             try:
                 breaker.allow_request()
-                writer_result = provider.generate_paragraph(inputs=writer_inputs)
+                writer_result = await provider.generate_paragraph(inputs=writer_inputs)
             except Exception as exc:
                 if isinstance(exc, CircuitBreakerOpen):
                     paragraph.status = "FAILED_GENERATION"
@@ -103,13 +97,12 @@ async def run_generate_job(job_id: UUID, paragraph_id: UUID) -> None:
                     session.add(paragraph)
                     session.add(job)
                     await session.commit()
-                    await engine.dispose()
                     return
                 breaker.record_failure()
-                _bump_retry(job, f"generate_paragraph: {exc}")
+                await _bump_retry(job, f"generate_paragraph: {exc}")
                 try:
                     breaker.allow_request()
-                    writer_result = provider.generate_paragraph(inputs=writer_inputs)
+                    writer_result = await provider.generate_paragraph(inputs=writer_inputs)
                 except Exception as retry_exc:
                     if isinstance(retry_exc, CircuitBreakerOpen):
                         paragraph.status = "FAILED_GENERATION"
@@ -118,7 +111,6 @@ async def run_generate_job(job_id: UUID, paragraph_id: UUID) -> None:
                         session.add(paragraph)
                         session.add(job)
                         await session.commit()
-                        await engine.dispose()
                         return
                     breaker.record_failure()
                     paragraph.status = "FAILED_GENERATION"
@@ -134,7 +126,6 @@ async def run_generate_job(job_id: UUID, paragraph_id: UUID) -> None:
                         error=job.error,
                         retry_count=job.progress.get("retries", 0),
                     )
-                    await engine.dispose()
                     return
             breaker.record_success()
             writer_payload = writer_result.outputs
@@ -144,9 +135,10 @@ async def run_generate_job(job_id: UUID, paragraph_id: UUID) -> None:
                     writer_payload, allowed_fact_ids=set(paragraph.allowed_fact_ids)
                 )
             except ValueError as exc:
-                _bump_retry(job, f"writer_contract: {exc}")
+                await _bump_retry(job, f"writer_contract: {exc}")
                 try:
-                    writer_result = provider.generate_paragraph(inputs=writer_inputs)
+                    with bypass_llm_cache():
+                        writer_result = await provider.generate_paragraph(inputs=writer_inputs)
                     writer_payload = writer_result.outputs
                     validate_writer_output(
                         writer_payload, allowed_fact_ids=set(paragraph.allowed_fact_ids)
@@ -169,7 +161,6 @@ async def run_generate_job(job_id: UUID, paragraph_id: UUID) -> None:
                         error=job.error,
                         retry_count=job.progress.get("retries", 0),
                     )
-                    await engine.dispose()
                     return
 
             latest_run = await get_latest_run_by_type(session, paragraph.id, "WRITER")
@@ -182,6 +173,7 @@ async def run_generate_job(job_id: UUID, paragraph_id: UUID) -> None:
                     token_completion=writer_result.metadata.token_completion,
                     cost_usd=writer_result.metadata.cost_usd,
                     latency_ms=writer_result.metadata.latency_ms,
+                    cache_json=writer_result.metadata.cache,
                 )
 
             for sentence_payload in writer_payload["paragraph"].get("sentences", []):
@@ -211,16 +203,12 @@ async def run_generate_job(job_id: UUID, paragraph_id: UUID) -> None:
         session.add(job)
         await session.commit()
 
-    await engine.dispose()
-
 
 async def run_verify_job(job_id: UUID, paragraph_id: UUID) -> None:
-    session_factory, engine = _build_session_factory()
-    async with session_factory() as session:
+    async with worker_session() as session:
         job = await session.scalar(select(Job).where(Job.id == job_id))
         paragraph = await session.scalar(select(Paragraph).where(Paragraph.id == paragraph_id))
         if not job or not paragraph:
-            await engine.dispose()
             return
 
         job.status = "RUNNING"
@@ -272,7 +260,7 @@ async def run_verify_job(job_id: UUID, paragraph_id: UUID) -> None:
         breaker = get_llm_circuit_breaker()
         try:
             breaker.allow_request()
-            verifier_result = provider.verify_paragraph(inputs=verifier_inputs)
+            verifier_result = await provider.verify_paragraph(inputs=verifier_inputs)
         except Exception as exc:
             if isinstance(exc, CircuitBreakerOpen):
                 job.status = "FAILED"
@@ -281,13 +269,12 @@ async def run_verify_job(job_id: UUID, paragraph_id: UUID) -> None:
                 session.add(paragraph)
                 session.add(job)
                 await session.commit()
-                await engine.dispose()
                 return
             breaker.record_failure()
-            _bump_retry(job, f"verify_paragraph: {exc}")
+            await _bump_retry(job, f"verify_paragraph: {exc}")
             try:
                 breaker.allow_request()
-                verifier_result = provider.verify_paragraph(inputs=verifier_inputs)
+                verifier_result = await provider.verify_paragraph(inputs=verifier_inputs)
             except Exception as retry_exc:
                 if isinstance(retry_exc, CircuitBreakerOpen):
                     job.status = "FAILED"
@@ -296,7 +283,6 @@ async def run_verify_job(job_id: UUID, paragraph_id: UUID) -> None:
                     session.add(paragraph)
                     session.add(job)
                     await session.commit()
-                    await engine.dispose()
                     return
                 breaker.record_failure()
                 job.status = "FAILED"
@@ -312,16 +298,16 @@ async def run_verify_job(job_id: UUID, paragraph_id: UUID) -> None:
                     error=job.error,
                     retry_count=job.progress.get("retries", 0),
                 )
-                await engine.dispose()
                 return
         breaker.record_success()
         verifier_payload = verifier_result.outputs
         try:
             validate_verifier_output(verifier_payload, sentence_orders=[s.order for s in sentences])
         except ValueError as exc:
-            _bump_retry(job, f"verifier_contract: {exc}")
+            await _bump_retry(job, f"verifier_contract: {exc}")
             try:
-                verifier_result = provider.verify_paragraph(inputs=verifier_inputs)
+                with bypass_llm_cache():
+                    verifier_result = await provider.verify_paragraph(inputs=verifier_inputs)
                 verifier_payload = verifier_result.outputs
                 validate_verifier_output(
                     verifier_payload, sentence_orders=[s.order for s in sentences]
@@ -344,7 +330,6 @@ async def run_verify_job(job_id: UUID, paragraph_id: UUID) -> None:
                     error=job.error,
                     retry_count=job.progress.get("retries", 0),
                 )
-                await engine.dispose()
                 return
 
         latest_run = await get_latest_run_by_type(session, paragraph.id, "VERIFIER")
@@ -357,6 +342,7 @@ async def run_verify_job(job_id: UUID, paragraph_id: UUID) -> None:
                 token_completion=verifier_result.metadata.token_completion,
                 cost_usd=verifier_result.metadata.cost_usd,
                 latency_ms=verifier_result.metadata.latency_ms,
+                cache_json=verifier_result.metadata.cache,
             )
 
         for sentence in sentences:
@@ -376,14 +362,12 @@ async def run_verify_job(job_id: UUID, paragraph_id: UUID) -> None:
         session.add(job)
         await session.commit()
 
-    await engine.dispose()
-
 
 @celery_app.task(name="generate_paragraph")
 def generate_paragraph(job_id: str, paragraph_id: str) -> None:
-    asyncio.run(run_generate_job(uuid.UUID(job_id), uuid.UUID(paragraph_id)))
+    run_in_worker(run_generate_job(uuid.UUID(job_id), uuid.UUID(paragraph_id)))
 
 
 @celery_app.task(name="verify_paragraph")
 def verify_paragraph(job_id: str, paragraph_id: str) -> None:
-    asyncio.run(run_verify_job(uuid.UUID(job_id), uuid.UUID(paragraph_id)))
+    run_in_worker(run_verify_job(uuid.UUID(job_id), uuid.UUID(paragraph_id)))
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import os
+import threading
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+type ShutdownCallback = Callable[[], Coroutine[Any, Any, None]]
+
+
+class WorkerRuntime:
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+        self._shutdown_callbacks: list[ShutdownCallback] = []
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return self._loop
+            # A loop inherited across fork has no thread driving it; start a fresh one.
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=self._run_loop, args=(loop,), name="worker-event-loop", daemon=True
+            )
+            thread.start()
+            self._loop = loop
+            self._thread = thread
+            self._pid = os.getpid()
+            return loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def on_shutdown(self, callback: ShutdownCallback) -> None:
+        if callback not in self._shutdown_callbacks:
+            self._shutdown_callbacks.append(callback)
+
+    def submit[T](self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        loop = self.start()
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run[T](self, coro: Coroutine[Any, Any, T]) -> T:
+        return self.submit(coro).result()
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None or self._pid != os.getpid():
+                self._loop = None
+                self._thread = None
+                return
+            callbacks = list(reversed(self._shutdown_callbacks))
+            self._shutdown_callbacks = []
+            for callback in callbacks:
+                try:
+                    asyncio.run_coroutine_threadsafe(callback(), loop).result()
+                except Exception:
+                    logger.exception("Worker runtime shutdown callback failed")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            self._loop = None
+            self._thread = None
+
+
+_runtime = WorkerRuntime()
+
+
+def get_worker_runtime() -> WorkerRuntime:
+    return _runtime
+
+
+def run_in_worker[T](coro: Coroutine[Any, Any, T]) -> T:
+    return _runtime.run(coro)
@@ -0,0 +1,46 @@
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from opus_blocks.core.config import settings
+from opus_blocks.models.fact import Fact
+from opus_blocks.models.fact_embedding import FactEmbedding
+from opus_blocks.services.embedding_cache import embedding_cache_key, get_embedding_cache
+from opus_blocks.services.embedding_models import get_active_embedding_model
+
+_WARMUP_PAGE_ROWS = 1000
+
+
+async def run_warmup(owner_id: str | None = None, limit: int | None = None) -> int:
+    cache = get_embedding_cache()
+    if cache is None:
+        return 0
+    # Newest first: when the table is larger than the cache, keep the freshest vectors.
+    limit = limit or settings.embeddings_cache_max_entries
+    engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    warmed = 0
+    async with session_factory() as session:
+        model = await get_active_embedding_model(session)
+        query = (
+            select(Fact.content, FactEmbedding.embedding)
+            .join(FactEmbedding, FactEmbedding.fact_id == Fact.id)
+            .where(FactEmbedding.embedding_model == model)
+            .order_by(FactEmbedding.created_at.desc())
+            .limit(limit)
+            .execution_options(yield_per=_WARMUP_PAGE_ROWS)
+        )
+        if owner_id:
+            query = query.where(Fact.owner_id == uuid.UUID(owner_id))
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            items = {
+                embedding_cache_key(content.strip().lower(), model): list(embedding)
+                for content, embedding in rows
+            }
+            await cache.set_many(items)
+            warmed += len(items)
+    await engine.dispose()
+    cache.stats.warmed += warmed
+    return warmed
@@ -1,37 +1,212 @@
+import asyncio
+import json
+import logging
+import time
 import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from opus_blocks.core.config import settings
 from opus_blocks.models.fact import Fact
-from opus_blocks.services.embeddings import upsert_fact_embedding_for_content
+from opus_blocks.models.fact_embedding import FactEmbedding
+from opus_blocks.services.embedding_models import get_active_embedding_model
+from opus_blocks.services.embeddings import embed_contents_for_write, write_fact_embeddings
 
+logger = logging.getLogger(__name__)
 
-async def run_backfill(owner_id: str | None = None, limit: int | None = None) -> int:
-    engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+type BackfillItem = tuple[uuid.UUID, uuid.UUID, str]
+
+
+@dataclass
+class BackfillReport:
+    processed: int = 0
+    skipped: int = 0
+    batches: int = 0
+    last_id: str | None = None
+    elapsed_seconds: float = 0.0
+
+    @property
+    def facts_per_second(self) -> float:
+        return self.processed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass
+class BackfillCheckpoint:
+    last_id: str | None = None
+    owner_id: str | None = None
+    embedding_model: str | None = None
+    processed: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "BackfillCheckpoint":
+        if not path.exists():
+            return cls()
+        return cls(**json.loads(path.read_text()))
+
+    def save(self, path: Path) -> None:
+        # Write-then-rename so a crash never leaves a truncated checkpoint.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f"{path.suffix}.tmp")
+        tmp_path.write_text(json.dumps(asdict(self)))
+        tmp_path.replace(path)
+
+
+async def _next_page(
+    session: AsyncSession,
+    *,
+    after_id: uuid.UUID | None,
+    owner_id: uuid.UUID | None,
+    page_size: int,
+    model: str,
+) -> list[tuple[uuid.UUID, uuid.UUID, str, str | None]]:
+    query = (
+        select(Fact.id, Fact.owner_id, Fact.content, FactEmbedding.embedding_model)
+        .outerjoin(
+            FactEmbedding,
+            and_(FactEmbedding.fact_id == Fact.id, FactEmbedding.embedding_model == model),
+        )
+        .where(Fact.owner_id.is_not(None))
+        .order_by(Fact.id)
+        .limit(page_size)
+    )
+    if after_id is not None:
+        query = query.where(Fact.id > after_id)
+    if owner_id is not None:
+        query = query.where(Fact.owner_id == owner_id)
+    result = await session.execute(query)
+    return [(row[0], row[1], row[2], row[3]) for row in result.all()]
+
+
+async def _embed_batch(session: AsyncSession, items: list[BackfillItem]) -> None:
+    # Every embedding call finishes before the first write, so the batch's transaction
+    # never holds row locks across network calls; owners are written in a fixed order.
+    active_model, embeddings_by_model = await embed_contents_for_write(
+        session, [content for _, _, content in items]
+    )
+    by_owner: dict[uuid.UUID, list[int]] = {}
+    for index, (_, fact_owner_id, _) in enumerate(items):
+        by_owner.setdefault(fact_owner_id, []).append(index)
+    for fact_owner_id in sorted(by_owner):
+        indexes = by_owner[fact_owner_id]
+        await write_fact_embeddings(
+            session,
+            [(items[index][0], items[index][2]) for index in indexes],
+            namespace=f"user:{fact_owner_id}",
+            active_model=active_model,
+            embeddings_by_model={
+                model: [embeddings[index] for index in indexes]
+                for model, embeddings in embeddings_by_model.items()
+            },
+        )
+    await session.commit()
+
+
+async def run_backfill(
+    owner_id: str | None = None,
+    limit: int | None = None,
+    *,
+    batch_size: int = 256,
+    concurrency: int = 4,
+    checkpoint_path: str | None = None,
+    force: bool = False,
+) -> BackfillReport:
+    # Pages facts by id, embeds each page on one of `concurrency` workers (each with
+    # its own session) and commits per batch. The checkpoint only advances past a
+    # batch once every earlier batch has committed, so resuming never skips work.
+    owner_uuid = uuid.UUID(owner_id) if owner_id else None
+    checkpoint_file = Path(checkpoint_path) if checkpoint_path else None
+    checkpoint = BackfillCheckpoint.load(checkpoint_file) if checkpoint_file else None
+
+    engine = create_async_engine(
+        settings.database_url, pool_pre_ping=True, pool_size=max(1, concurrency) + 1
+    )
     session_factory = async_sessionmaker(engine, expire_on_commit=False)
-    processed = 0
     async with session_factory() as session:
-        query = select(Fact)
-        if owner_id:
-            query = query.where(Fact.owner_id == uuid.UUID(owner_id))
-        if limit:
-            query = query.limit(limit)
-        result = await session.execute(query)
-        facts = list(result.scalars().all())
-        for fact in facts:
-            if not fact.owner_id:
-                continue
-            await upsert_fact_embedding_for_content(
-                session,
-                fact.id,
-                content=fact.content,
-                embedding_model=settings.embeddings_model,
-                namespace=f"user:{fact.owner_id}",
-                commit=False,
-            )
-            processed += 1
-        await session.commit()
-    await engine.dispose()
-    return processed
+        model = await get_active_embedding_model(session)
+    if checkpoint is not None and (
+        checkpoint.owner_id != owner_id or checkpoint.embedding_model != model
+    ):
+        checkpoint = BackfillCheckpoint(owner_id=owner_id, embedding_model=model)
+    after_id = uuid.UUID(checkpoint.last_id) if checkpoint and checkpoint.last_id else None
+    report = BackfillReport(last_id=str(after_id) if after_id else None)
+    queue: asyncio.Queue[tuple[int, list[BackfillItem], uuid.UUID] | None] = asyncio.Queue(
+        maxsize=max(1, concurrency)
+    )
+    completed: dict[int, uuid.UUID] = {}
+    next_checkpoint_seq = 0
+    started = time.perf_counter()
+
+    def _advance_checkpoint() -> None:
+        nonlocal next_checkpoint_seq
+        while next_checkpoint_seq in completed:
+            report.last_id = str(completed.pop(next_checkpoint_seq))
+            next_checkpoint_seq += 1
+        if checkpoint is not None and checkpoint_file is not None:
+            checkpoint.last_id = report.last_id
+            checkpoint.save(checkpoint_file)
+
+    async def _worker() -> None:
+        async with session_factory() as session:
+            while (job := await queue.get()) is not None:
+                seq, items, page_last_id = job
+                if items:
+                    await _embed_batch(session, items)
+                    report.processed += len(items)
+                    report.batches += 1
+                    if checkpoint is not None:
+                        checkpoint.processed += len(items)
+                completed[seq] = page_last_id
+                _advance_checkpoint()
+                elapsed = time.perf_counter() - started
+                logger.info(
+                    "Backfilled %s facts (%s skipped) in %.1fs, %.1f facts/s",
+                    report.processed,
+                    report.skipped,
+                    elapsed,
+                    report.processed / elapsed if elapsed else 0.0,
+                )
+
+    async def _reader() -> None:
+        nonlocal after_id
+        queued = 0
+        seq = 0
+        async with session_factory() as session:
+            while limit is None or queued < limit:
+                page_size = batch_size if limit is None else min(batch_size, limit - queued)
+                page = await _next_page(
+                    session,
+                    after_id=after_id,
+                    owner_id=owner_uuid,
+                    page_size=page_size,
+                    model=model,
+                )
+                if not page:
+                    break
+                after_id = page[-1][0]
+                items = [
+                    (fact_id, fact_owner_id, content)
+                    for fact_id, fact_owner_id, content, embedding_model in page
+                    if force or embedding_model != model
+                ]
+                report.skipped += len(page) - len(items)
+                queued += len(items)
+                await queue.put((seq, items, after_id))
+                seq += 1
+        for _ in range(max(1, concurrency)):
+            await queue.put(None)
+
+    tasks = [asyncio.create_task(_reader())] + [
+        asyncio.create_task(_worker()) for _ in range(max(1, concurrency))
+    ]
+    try:
+        # A failing batch cancels the rest; the checkpoint keeps what already committed.
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await engine.dispose()
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
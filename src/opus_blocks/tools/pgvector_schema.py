@@ -0,0 +1,107 @@
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from opus_blocks.core.config import settings
+from opus_blocks.db.types import PGVECTOR_DISTANCES
+from opus_blocks.db.worker import worker_session
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "ix_fact_embeddings_embedding_hnsw"
+
+
+def expected_embedding_type() -> str:
+    return f"vector({int(settings.vector_dimensions)})"
+
+
+async def embedding_column_type(session: AsyncSession) -> str | None:
+    return await session.scalar(
+        text(
+            "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+            "WHERE attrelid = to_regclass('fact_embeddings') AND attname = 'embedding'"
+        )
+    )
+
+
+async def supports_iterative_scan(session: AsyncSession) -> bool:
+    # hnsw.iterative_scan (pgvector 0.8) keeps walking the graph until filtered rows fill
+    # the LIMIT; older versions stop after ef_search candidates.
+    version = await session.scalar(
+        text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    )
+    if not version:
+        return False
+    major, minor = (int(part) for part in version.split(".")[:2])
+    return (major, minor) >= (0, 8)
+
+
+async def enable_pgvector(session: AsyncSession, *, drop_mismatched: bool = False) -> dict:
+    # Converts fact_embeddings.embedding to vector(VECTOR_DIMENSIONS) and builds the HNSW
+    # index. Safe to re-run: an already converted column only gets a missing index.
+    distance = settings.pgvector_distance.lower()
+    if distance not in PGVECTOR_DISTANCES:
+        raise ValueError(f"Unsupported pgvector distance: {settings.pgvector_distance}")
+    _, opclass = PGVECTOR_DISTANCES[distance]
+    dimensions = int(settings.vector_dimensions)
+    expected = expected_embedding_type()
+
+    column_type = await embedding_column_type(session)
+    dropped = 0
+    converted = column_type != expected
+    if converted:
+        if column_type is not None and column_type.startswith("vector"):
+            raise RuntimeError(
+                f"fact_embeddings.embedding is already {column_type}; convert it back to "
+                f"double precision[] before switching to {expected}"
+            )
+        available = await session.scalar(
+            text("SELECT 1 FROM pg_available_extensions WHERE name = 'vector'")
+        )
+        if not available:
+            raise RuntimeError("VECTOR_BACKEND=pgvector requires the pgvector extension")
+        mismatched = (
+            await session.scalar(
+                text(
+                    "SELECT count(*) FROM fact_embeddings "
+                    "WHERE cardinality(embedding) <> :dimensions"
+                ),
+                {"dimensions": dimensions},
+            )
+            or 0
+        )
+        if mismatched and not drop_mismatched:
+            raise RuntimeError(
+                f"{mismatched} embeddings do not have {dimensions} dimensions; re-embed them "
+                "or re-run with --drop-mismatched and backfill afterwards"
+            )
+        await session.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        if mismatched:
+            await session.execute(
+                text("DELETE FROM fact_embeddings WHERE cardinality(embedding) <> :dimensions"),
+                {"dimensions": dimensions},
+            )
+            logger.warning("Dropped %s embeddings without %s dimensions", mismatched, dimensions)
+            dropped = mismatched
+        await session.execute(
+            text(
+                f"ALTER TABLE fact_embeddings ALTER COLUMN embedding TYPE {expected} "
+                f"USING embedding::{expected}"
+            )
+        )
+    await session.execute(
+        text(
+            f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON fact_embeddings "
+            f"USING hnsw (embedding {opclass}) "
+            f"WITH (m = {int(settings.pgvector_hnsw_m)}, "
+            f"ef_construction = {int(settings.pgvector_hnsw_ef_construction)})"
+        )
+    )
+    await session.commit()
+    return {"converted": converted, "dropped": dropped, "column_type": expected}
+
+
+async def run_enable_pgvector(*, drop_mismatched: bool = False) -> dict:
+    async with worker_session() as session:
+        return await enable_pgvector(session, drop_mismatched=drop_mismatched)
@@ -0,0 +1,89 @@
+import uuid
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from opus_blocks.core.config import settings
+from opus_blocks.db.worker import worker_session
+from opus_blocks.models.embedding_model import EmbeddingModel
+from opus_blocks.models.fact import Fact
+from opus_blocks.models.fact_embedding import FactEmbedding
+from opus_blocks.services.embedding_models import (
+    activate_embedding_model,
+    count_embeddable_facts,
+    count_embedded_facts,
+    start_reembed,
+)
+from opus_blocks.services.embeddings import bulk_upsert_fact_embeddings, embed_texts
+
+
+async def _reembed_batch(session: AsyncSession, record: EmbeddingModel, batch_size: int) -> int:
+    query = (
+        select(Fact.id, Fact.owner_id, Fact.content)
+        .outerjoin(
+            FactEmbedding,
+            and_(FactEmbedding.fact_id == Fact.id, FactEmbedding.embedding_model == record.model),
+        )
+        .where(Fact.owner_id.is_not(None), FactEmbedding.fact_id.is_(None))
+        .order_by(Fact.id)
+        .limit(batch_size)
+    )
+    if record.last_fact_id is not None:
+        query = query.where(Fact.id > record.last_fact_id)
+    rows = (await session.execute(query)).all()
+    if not rows:
+        return 0
+    embeddings = await embed_texts([row.content for row in rows], model=record.model)
+    by_owner: dict[uuid.UUID, list[tuple[uuid.UUID, list[float]]]] = {}
+    for row, embedding in zip(rows, embeddings, strict=True):
+        by_owner.setdefault(row.owner_id, []).append((row.id, embedding))
+    for owner_id, items in by_owner.items():
+        await bulk_upsert_fact_embeddings(
+            session, items, embedding_model=record.model, namespace=f"user:{owner_id}"
+        )
+    # Vectors and the checkpoint commit together, so a restart resumes exactly here.
+    record.last_fact_id = rows[-1].id
+    record.embedded_facts += len(rows)
+    await session.commit()
+    return len(rows)
+
+
+async def run_start_reembed(model: str, *, activate_when_ready: bool = False) -> EmbeddingModel:
+    async with worker_session() as session:
+        return await start_reembed(session, model, activate_when_ready=activate_when_ready)
+
+
+async def run_activate(model: str, *, force: bool = False) -> EmbeddingModel:
+    async with worker_session() as session:
+        return await activate_embedding_model(session, model, force=force)
+
+
+async def run_reembed(model: str, *, batch_size: int | None = None) -> dict | None:
+    # Builds `model` vectors next to the active ones; retrieval keeps using the active
+    # model until the switch. New facts are dual-written while the build runs.
+    batch_size = batch_size or settings.embeddings_reembed_batch_rows
+    async with worker_session() as session:
+        record = await session.get(EmbeddingModel, model)
+        if record is None or record.status != "BUILDING":
+            return None
+        try:
+            while await _reembed_batch(session, record, batch_size):
+                pass
+            record.total_facts = await count_embeddable_facts(session)
+            record.embedded_facts = await count_embedded_facts(session, model)
+            record.status = "READY"
+            await session.commit()
+            if record.activate_when_ready:
+                record = await activate_embedding_model(session, model)
+        except Exception as exc:
+            await session.rollback()
+            record.status = "FAILED"
+            record.error = str(exc)
+            await session.commit()
+            raise
+        return {
+            "model": record.model,
+            "status": record.status,
+            "embedded_facts": record.embedded_facts,
+            "total_facts": record.total_facts,
+        }
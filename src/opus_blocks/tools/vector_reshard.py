@@ -0,0 +1,70 @@
+from collections.abc import Sequence
+from typing import Any, cast
+
+import chromadb
+from chromadb.api.client import Client
+
+from opus_blocks.core.config import settings
+from opus_blocks.vector_store.chroma import collection_name_for
+
+
+def _is_managed(name: str, base: str) -> bool:
+    return name == base or name.startswith(f"{base}_")
+
+
+def run_reshard(*, batch_size: int = 1000, dry_run: bool = False) -> dict[str, int]:
+    # Moves every record in the base collection and its shards into the collection
+    # the current VECTOR_SHARD_MODE maps its namespace to. Embeddings are copied, not
+    # recomputed; emptied source collections are dropped.
+    client = cast(Client, chromadb.PersistentClient(path=settings.vector_persist_path))
+    base = settings.vector_collection
+    mode = settings.vector_shard_mode.lower()
+    moved: dict[str, int] = {}
+    try:
+        sources = [
+            collection
+            for collection in client.list_collections()
+            if _is_managed(collection.name, base)
+        ]
+        for source in sources:
+            moved_ids: list[str] = []
+            total = source.count()
+            for offset in range(0, total, batch_size):
+                page = source.get(
+                    include=["embeddings", "metadatas", "documents"],
+                    limit=batch_size,
+                    offset=offset,
+                )
+                targets: dict[str, dict[str, list[Any]]] = {}
+                for index, record_id in enumerate(page["ids"]):
+                    metadata = (page["metadatas"] or [])[index] or {}
+                    target = collection_name_for(
+                        str(metadata.get("namespace", "")),
+                        base=base,
+                        mode=mode,
+                        buckets=settings.vector_shard_buckets,
+                    )
+                    if target == source.name:
+                        continue
+                    batch = targets.setdefault(
+                        target, {"ids": [], "embeddings": [], "metadatas": [], "documents": []}
+                    )
+                    batch["ids"].append(record_id)
+                    batch["embeddings"].append(cast(Sequence[float], page["embeddings"])[index])
+                    batch["metadatas"].append(metadata)
+                    batch["documents"].append((page["documents"] or [])[index])
+                for target, batch in targets.items():
+                    moved[target] = moved.get(target, 0) + len(batch["ids"])
+                    moved_ids.extend(batch["ids"])
+                    if not dry_run:
+                        client.get_or_create_collection(name=target).upsert(**batch)
+            if dry_run or not moved_ids:
+                continue
+            if len(moved_ids) == total:
+                client.delete_collection(name=source.name)
+                continue
+            for start in range(0, len(moved_ids), batch_size):
+                source.delete(ids=moved_ids[start : start + batch_size])
+    finally:
+        client.close()
+    return moved
@@ -1,12 +1,58 @@
 """Vector store interfaces and default implementations."""
 
+import os
+import threading
+from collections.abc import Callable
+
 from opus_blocks.core.config import settings
-from opus_blocks.vector_store.chroma import ChromaVectorStore
+from opus_blocks.vector_store.chroma import ChromaVectorStore, discard_inherited_clients
+from opus_blocks.vector_store.pgvector import PgVectorStore
 from opus_blocks.vector_store.stub import StubVectorStore
 
+type AnyVectorStore = StubVectorStore | ChromaVectorStore | PgVectorStore
+
+# One store (and so one Chroma client/collection handle) per backend configuration
+# per process. Stores are dropped, not closed, when a forked child first asks for one.
+_stores: dict[tuple[object, ...], AnyVectorStore] = {}
+_stores_pid: int | None = None
+_stores_lock = threading.Lock()
 
-def get_vector_store() -> StubVectorStore | ChromaVectorStore:
+
+def _store_factory() -> tuple[Callable[[], AnyVectorStore], tuple[object, ...]]:
     backend = settings.vector_backend.lower()
     if backend == "chroma":
-        return ChromaVectorStore()
-    return StubVectorStore()
+        return ChromaVectorStore, (
+            settings.vector_persist_path,
+            settings.vector_collection,
+            settings.vector_shard_mode,
+            settings.vector_shard_buckets,
+            settings.vector_shard_cache_size,
+        )
+    if backend == "pgvector":
+        return PgVectorStore, ()
+    return StubVectorStore, (settings.stub_ann_enabled, settings.vector_persist_path)
+
+
+def get_vector_store() -> AnyVectorStore:
+    global _stores_pid
+    factory, config = _store_factory()
+    key = (factory, *config)
+    with _stores_lock:
+        if _stores_pid != os.getpid():
+            if _stores_pid is not None:
+                discard_inherited_clients()
+            _stores.clear()
+            _stores_pid = os.getpid()
+        store = _stores.get(key)
+        if store is None:
+            store = factory()
+            _stores[key] = store
+        return store
+
+
+def close_vector_stores() -> None:
+    with _stores_lock:
+        stores = list(_stores.values()) if _stores_pid == os.getpid() else []
+        _stores.clear()
+    for store in stores:
+        store.close()
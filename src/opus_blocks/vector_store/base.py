@@ -11,6 +11,14 @@ class VectorMatch:
     score: float
 
 
+@dataclass(frozen=True)
+class VectorUpsert:
+    fact_id: UUID
+    content: str
+    namespace: str
+    embedding: list[float] | None = None
+
+
 class VectorStore(Protocol):
     async def upsert_fact(
         self,
@@ -22,6 +30,8 @@ class VectorStore(Protocol):
         embedding: list[float] | None = None,
     ) -> None: ...
 
+    async def upsert_facts(self, *, session: AsyncSession, items: list[VectorUpsert]) -> None: ...
+
     async def query(
         self,
         *,
@@ -39,3 +49,13 @@ class VectorStore(Protocol):
         fact_id: UUID,
         namespace: str,
     ) -> None: ...
+
+    async def delete_facts(
+        self,
+        *,
+        session: AsyncSession,
+        fact_ids: list[UUID],
+        namespace: str,
+    ) -> None: ...
+
+    def close(self) -> None: ...
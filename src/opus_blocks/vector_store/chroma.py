@@ -1,19 +1,96 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
 from collections.abc import Sequence
 from typing import Any, cast
 from uuid import UUID
 
 import chromadb
+from chromadb.api.client import Client
+from chromadb.api.models.Collection import Collection
+from chromadb.api.shared_system_client import SharedSystemClient
+from chromadb.errors import NotFoundError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from opus_blocks.core.config import settings
-from opus_blocks.services.embeddings import embed_text
-from opus_blocks.vector_store.base import VectorMatch, VectorStore
+from opus_blocks.services.embedding_models import get_active_embedding_model
+from opus_blocks.services.embeddings import embed_text, fill_missing_embeddings
+from opus_blocks.vector_store.base import VectorMatch, VectorStore, VectorUpsert
+from opus_blocks.vector_store.executor import VectorExecutor
+
+_INVALID_COLLECTION_CHARS = re.compile(r"[^a-zA-Z0-9._-]")
+
+
+def collection_name_for(namespace: str, *, base: str, mode: str, buckets: int) -> str:
+    if mode == "namespace":
+        return f"{base}_{_INVALID_COLLECTION_CHARS.sub('_', namespace)}"
+    if mode == "hash":
+        digest = hashlib.sha256(namespace.encode("utf-8")).digest()
+        return f"{base}_b{int.from_bytes(digest[:8], 'big') % max(1, buckets):04d}"
+    if mode == "none":
+        return base
+    raise ValueError(f"Unsupported vector shard mode: {mode}")
 
 
 class ChromaVectorStore(VectorStore):
     def __init__(self) -> None:
-        self._client = chromadb.PersistentClient(path=settings.vector_persist_path)
-        self._collection = self._client.get_or_create_collection(name=settings.vector_collection)
+        self._client = cast(Client, chromadb.PersistentClient(path=settings.vector_persist_path))
+        self._shard_mode = settings.vector_shard_mode.lower()
+        self._base_name = settings.vector_collection
+        self._shard_buckets = settings.vector_shard_buckets
+        # Open shard handles, least recently used first; shards are created on first write.
+        self._collections: OrderedDict[str, Collection] = OrderedDict()
+        self._collections_lock = threading.Lock()
+        self._max_open_collections = max(1, settings.vector_shard_cache_size)
+        if self._shard_mode == "none":
+            self._collection = self._client.get_or_create_collection(name=self._base_name)
+        # chromadb is synchronous; every collection call goes through this pool so a
+        # slow query never blocks the event loop.
+        self._executor = VectorExecutor(
+            max_workers=settings.chroma_executor_workers,
+            queue_depth=settings.chroma_executor_queue_depth,
+            name="chroma",
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        self._client.close()
+
+    def collection_name(self, namespace: str) -> str:
+        return collection_name_for(
+            namespace, base=self._base_name, mode=self._shard_mode, buckets=self._shard_buckets
+        )
+
+    def _collection_for(self, namespace: str, *, create: bool) -> Collection | None:
+        if self._shard_mode == "none":
+            return self._collection
+        name = self.collection_name(namespace)
+        with self._collections_lock:
+            collection = self._collections.get(name)
+            if collection is not None:
+                self._collections.move_to_end(name)
+                return collection
+        try:
+            if create:
+                collection = self._client.get_or_create_collection(name=name)
+            else:
+                collection = self._client.get_collection(name=name)
+        except NotFoundError:
+            # Reads and deletes never create empty shards.
+            return None
+        with self._collections_lock:
+            self._collections[name] = collection
+            while len(self._collections) > self._max_open_collections:
+                self._collections.popitem(last=False)
+        return collection
+
+    def _call(self, namespace: str, method: str, *, create: bool, **kwargs: Any) -> Any:
+        # Runs on the executor: resolving a shard may touch Chroma's SQLite catalog.
+        collection = self._collection_for(namespace, create=create)
+        if collection is None:
+            return None
+        return getattr(collection, method)(**kwargs)
 
     async def upsert_fact(
         self,
@@ -24,15 +101,52 @@ class ChromaVectorStore(VectorStore):
         namespace: str,
         embedding: list[float] | None = None,
     ) -> None:
-        embedding_value = embedding or embed_text(content)
+        embedding_value = embedding or await embed_text(
+            content, model=await get_active_embedding_model(session)
+        )
         embeddings = cast(list[Sequence[float]], [embedding_value])
-        self._collection.upsert(
+        await self._executor.run(
+            self._call,
+            namespace,
+            "upsert",
+            create=True,
             ids=[str(fact_id)],
             embeddings=embeddings,
             metadatas=[{"fact_id": str(fact_id), "namespace": namespace}],
             documents=[content],
         )
 
+    async def upsert_facts(self, *, session: AsyncSession, items: list[VectorUpsert]) -> None:
+        if not items:
+            return
+        embeddings = await fill_missing_embeddings(
+            [item.content for item in items],
+            [item.embedding for item in items],
+            model=await get_active_embedding_model(session),
+        )
+        by_collection: dict[str, list[tuple[VectorUpsert, list[float]]]] = {}
+        for item, embedding in zip(items, embeddings, strict=True):
+            by_collection.setdefault(self.collection_name(item.namespace), []).append(
+                (item, embedding)
+            )
+        batch_size = self._client.get_max_batch_size()
+        for rows in by_collection.values():
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start : start + batch_size]
+                await self._executor.run(
+                    self._call,
+                    batch[0][0].namespace,
+                    "upsert",
+                    create=True,
+                    ids=[str(item.fact_id) for item, _ in batch],
+                    embeddings=cast(list[Sequence[float]], [embedding for _, embedding in batch]),
+                    metadatas=[
+                        {"fact_id": str(item.fact_id), "namespace": item.namespace}
+                        for item, _ in batch
+                    ],
+                    documents=[item.content for item, _ in batch],
+                )
+
     async def query(
         self,
         *,
@@ -44,18 +158,27 @@ class ChromaVectorStore(VectorStore):
     ) -> list[VectorMatch]:
         if not allowed_fact_ids:
             return []
-        query_embedding = embed_text(query)
+        # Chroma holds one vector per fact (the active model's); re-index after a switch.
+        query_embedding = await embed_text(query, model=await get_active_embedding_model(session))
         query_embeddings = cast(list[Sequence[float]], [query_embedding])
         where_filter: dict[str, Any] = {
-            "namespace": namespace,
-            "fact_id": {"$in": [str(fact_id) for fact_id in allowed_fact_ids]},
+            "$and": [
+                {"namespace": namespace},
+                {"fact_id": {"$in": [str(fact_id) for fact_id in allowed_fact_ids]}},
+            ]
         }
-        response = self._collection.query(
+        response = await self._executor.run(
+            self._call,
+            namespace,
+            "query",
+            create=False,
             query_embeddings=query_embeddings,
             n_results=limit,
             where=where_filter,
             include=["metadatas", "distances"],
         )
+        if response is None:
+            return []
         matches: list[VectorMatch] = []
         metadatas = response.get("metadatas") or [[]]
         distances = response.get("distances") or [[]]
@@ -77,11 +200,39 @@ class ChromaVectorStore(VectorStore):
         fact_id: UUID,
         namespace: str,
     ) -> None:
-        self._collection.delete(
+        await self._executor.run(
+            self._call,
+            namespace,
+            "delete",
+            create=False,
             ids=[str(fact_id)],
             where={"namespace": namespace},
         )
 
+    async def delete_facts(
+        self,
+        *,
+        session: AsyncSession,
+        fact_ids: list[UUID],
+        namespace: str,
+    ) -> None:
+        batch_size = self._client.get_max_batch_size()
+        for start in range(0, len(fact_ids), batch_size):
+            await self._executor.run(
+                self._call,
+                namespace,
+                "delete",
+                create=False,
+                ids=[str(fact_id) for fact_id in fact_ids[start : start + batch_size]],
+                where={"namespace": namespace},
+            )
+
+
+def discard_inherited_clients() -> None:
+    # Chroma shares one System (SQLite handles, background threads) per path at class
+    # level; a forked child must not reuse the parent's, nor stop it on close.
+    SharedSystemClient.clear_system_cache()
+
 
 def _distance_to_score(distance: float) -> float:
     if distance is None:
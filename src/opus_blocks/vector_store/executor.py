@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from opus_blocks.core.latency import LatencyHistogram
+
+
+class VectorStoreBusyError(RuntimeError):
+    pass
+
+
+@dataclass
+class VectorExecutorStats:
+    wait_ms: LatencyHistogram = field(default_factory=LatencyHistogram)
+    execution_ms: LatencyHistogram = field(default_factory=LatencyHistogram)
+    rejected: int = 0
+    errors: int = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "wait_ms": self.wait_ms.snapshot(),
+            "execution_ms": self.execution_ms.snapshot(),
+            "rejected": self.rejected,
+            "errors": self.errors,
+        }
+
+
+_stats = VectorExecutorStats()
+_stats_lock = threading.Lock()
+
+
+class VectorExecutor:
+    # Runs blocking vector-store client calls off the event loop. At most
+    # `max_workers` calls run at once and `queue_depth` more may wait; beyond that
+    # callers are rejected instead of piling up behind a slow backend.
+    def __init__(self, *, max_workers: int, queue_depth: int, name: str) -> None:
+        self._max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(self._max_workers + max(0, queue_depth))
+
+    async def run[T](self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        if not self._slots.acquire(blocking=False):
+            with _stats_lock:
+                _stats.rejected += 1
+            raise VectorStoreBusyError("Vector store executor queue is full")
+        submitted = time.perf_counter()
+
+        def call() -> T:
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                with _stats_lock:
+                    _stats.errors += 1
+                raise
+            finally:
+                finished = time.perf_counter()
+                with _stats_lock:
+                    _stats.wait_ms.observe((started - submitted) * 1000)
+                    _stats.execution_ms.observe((finished - started) * 1000)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def get_vector_executor_stats() -> dict[str, Any]:
+    with _stats_lock:
+        return _stats.snapshot()
+
+
+def reset_vector_executor_stats() -> None:
+    global _stats
+    with _stats_lock:
+        _stats = VectorExecutorStats()
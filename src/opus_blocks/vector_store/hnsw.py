@@ -0,0 +1,290 @@
+import heapq
+import json
+import math
+import os
+import threading
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+import numpy.typing as npt
+
+from opus_blocks.vector_store.similarity import normalize_vector, top_k
+
+_SNAPSHOT_VERSION = 1
+
+
+class HnswIndex:
+    # Hierarchical navigable small world graph over normalized float32 vectors, scored
+    # by cosine similarity. Deletes are tombstones: the node keeps routing searches but
+    # is never returned, and is dropped when the index is rebuilt.
+    def __init__(self, dim: int, *, m: int = 16, ef_construction: int = 100, seed: int = 0) -> None:
+        self.dim = dim
+        self.m = max(2, m)
+        self.ef_construction = max(ef_construction, self.m)
+        self._level_mult = 1.0 / math.log(self.m)
+        self._rng = np.random.default_rng(seed)
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._count = 0
+        self._keys: list[UUID] = []
+        self._ids: dict[UUID, int] = {}
+        self._deleted: list[bool] = []
+        # node -> level -> neighbour node ids
+        self._links: list[list[list[int]]] = []
+        self._entry = -1
+        self._max_level = -1
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, key: UUID) -> bool:
+        return key in self._ids
+
+    def keys(self) -> set[UUID]:
+        with self._lock:
+            return set(self._ids)
+
+    @property
+    def tombstones(self) -> int:
+        return self._count - len(self._ids)
+
+    def add(self, key: UUID, vector: Sequence[float], *, replace: bool = True) -> None:
+        with self._lock:
+            if key in self._ids:
+                if not replace:
+                    return
+                self._deleted[self._ids.pop(key)] = True
+            self._insert(key, normalize_vector(vector))
+
+    def add_many(
+        self, items: Iterable[tuple[UUID, Sequence[float]]], *, replace: bool = True
+    ) -> int:
+        added = 0
+        for key, vector in items:
+            if len(vector) != self.dim or (not replace and key in self._ids):
+                continue
+            self.add(key, vector, replace=replace)
+            added += 1
+        return added
+
+    def remove(self, key: UUID) -> bool:
+        with self._lock:
+            node = self._ids.pop(key, None)
+            if node is None:
+                return False
+            self._deleted[node] = True
+            return True
+
+    def compact(self) -> None:
+        # Rebuilds the graph from live nodes so tombstones stop costing search time.
+        with self._lock:
+            live = [(key, self._vectors[node].copy()) for key, node in self._ids.items()]
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+            self._count = 0
+            self._keys, self._ids, self._deleted, self._links = [], {}, [], []
+            self._entry = self._max_level = -1
+            for key, vector in live:
+                self._insert(key, vector)
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int,
+        *,
+        ef: int = 64,
+        allowed: set[UUID] | None = None,
+    ) -> list[tuple[UUID, float]]:
+        if k <= 0 or len(query) != self.dim:
+            return []
+        vector = normalize_vector(query)
+        with self._lock:
+            if self._entry < 0:
+                return []
+            entry = [self._entry]
+            for level in range(self._max_level, 0, -1):
+                entry = [max(self._search_layer(vector, entry, 1, level))[1]]
+            found = self._search_layer(vector, entry, max(ef, k), 0)
+            results = [
+                (self._keys[node], score)
+                for score, node in sorted(found, reverse=True)
+                if not self._deleted[node] and (allowed is None or self._keys[node] in allowed)
+            ]
+        return results[:k]
+
+    def exact(
+        self, query: Sequence[float], k: int, *, allowed: Iterable[UUID] | None = None
+    ) -> list[tuple[UUID, float]]:
+        if k <= 0 or len(query) != self.dim:
+            return []
+        with self._lock:
+            if allowed is None:
+                nodes = list(self._ids.values())
+            else:
+                nodes = [node for key in allowed if (node := self._ids.get(key)) is not None]
+            if not nodes:
+                return []
+            scores = self._vectors[nodes] @ normalize_vector(query)
+            return [(self._keys[nodes[index]], score) for index, score in top_k(scores, k)]
+
+    def _random_level(self) -> int:
+        return int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+
+    def _insert(self, key: UUID, vector: npt.NDArray[np.float32]) -> None:
+        node = self._count
+        if node == self._vectors.shape[0]:
+            grown = np.zeros((max(16, node * 2), self.dim), dtype=np.float32)
+            grown[:node] = self._vectors[:node]
+            self._vectors = grown
+        self._vectors[node] = vector
+        self._count += 1
+        self._keys.append(key)
+        self._ids[key] = node
+        self._deleted.append(False)
+        level = self._random_level()
+        self._links.append([[] for _ in range(level + 1)])
+        if self._entry < 0:
+            self._entry, self._max_level = node, level
+            return
+
+        entry = [self._entry]
+        for layer in range(self._max_level, level, -1):
+            entry = [max(self._search_layer(vector, entry, 1, layer))[1]]
+        for layer in range(min(level, self._max_level), -1, -1):
+            found = self._search_layer(vector, entry, self.ef_construction, layer)
+            neighbours = self._select_neighbours(found, self.m)
+            self._links[node][layer] = neighbours
+            max_links = self.m * 2 if layer == 0 else self.m
+            for neighbour in neighbours:
+                links = self._links[neighbour][layer]
+                links.append(node)
+                if len(links) > max_links:
+                    scores = self._vectors[links] @ self._vectors[neighbour]
+                    self._links[neighbour][layer] = self._select_neighbours(
+                        list(zip(scores.tolist(), links, strict=True)), max_links
+                    )
+            entry = [candidate for _, candidate in found]
+        if level > self._max_level:
+            self._entry, self._max_level = node, level
+
+    def _search_layer(
+        self, vector: npt.NDArray[np.float32], entry: list[int], ef: int, layer: int
+    ) -> list[tuple[float, int]]:
+        visited = set(entry)
+        entry_scores = (self._vectors[entry] @ vector).tolist()
+        candidates = [(-score, node) for score, node in zip(entry_scores, entry, strict=True)]
+        heapq.heapify(candidates)
+        found = [(score, node) for score, node in zip(entry_scores, entry, strict=True)]
+        heapq.heapify(found)
+        while len(found) > ef:
+            heapq.heappop(found)
+        while candidates:
+            negative_score, node = heapq.heappop(candidates)
+            if -negative_score < found[0][0] and len(found) >= ef:
+                break
+            links = self._links[node]
+            fresh = [n for n in links[layer] if n not in visited] if layer < len(links) else []
+            if not fresh:
+                continue
+            visited.update(fresh)
+            scores = self._vectors[fresh] @ vector
+            if len(found) >= ef:
+                # Most neighbours lose to the current worst result; skip them in bulk.
+                better = np.flatnonzero(scores > found[0][0]).tolist()
+                fresh = [fresh[position] for position in better]
+                scores = scores[better]
+            for neighbour, score in zip(fresh, scores.tolist(), strict=True):
+                if len(found) < ef:
+                    heapq.heappush(found, (score, neighbour))
+                elif score > found[0][0]:
+                    heapq.heapreplace(found, (score, neighbour))
+                else:
+                    continue
+                heapq.heappush(candidates, (-score, neighbour))
+        return found
+
+    def _select_neighbours(self, found: list[tuple[float, int]], limit: int) -> list[int]:
+        # The HNSW heuristic: keep a candidate only if it is closer to the base vector
+        # than to every neighbour already kept, so links spread out in all directions;
+        # then top up with the nearest skipped candidates.
+        ordered = sorted(found, reverse=True)
+        nodes = [node for _, node in ordered]
+        candidates = self._vectors[nodes]
+        pairwise = (candidates @ candidates.T).tolist()
+        selected: list[int] = []
+        skipped: list[int] = []
+        for position, (score, node) in enumerate(ordered):
+            if len(selected) >= limit:
+                break
+            row = pairwise[position]
+            if any(row[kept] > score for kept in selected):
+                skipped.append(node)
+                continue
+            selected.append(position)
+        return [nodes[position] for position in selected] + skipped[: limit - len(selected)]
+
+    def save(self, path: Path, *, metadata: dict[str, Any] | None = None) -> None:
+        with self._lock:
+            levels = np.array([len(links) for links in self._links], dtype=np.int32)
+            flat = [links for node_links in self._links for links in node_links]
+            offsets = np.zeros(len(flat) + 1, dtype=np.int64)
+            np.cumsum([len(links) for links in flat], out=offsets[1:])
+            data = np.fromiter(
+                (n for links in flat for n in links), dtype=np.int32, count=int(offsets[-1])
+            )
+            header = {
+                "version": _SNAPSHOT_VERSION,
+                "dim": self.dim,
+                "m": self.m,
+                "ef_construction": self.ef_construction,
+                "entry": self._entry,
+                "max_level": self._max_level,
+                "metadata": metadata or {},
+            }
+            keys = np.frombuffer(b"".join(key.bytes for key in self._keys), dtype=np.uint8)
+            vectors = self._vectors[: self._count].copy()
+            deleted = np.array(self._deleted, dtype=np.bool_)
+        # Write-then-rename so a crash never leaves a truncated snapshot behind.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f"{path.suffix}.tmp")
+        with tmp_path.open("wb") as handle:
+            np.savez(
+                handle,
+                header=np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8),
+                vectors=vectors,
+                keys=keys.reshape(len(vectors), 16),
+                deleted=deleted,
+                levels=levels,
+                offsets=offsets,
+                links=data,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> tuple["HnswIndex", dict[str, Any]]:
+        with np.load(path) as snapshot:
+            header = json.loads(snapshot["header"].tobytes())
+            if header["version"] != _SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported HNSW snapshot version: {header['version']}")
+            index = cls(header["dim"], m=header["m"], ef_construction=header["ef_construction"])
+            index._vectors = np.ascontiguousarray(snapshot["vectors"], dtype=np.float32)
+            index._count = index._vectors.shape[0]
+            index._keys = [UUID(bytes=row.tobytes()) for row in snapshot["keys"]]
+            index._deleted = snapshot["deleted"].tolist()
+            index._ids = {
+                key: node
+                for node, (key, deleted) in enumerate(zip(index._keys, index._deleted, strict=True))
+                if not deleted
+            }
+            offsets = snapshot["offsets"].tolist()
+            links = snapshot["links"].tolist()
+            flat = [links[start:end] for start, end in zip(offsets, offsets[1:], strict=False)]
+            position = 0
+            for level_count in snapshot["levels"].tolist():
+                index._links.append(flat[position : position + level_count])
+                position += level_count
+            index._entry = header["entry"]
+            index._max_level = header["max_level"]
+        return index, header["metadata"]
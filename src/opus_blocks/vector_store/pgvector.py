@@ -0,0 +1,112 @@
+from uuid import UUID
+
+from sqlalchemy import Float, any_, bindparam, cast, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from opus_blocks.core.config import settings
+from opus_blocks.db.types import PGVECTOR_DISTANCES, Vector
+from opus_blocks.models.fact_embedding import FactEmbedding
+from opus_blocks.services.embedding_models import get_active_embedding_model
+from opus_blocks.services.embeddings import embed_text
+from opus_blocks.tools.pgvector_schema import (
+    embedding_column_type,
+    expected_embedding_type,
+    supports_iterative_scan,
+)
+from opus_blocks.vector_store.base import VectorMatch
+from opus_blocks.vector_store.stub import StubVectorStore
+
+
+def _distance_to_score(distance: str, value: float) -> float:
+    if distance == "cosine":
+        return 1.0 - value
+    if distance == "inner_product":
+        # <#> returns the negative inner product so that ascending order is best-first.
+        return -value
+    return 1.0 / (1.0 + value)
+
+
+class PgVectorStore(StubVectorStore):
+    # Writes go to fact_embeddings exactly like the stub; only search differs.
+    def __init__(self) -> None:
+        # Postgres does the ranking, so the stub's in-process ANN index is never built.
+        self._ann = None
+        self._schema_checked = False
+        self._iterative_scan = False
+
+    async def _require_vector_column(self, session: AsyncSession) -> None:
+        if self._schema_checked:
+            return
+        column_type = await embedding_column_type(session)
+        if column_type != expected_embedding_type():
+            raise RuntimeError(
+                f"fact_embeddings.embedding is {column_type}, not {expected_embedding_type()}; "
+                "run `uv run python scripts/enable_pgvector.py`"
+            )
+        self._iterative_scan = await supports_iterative_scan(session)
+        self._schema_checked = True
+
+    async def query(
+        self,
+        *,
+        session: AsyncSession,
+        query: str,
+        namespace: str,
+        allowed_fact_ids: list[UUID],
+        limit: int = 10,
+    ) -> list[VectorMatch]:
+        if not allowed_fact_ids:
+            return []
+        distance = settings.pgvector_distance.lower()
+        if distance not in PGVECTOR_DISTANCES:
+            raise ValueError(f"Unsupported pgvector distance: {settings.pgvector_distance}")
+        operator, _ = PGVECTOR_DISTANCES[distance]
+        await self._require_vector_column(session)
+        model = await get_active_embedding_model(session)
+        query_embedding = await embed_text(query, model=model)
+        query_vector = cast(bindparam("query_vector", query_embedding, type_=Vector()), Vector())
+        allowed = bindparam("allowed_fact_ids", allowed_fact_ids, type_=ARRAY(PG_UUID()))
+        filters = (
+            FactEmbedding.namespace == namespace,
+            FactEmbedding.embedding_model == model,
+            FactEmbedding.fact_id == any_(allowed),
+        )
+        if len(allowed_fact_ids) <= settings.pgvector_exact_threshold or not self._iterative_scan:
+            # The HNSW index spans every namespace and model and applies these filters after
+            # its scan, so its candidates can all belong to other users. Fetch the allowed
+            # rows by key first and rank them exactly; MATERIALIZED keeps the planner from
+            # turning the ORDER BY back into an index scan.
+            candidates = (
+                select(FactEmbedding.fact_id, FactEmbedding.embedding)
+                .where(*filters)
+                .cte("candidates")
+                .prefix_with("MATERIALIZED")
+            )
+            distance_expr = candidates.c.embedding.op(operator, return_type=Float)(query_vector)
+            statement = (
+                select(candidates.c.fact_id, distance_expr.label("distance"))
+                .order_by(distance_expr)
+                .limit(limit)
+            )
+        else:
+            distance_expr = FactEmbedding.embedding.op(operator, return_type=Float)(query_vector)
+            nearest = (
+                select(FactEmbedding.fact_id, distance_expr.label("distance"))
+                .where(*filters)
+                .order_by(distance_expr)
+                .limit(limit)
+                .subquery()
+            )
+            # relaxed_order may return rows slightly out of order, so re-sort the page.
+            statement = select(nearest.c.fact_id, nearest.c.distance).order_by(nearest.c.distance)
+            await session.execute(
+                text(f"SET LOCAL hnsw.ef_search = {max(limit, settings.pgvector_hnsw_ef_search)}")
+            )
+            await session.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+        result = await session.execute(statement)
+        return [
+            VectorMatch(fact_id=row.fact_id, score=_distance_to_score(distance, row.distance))
+            for row in result
+        ]
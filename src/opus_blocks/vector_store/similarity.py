@@ -0,0 +1,91 @@
+import itertools
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+type FloatMatrix = npt.NDArray[np.float32]
+
+
+def normalize_rows(matrix: FloatMatrix) -> FloatMatrix:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    # Zero vectors keep a zero norm so they score 0.0 instead of NaN.
+    norms[norms == 0.0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+def embedding_matrix(embeddings: Sequence[Sequence[float]], dim: int) -> FloatMatrix:
+    if len(embeddings) == 0:
+        return np.zeros((0, dim), dtype=np.float32)
+    if isinstance(embeddings, np.ndarray):
+        matrix = embeddings.astype(np.float32, copy=False).reshape(len(embeddings), dim)
+    else:
+        # Rows arrive as Python lists from Postgres; fromiter avoids a float64 intermediate.
+        matrix = np.fromiter(
+            itertools.chain.from_iterable(embeddings),
+            dtype=np.float32,
+            count=len(embeddings) * dim,
+        ).reshape(len(embeddings), dim)
+    return normalize_rows(matrix)
+
+
+def normalize_vector(vector: Sequence[float]) -> npt.NDArray[np.float32]:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    if norm == 0.0:
+        return array
+    return array / norm
+
+
+def top_k(scores: npt.NDArray[np.float32], k: int) -> list[tuple[int, float]]:
+    count = scores.shape[0]
+    if count == 0 or k <= 0:
+        return []
+    if k < count:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(count)
+    # Highest score first; ties keep input order, like a stable sort.
+    order = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return [(int(index), float(scores[index])) for index in order]
+
+
+def rank_by_cosine(
+    query: Sequence[float], embeddings: Sequence[Sequence[float]], k: int
+) -> list[tuple[int, float]]:
+    if len(query) == 0 or len(embeddings) == 0:
+        return []
+    return top_k(score_rows(normalize_vector(query), embeddings), k)
+
+
+class TopKAccumulator[K]:
+    # Running exact top-k over batches; memory stays O(k + batch).
+    def __init__(self, k: int) -> None:
+        self._k = k
+        self._keys: list[K] = []
+        self._scores = np.zeros(0, dtype=np.float32)
+
+    def push(self, keys: Sequence[K], scores: npt.NDArray[np.float32]) -> None:
+        if len(keys) == 0:
+            return
+        all_keys = self._keys + list(keys)
+        best = top_k(np.concatenate([self._scores, scores.astype(np.float32)]), self._k)
+        self._keys = [all_keys[index] for index, _ in best]
+        self._scores = np.asarray([score for _, score in best], dtype=np.float32)
+
+    def results(self) -> list[tuple[K, float]]:
+        return [(key, float(score)) for key, score in zip(self._keys, self._scores, strict=True)]
+
+
+def score_rows(
+    query: npt.NDArray[np.float32], embeddings: Sequence[Sequence[float]]
+) -> npt.NDArray[np.float32]:
+    # `query` must already be normalized. Embeddings from another model/dimension
+    # cannot be compared; they score 0.0.
+    dim = query.shape[0]
+    scores = np.zeros(len(embeddings), dtype=np.float32)
+    matching = [index for index, row in enumerate(embeddings) if len(row) == dim]
+    if matching:
+        matrix = embedding_matrix([embeddings[index] for index in matching], dim)
+        scores[matching] = matrix @ query
+    return scores
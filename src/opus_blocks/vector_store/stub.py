@@ -1,16 +1,64 @@
-import math
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from opus_blocks.core.config import settings
 from opus_blocks.models.fact_embedding import FactEmbedding
-from opus_blocks.services.embeddings import embed_text, upsert_fact_embedding
-from opus_blocks.vector_store.base import VectorMatch, VectorStore
+from opus_blocks.services.embedding_models import get_active_embedding_model
+from opus_blocks.services.embeddings import (
+    bulk_upsert_fact_embeddings,
+    embed_text,
+    fill_missing_embeddings,
+    upsert_fact_embedding,
+)
+from opus_blocks.vector_store.base import VectorMatch, VectorStore, VectorUpsert
+from opus_blocks.vector_store.similarity import TopKAccumulator, normalize_vector, score_rows
+from opus_blocks.vector_store.stub_ann import StubAnnIndexes
+
+# Keeps each IN (...) list well under asyncpg's bind-parameter cap.
+_ALLOWED_IDS_PER_QUERY = 10000
+
+
+async def exact_top_k(
+    session: AsyncSession,
+    query_embedding: list[float],
+    *,
+    allowed_fact_ids: list[UUID],
+    namespace: str | None,
+    embedding_model: str,
+    limit: int,
+) -> list[tuple[UUID, float]]:
+    # Scores every allowed embedding, streamed in batches so large allowed sets
+    # never have to fit in memory at once.
+    query_vector = normalize_vector(query_embedding)
+    accumulator: TopKAccumulator[UUID] = TopKAccumulator(limit)
+    batch_rows = max(1, settings.vector_exact_batch_rows)
+    for start in range(0, len(allowed_fact_ids), _ALLOWED_IDS_PER_QUERY):
+        statement = (
+            select(FactEmbedding.fact_id, FactEmbedding.embedding)
+            .where(
+                FactEmbedding.fact_id.in_(allowed_fact_ids[start : start + _ALLOWED_IDS_PER_QUERY]),
+                FactEmbedding.embedding_model == embedding_model,
+            )
+            .order_by(FactEmbedding.created_at.desc())
+            .execution_options(yield_per=batch_rows)
+        )
+        if namespace is not None:
+            statement = statement.where(FactEmbedding.namespace == namespace)
+        result = await session.stream(statement)
+        async for rows in result.partitions():
+            accumulator.push(
+                [row.fact_id for row in rows],
+                score_rows(query_vector, [row.embedding for row in rows]),
+            )
+    return accumulator.results()
 
 
 class StubVectorStore(VectorStore):
+    def __init__(self) -> None:
+        self._ann = StubAnnIndexes() if settings.stub_ann_enabled else None
+
     async def upsert_fact(
         self,
         *,
@@ -20,15 +68,40 @@ class StubVectorStore(VectorStore):
         namespace: str,
         embedding: list[float] | None = None,
     ) -> None:
-        embedding_value = embedding or embed_text(content)
+        model = await get_active_embedding_model(session)
+        embedding_value = embedding or await embed_text(content, model=model)
         await upsert_fact_embedding(
             session,
             fact_id,
             vector_id=str(fact_id),
-            embedding_model=settings.embeddings_model,
+            embedding_model=model,
             namespace=namespace,
             embedding=embedding_value,
         )
+        if self._ann is not None:
+            await self._ann.upsert(namespace, model, [(fact_id, embedding_value)])
+
+    async def upsert_facts(self, *, session: AsyncSession, items: list[VectorUpsert]) -> None:
+        if not items:
+            return
+        model = await get_active_embedding_model(session)
+        embeddings = await fill_missing_embeddings(
+            [item.content for item in items], [item.embedding for item in items], model=model
+        )
+        by_namespace: dict[str, list[tuple[UUID, list[float]]]] = {}
+        for item, embedding in zip(items, embeddings, strict=True):
+            by_namespace.setdefault(item.namespace, []).append((item.fact_id, embedding))
+        for namespace, rows in by_namespace.items():
+            await bulk_upsert_fact_embeddings(
+                session,
+                rows,
+                embedding_model=model,
+                namespace=namespace,
+            )
+        await session.commit()
+        if self._ann is not None:
+            for namespace, rows in by_namespace.items():
+                await self._ann.upsert(namespace, model, rows)
 
     async def query(
         self,
@@ -41,21 +114,28 @@ class StubVectorStore(VectorStore):
     ) -> list[VectorMatch]:
         if not allowed_fact_ids:
             return []
-        result = await session.execute(
-            select(FactEmbedding)
-            .where(
-                FactEmbedding.namespace == namespace,
-                FactEmbedding.fact_id.in_(allowed_fact_ids),
+        model = await get_active_embedding_model(session)
+        query_embedding = await embed_text(query, model=model)
+        ranked = None
+        if self._ann is not None:
+            ranked = await self._ann.query(
+                session,
+                query_embedding,
+                namespace=namespace,
+                model=model,
+                allowed_fact_ids=allowed_fact_ids,
+                limit=limit,
             )
-            .order_by(FactEmbedding.created_at.desc())
-            .limit(limit)
-        )
-        query_embedding = embed_text(query)
-        scored: list[VectorMatch] = []
-        for item in result.scalars().all():
-            score = _cosine_similarity(query_embedding, item.embedding)
-            scored.append(VectorMatch(fact_id=item.fact_id, score=score))
-        return sorted(scored, key=lambda x: x.score, reverse=True)
+        if ranked is None:
+            ranked = await exact_top_k(
+                session,
+                query_embedding,
+                allowed_fact_ids=allowed_fact_ids,
+                namespace=namespace,
+                embedding_model=model,
+                limit=limit,
+            )
+        return [VectorMatch(fact_id=fact_id, score=score) for fact_id, score in ranked]
 
     async def delete_fact(
         self,
@@ -64,25 +144,36 @@ class StubVectorStore(VectorStore):
         fact_id: UUID,
         namespace: str,
     ) -> None:
-        result = await session.execute(
-            select(FactEmbedding).where(
+        # Removes every model's vector for the fact.
+        await session.execute(
+            delete(FactEmbedding).where(
                 FactEmbedding.fact_id == fact_id,
                 FactEmbedding.namespace == namespace,
             )
         )
-        embedding = result.scalar_one_or_none()
-        if not embedding:
-            return
-        await session.delete(embedding)
         await session.commit()
+        if self._ann is not None:
+            await self._ann.delete(namespace, [fact_id])
 
+    async def delete_facts(
+        self,
+        *,
+        session: AsyncSession,
+        fact_ids: list[UUID],
+        namespace: str,
+    ) -> None:
+        for start in range(0, len(fact_ids), _ALLOWED_IDS_PER_QUERY):
+            await session.execute(
+                delete(FactEmbedding).where(
+                    FactEmbedding.fact_id.in_(fact_ids[start : start + _ALLOWED_IDS_PER_QUERY]),
+                    FactEmbedding.namespace == namespace,
+                )
+            )
+        await session.commit()
+        if self._ann is not None:
+            await self._ann.delete(namespace, fact_ids)
 
-def _cosine_similarity(a: list[float], b: list[float]) -> float:
-    if not a or not b:
-        return 0.0
-    dot = sum(x * y for x, y in zip(a, b, strict=False))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(x * x for x in b))
-    if norm_a == 0.0 or norm_b == 0.0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+    def close(self) -> None:
+        # Vectors live in Postgres; only the optional ANN indexes hold unsaved state.
+        if self._ann is not None:
+            self._ann.close()
@@ -0,0 +1,243 @@
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from opus_blocks.core.config import settings
+from opus_blocks.db.worker import worker_session
+from opus_blocks.models.fact_embedding import FactEmbedding
+from opus_blocks.services.namespace_generations import get_namespace_generation
+from opus_blocks.vector_store.hnsw import HnswIndex
+
+logger = logging.getLogger(__name__)
+
+# Keeps each IN (...) list well under asyncpg's bind-parameter cap.
+_IDS_PER_QUERY = 10000
+
+
+@dataclass
+class _NamespaceIndex:
+    path: Path
+    index: HnswIndex | None = None
+    generation: int | None = None
+    unsaved_changes: int = 0
+
+
+class StubAnnIndexes:
+    # One in-process HNSW index per (namespace, model), built from fact_embeddings and
+    # snapshotted under VECTOR_PERSIST_PATH. Writes from this process update the index
+    # directly; each query compares the namespace generation and, if another process
+    # wrote since, the index catches up by diffing fact ids (a fact's vector for a given
+    # model never changes, its content is fixed). Building and catching up run in a
+    # background task, never inside the query that noticed them.
+    def __init__(self) -> None:
+        self._directory = Path(settings.vector_persist_path) / "stub_hnsw"
+        self._m = settings.stub_ann_m
+        self._ef_construction = settings.stub_ann_ef_construction
+        self._ef_search = settings.stub_ann_ef_search
+        self._exact_threshold = settings.stub_ann_exact_threshold
+        self._snapshot_every = max(1, settings.stub_ann_snapshot_every)
+        self._max_namespaces = max(1, settings.stub_ann_cache_size)
+        self._entries: OrderedDict[tuple[str, str], _NamespaceIndex] = OrderedDict()
+        self._syncs: dict[tuple[str, str], asyncio.Task[None]] = {}
+        self._lock = threading.Lock()
+
+    def snapshot_path(self, namespace: str, model: str) -> Path:
+        digest = hashlib.sha256(f"{model}\x00{namespace}".encode()).hexdigest()[:32]
+        return self._directory / f"{digest}.npz"
+
+    async def query(
+        self,
+        session: AsyncSession,
+        query_embedding: Sequence[float],
+        *,
+        namespace: str,
+        model: str,
+        allowed_fact_ids: list[UUID],
+        limit: int,
+    ) -> list[tuple[UUID, float]] | None:
+        # None means the index cannot answer yet (it is still being built or catching up
+        # with other processes' writes) or at all (a dimension mismatch); the caller
+        # falls back to exact search over Postgres.
+        generation = await get_namespace_generation(session, namespace)
+        entry = self._loaded(namespace, model)
+        if entry is None or entry.generation != generation:
+            self._start_sync(session, namespace, model)
+            return None
+        index = entry.index
+        if index is None:
+            return []
+        if len(query_embedding) != index.dim:
+            return None
+        allowed = set(allowed_fact_ids)
+        if len(allowed) <= self._exact_threshold or len(allowed) * 10 <= len(index):
+            # Small or highly selective allowed sets: scoring them directly from memory
+            # is exact and cheaper than a filtered graph walk.
+            return await asyncio.to_thread(index.exact, query_embedding, limit, allowed=allowed)
+        # Widen the walk by the filter's selectivity so enough allowed nodes are seen.
+        ef = max(self._ef_search, limit * len(index) // max(1, len(allowed)))
+        results = await asyncio.to_thread(
+            index.search, query_embedding, limit, ef=ef, allowed=allowed
+        )
+        if len(results) < min(limit, len(allowed & index.keys())):
+            return await asyncio.to_thread(index.exact, query_embedding, limit, allowed=allowed)
+        return results
+
+    async def upsert(
+        self, namespace: str, model: str, items: list[tuple[UUID, list[float]]]
+    ) -> None:
+        entry = self._loaded(namespace, model)
+        if entry is None or not items:
+            return
+        if entry.index is None:
+            entry.index = self._new_index(len(items[0][1]))
+        entry.unsaved_changes += await asyncio.to_thread(entry.index.add_many, items)
+        await self._maybe_save(entry)
+
+    async def delete(self, namespace: str, fact_ids: list[UUID]) -> None:
+        with self._lock:
+            entries = [entry for key, entry in self._entries.items() if key[0] == namespace]
+        for entry in entries:
+            if entry.index is None:
+                continue
+            entry.unsaved_changes += sum(entry.index.remove(fact_id) for fact_id in fact_ids)
+            await self._maybe_save(entry)
+
+    async def warm(self, session: AsyncSession, namespace: str, model: str) -> None:
+        # Builds or catches up the index now, for warm-up commands and tests.
+        await self._start_sync(session, namespace, model)
+
+    def close(self) -> None:
+        for task in self._syncs.values():
+            task.cancel()
+        self._syncs.clear()
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            if entry.unsaved_changes:
+                self._save(entry)
+
+    def _new_index(self, dim: int) -> HnswIndex:
+        return HnswIndex(dim, m=self._m, ef_construction=self._ef_construction)
+
+    def _loaded(self, namespace: str, model: str) -> _NamespaceIndex | None:
+        with self._lock:
+            entry = self._entries.get((namespace, model))
+            if entry is not None:
+                self._entries.move_to_end((namespace, model))
+            return entry
+
+    def _start_sync(self, session: AsyncSession, namespace: str, model: str) -> asyncio.Task[None]:
+        key = (namespace, model)
+        task = self._syncs.get(key)
+        if task is None or task.done():
+            # The request's session closes before the build ends, so the task opens its
+            # own on the same engine.
+            bind = session.bind if isinstance(session.bind, AsyncEngine) else None
+            task = asyncio.create_task(self._sync(bind, namespace, model))
+            self._syncs[key] = task
+        return task
+
+    async def _sync(self, bind: AsyncEngine | None, namespace: str, model: str) -> None:
+        try:
+            if bind is None:
+                async with worker_session() as session:
+                    await self._synced(session, namespace, model)
+            else:
+                async with AsyncSession(bind, expire_on_commit=False) as session:
+                    await self._synced(session, namespace, model)
+        except Exception:
+            logger.warning("Stub ANN sync failed for %s/%s", namespace, model, exc_info=True)
+
+    async def _synced(self, session: AsyncSession, namespace: str, model: str) -> None:
+        # Read before the ids, so writes that commit during the diff leave the entry one
+        # generation behind and trigger another sync.
+        generation = await get_namespace_generation(session, namespace)
+        entry = self._loaded(namespace, model)
+        if entry is None:
+            entry = await asyncio.to_thread(self._load, namespace, model)
+        if entry.generation == generation:
+            self._remember(namespace, model, entry)
+            return
+
+        statement = select(FactEmbedding.fact_id).where(
+            FactEmbedding.namespace == namespace, FactEmbedding.embedding_model == model
+        )
+        stored = set((await session.scalars(statement)).all())
+        known = entry.index.keys() if entry.index is not None else set()
+        removed = known - stored
+        added = list(stored - known)
+        rows: list[tuple[UUID, list[float]]] = []
+        for start in range(0, len(added), _IDS_PER_QUERY):
+            result = await session.execute(
+                select(FactEmbedding.fact_id, FactEmbedding.embedding).where(
+                    FactEmbedding.fact_id.in_(added[start : start + _IDS_PER_QUERY]),
+                    FactEmbedding.embedding_model == model,
+                )
+            )
+            rows.extend((row.fact_id, row.embedding) for row in result)
+        if rows and entry.index is None:
+            entry.index = self._new_index(len(rows[0][1]))
+        if entry.index is not None:
+            index = entry.index
+            for fact_id in removed:
+                index.remove(fact_id)
+            # Facts already indexed by this process keep their node.
+            await asyncio.to_thread(index.add_many, rows, replace=False)
+        entry.unsaved_changes += len(removed) + len(rows)
+        entry.generation = generation
+        self._remember(namespace, model, entry)
+        if len(removed) + len(rows) > 0:
+            logger.info(
+                "Synced stub ANN index for %s/%s: +%s -%s",
+                namespace,
+                model,
+                len(rows),
+                len(removed),
+            )
+        await self._maybe_save(entry)
+
+    def _remember(self, namespace: str, model: str, entry: _NamespaceIndex) -> None:
+        evicted: list[_NamespaceIndex] = []
+        with self._lock:
+            self._entries[(namespace, model)] = entry
+            self._entries.move_to_end((namespace, model))
+            while len(self._entries) > self._max_namespaces:
+                evicted.append(self._entries.popitem(last=False)[1])
+        for old in evicted:
+            if old.unsaved_changes:
+                self._save(old)
+
+    def _load(self, namespace: str, model: str) -> _NamespaceIndex:
+        path = self.snapshot_path(namespace, model)
+        entry = _NamespaceIndex(path=path)
+        if not path.exists():
+            return entry
+        try:
+            entry.index, metadata = HnswIndex.load(path)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Ignoring unreadable stub ANN snapshot %s: %s", path, exc)
+            return _NamespaceIndex(path=path)
+        entry.generation = metadata.get("generation")
+        return entry
+
+    async def _maybe_save(self, entry: _NamespaceIndex) -> None:
+        if entry.unsaved_changes >= self._snapshot_every:
+            await asyncio.to_thread(self._save, entry)
+
+    def _save(self, entry: _NamespaceIndex) -> None:
+        if entry.index is None:
+            return
+        if entry.index.tombstones > len(entry.index):
+            entry.index.compact()
+        entry.index.save(entry.path, metadata={"generation": entry.generation})
+        entry.unsaved_changes = 0
@@ -1,12 +1,18 @@
+import asyncio
 import os
+import uuid
+from collections.abc import Iterator
 
+import asyncpg
 import pytest
 from alembic.config import Config
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from alembic import command
 from opus_blocks.app import app
+from opus_blocks.core.config import settings
 from opus_blocks.db.session import get_session
 
 
@@ -49,3 +55,30 @@ def setup_database():
 
     # Optional: Run migrations down
     # command.downgrade(config, "base")
+
+
+async def _admin_execute(database_url: str, statement: str) -> None:
+    url = make_url(database_url).set(drivername="postgresql", database="postgres")
+    connection = await asyncpg.connect(url.render_as_string(hide_password=False))
+    try:
+        await connection.execute(statement)
+    finally:
+        await connection.close()
+
+
+@pytest.fixture()
+def scratch_database_url(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    # A freshly migrated database of its own, for tests that scan whole tables.
+    base_url = os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"]
+    name = f"opus_blocks_scratch_{uuid.uuid4().hex[:8]}"
+    asyncio.run(_admin_execute(base_url, f'CREATE DATABASE "{name}"'))
+    database_url = make_url(base_url).set(database=name).render_as_string(hide_password=False)
+    monkeypatch.setenv("OPUS_BLOCKS_TEST_DATABASE_URL", database_url)
+    monkeypatch.setattr(settings, "database_url", database_url)
+    try:
+        config = Config("alembic.ini")
+        config.set_main_option("sqlalchemy.url", database_url)
+        command.upgrade(config, "head")
+        yield database_url
+    finally:
+        asyncio.run(_admin_execute(base_url, f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
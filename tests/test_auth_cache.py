@@ -0,0 +1,144 @@
+import os
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from opus_blocks.core.config import settings
+from opus_blocks.core.security import create_access_token
+from opus_blocks.models.user import User
+from opus_blocks.services.principal_cache import (
+    Principal,
+    PrincipalCache,
+    get_principal_cache,
+    get_principal_cache_stats,
+)
+
+
+async def _register_and_login(async_client: AsyncClient) -> tuple[str, uuid.UUID]:
+    email = f"user-{uuid.uuid4()}@example.com"
+    password = "Password123!"
+
+    register_response = await async_client.post(
+        "/api/v1/auth/register", json={"email": email, "password": password}
+    )
+    assert register_response.status_code == 201
+
+    login_response = await async_client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    assert login_response.status_code == 200
+    return login_response.json()["access_token"], uuid.UUID(register_response.json()["id"])
+
+
+@contextmanager
+def _count_queries() -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", _record)
+
+
+async def _user_lookups(async_client: AsyncClient, headers: dict) -> int:
+    with _count_queries() as statements:
+        response = await async_client.get("/api/v1/runs", headers=headers)
+    assert response.status_code == 200
+    return sum("FROM users" in statement for statement in statements)
+
+
+def test_principal_cache_expires_and_evicts(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("opus_blocks.services.principal_cache.time.monotonic", lambda: now[0])
+    cache = PrincipalCache(max_entries=2, ttl_seconds=30)
+    first, second, third = (Principal(id=uuid.uuid4(), email=f"{n}@x") for n in range(3))
+
+    cache.set(first)
+    cache.set(second)
+    assert cache.get(first.id) == first
+    cache.set(third)
+    assert cache.get(second.id) is None
+    assert cache.stats.evictions == 1
+
+    now[0] += 31
+    assert cache.get(first.id) is None
+    assert cache.stats.expired == 1
+    assert cache.stats.snapshot()["hit_rate"] == pytest.approx(1 / 3)
+
+
+@pytest.mark.anyio
+async def test_repeat_requests_skip_user_lookup(async_client: AsyncClient) -> None:
+    token, user_id = await _register_and_login(async_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    cache = get_principal_cache()
+    assert cache is not None
+    cache.invalidate(user_id)
+    hits = cache.stats.hits
+
+    assert await _user_lookups(async_client, headers) == 1
+    assert await _user_lookups(async_client, headers) == 0
+    assert cache.stats.hits == hits + 1
+
+    stats = (await async_client.get("/api/v1/metrics/auth-cache")).json()
+    assert stats["enabled"] is True
+    assert stats["hits"] >= 1
+
+
+@pytest.mark.anyio
+async def test_user_changes_invalidate_cached_principal(async_client: AsyncClient) -> None:
+    token, user_id = await _register_and_login(async_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    assert (await async_client.get("/api/v1/runs", headers=headers)).status_code == 200
+    cache = get_principal_cache()
+    assert cache is not None and cache.get(user_id) is not None
+
+    engine = create_async_engine(os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"], pool_pre_ping=True)
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            user = await session.scalar(select(User).where(User.id == user_id))
+            assert user is not None
+            user.email = f"renamed-{uuid.uuid4()}@example.com"
+            await session.commit()
+            assert cache.get(user_id) is None
+
+            assert (await async_client.get("/api/v1/runs", headers=headers)).status_code == 200
+            await session.delete(user)
+            await session.commit()
+            assert cache.get(user_id) is None
+    finally:
+        await engine.dispose()
+
+    missing = await async_client.get("/api/v1/runs", headers=headers)
+    assert missing.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_trusted_claims_skip_database_on_reads(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    token, user_id = await _register_and_login(async_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    monkeypatch.setattr(settings, "auth_trust_token_claims", True)
+    trusted = get_principal_cache_stats()["trusted_claims"]
+
+    assert await _user_lookups(async_client, headers) == 0
+    assert get_principal_cache_stats()["trusted_claims"] == trusted + 1
+
+    # Writes still check the user exists.
+    ghost = create_access_token(str(uuid.uuid4()), "ghost@example.com")
+    response = await async_client.post(
+        "/api/v1/documents/upload",
+        files={"file": ("a.pdf", b"%PDF", "application/pdf")},
+        headers={"Authorization": f"Bearer {ghost}"},
+    )
+    assert response.status_code == 401
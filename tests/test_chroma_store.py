@@ -0,0 +1,205 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+
+import pytest
+
+from opus_blocks.core.config import settings
+from opus_blocks.tools.vector_reshard import run_reshard
+from opus_blocks.vector_store.base import VectorUpsert
+from opus_blocks.vector_store.chroma import ChromaVectorStore, collection_name_for
+from opus_blocks.vector_store.executor import (
+    VectorExecutor,
+    VectorStoreBusyError,
+    get_vector_executor_stats,
+    reset_vector_executor_stats,
+)
+
+
+class NoActiveModelSession:
+    # Chroma tests run without Postgres: no embedding model has been activated.
+    async def scalar(self, _statement):  # type: ignore[no-untyped-def]
+        return None
+
+
+SESSION = NoActiveModelSession()
+
+
+@pytest.fixture()
+def chroma_store(monkeypatch: pytest.MonkeyPatch, tmp_path) -> Iterator[ChromaVectorStore]:
+    monkeypatch.setattr(settings, "vector_persist_path", str(tmp_path))
+    monkeypatch.setattr(settings, "vector_collection", f"test_{uuid.uuid4().hex[:8]}")
+    store = ChromaVectorStore()
+    yield store
+    store.close()
+
+
+@pytest.mark.anyio
+async def test_chroma_upsert_facts_batches_collection_calls(
+    chroma_store: ChromaVectorStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[int] = []
+    upsert = chroma_store._collection.upsert
+
+    def counting_upsert(**kwargs):
+        calls.append(len(kwargs["ids"]))
+        return upsert(**kwargs)
+
+    monkeypatch.setattr(chroma_store._collection, "upsert", counting_upsert)
+    monkeypatch.setattr(chroma_store._client, "get_max_batch_size", lambda: 2)
+    fact_ids = [uuid.uuid4() for _ in range(3)]
+    items = [
+        VectorUpsert(fact_id=fact_id, content=content, namespace="user:a")
+        for fact_id, content in zip(fact_ids, ("alpha", "beta", "gamma"), strict=True)
+    ]
+
+    await chroma_store.upsert_facts(session=SESSION, items=items)
+    matches = await chroma_store.query(
+        session=SESSION, query="beta", namespace="user:a", allowed_fact_ids=fact_ids, limit=1
+    )
+    await chroma_store.delete_facts(session=SESSION, fact_ids=fact_ids[:2], namespace="user:a")
+
+    assert calls == [2, 1]
+    assert [match.fact_id for match in matches] == [fact_ids[1]]
+    assert chroma_store._collection.get()["ids"] == [str(fact_ids[2])]
+
+
+@pytest.mark.anyio
+async def test_chroma_query_runs_off_the_event_loop(
+    chroma_store: ChromaVectorStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    reset_vector_executor_stats()
+    fact_id = uuid.uuid4()
+    await chroma_store.upsert_facts(
+        session=SESSION, items=[VectorUpsert(fact_id=fact_id, content="alpha", namespace="user:a")]
+    )
+    query = chroma_store._collection.query
+
+    def slow_query(**kwargs):
+        time.sleep(0.2)
+        return query(**kwargs)
+
+    monkeypatch.setattr(chroma_store._collection, "query", slow_query)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    matches, _ = await asyncio.gather(
+        chroma_store.query(
+            session=SESSION, query="alpha", namespace="user:a", allowed_fact_ids=[fact_id]
+        ),
+        ticker(),
+    )
+
+    assert [match.fact_id for match in matches] == [fact_id]
+    assert ticks == 10
+    stats = get_vector_executor_stats()
+    assert stats["execution_ms"]["count"] == 2
+    assert stats["execution_ms"]["max_ms"] >= 200
+
+
+@pytest.mark.anyio
+async def test_vector_executor_rejects_when_queue_is_full() -> None:
+    reset_vector_executor_stats()
+    executor = VectorExecutor(max_workers=1, queue_depth=0, name="test")
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.01)
+        with pytest.raises(VectorStoreBusyError):
+            await executor.run(lambda: None)
+        release.set()
+        assert await running is True
+    finally:
+        release.set()
+        executor.shutdown()
+    assert get_vector_executor_stats()["rejected"] == 1
+
+
+def test_collection_name_for_shard_modes() -> None:
+    namespace = "user:3f2b9a3e-0000-4000-8000-000000000001"
+    assert collection_name_for(namespace, base="facts", mode="none", buckets=8) == "facts"
+    assert (
+        collection_name_for(namespace, base="facts", mode="namespace", buckets=8)
+        == "facts_user_3f2b9a3e-0000-4000-8000-000000000001"
+    )
+    bucket = collection_name_for(namespace, base="facts", mode="hash", buckets=8)
+    assert bucket == collection_name_for(namespace, base="facts", mode="hash", buckets=8)
+    assert bucket in {f"facts_b{index:04d}" for index in range(8)}
+
+
+@pytest.mark.anyio
+async def test_sharded_chroma_store_isolates_namespaces(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    monkeypatch.setattr(settings, "vector_persist_path", str(tmp_path))
+    monkeypatch.setattr(settings, "vector_collection", "facts")
+    monkeypatch.setattr(settings, "vector_shard_mode", "namespace")
+    monkeypatch.setattr(settings, "vector_shard_cache_size", 1)
+    store = ChromaVectorStore()
+    try:
+        first, second = uuid.uuid4(), uuid.uuid4()
+        await store.upsert_facts(
+            session=SESSION,
+            items=[
+                VectorUpsert(fact_id=first, content="alpha", namespace="user:a"),
+                VectorUpsert(fact_id=second, content="alpha", namespace="user:b"),
+            ],
+        )
+        matches = await store.query(
+            session=SESSION, query="alpha", namespace="user:a", allowed_fact_ids=[first, second]
+        )
+        missing = await store.query(
+            session=SESSION, query="alpha", namespace="user:c", allowed_fact_ids=[first]
+        )
+        names = sorted(collection.name for collection in store._client.list_collections())
+    finally:
+        store.close()
+
+    assert [match.fact_id for match in matches] == [first]
+    assert missing == []
+    assert names == ["facts_user_a", "facts_user_b"]
+    assert len(store._collections) == 1
+
+
+@pytest.mark.anyio
+async def test_reshard_moves_records_into_namespace_collections(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    monkeypatch.setattr(settings, "vector_persist_path", str(tmp_path))
+    monkeypatch.setattr(settings, "vector_collection", "facts")
+    monkeypatch.setattr(settings, "vector_shard_mode", "none")
+    fact_ids = [uuid.uuid4() for _ in range(3)]
+    store = ChromaVectorStore()
+    await store.upsert_facts(
+        session=SESSION,
+        items=[
+            VectorUpsert(fact_id=fact_id, content=f"fact {index}", namespace=namespace)
+            for index, (fact_id, namespace) in enumerate(
+                zip(fact_ids, ("user:a", "user:a", "user:b"), strict=True)
+            )
+        ],
+    )
+    store.close()
+
+    monkeypatch.setattr(settings, "vector_shard_mode", "namespace")
+    assert run_reshard(batch_size=2, dry_run=True) == {"facts_user_a": 2, "facts_user_b": 1}
+    assert run_reshard(batch_size=2) == {"facts_user_a": 2, "facts_user_b": 1}
+    assert run_reshard(batch_size=2) == {}
+
+    sharded = ChromaVectorStore()
+    try:
+        matches = await sharded.query(
+            session=SESSION, query="fact 2", namespace="user:b", allowed_fact_ids=fact_ids
+        )
+        names = sorted(collection.name for collection in sharded._client.list_collections())
+    finally:
+        sharded.close()
+    assert [match.fact_id for match in matches] == [fact_ids[2]]
+    assert names == ["facts_user_a", "facts_user_b"]
@@ -1,11 +1,18 @@
+import hashlib
 import os
 import uuid
+from collections.abc import AsyncIterator
 from pathlib import Path
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from opus_blocks.core.config import settings
+from opus_blocks.llm.provider import LLMMetadata, LLMResult
+from opus_blocks.services.documents import UploadTooLargeError, create_document, stage_upload
 from opus_blocks.tasks.documents import run_extract_facts_job
 
 
@@ -86,7 +93,7 @@ async def test_document_upload_and_job_flow(async_client: AsyncClient, tmp_path:
 
 
 class FakeProvider:
-    def extract_facts(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+    async def extract_facts(self, *, inputs: dict):  # type: ignore[no-untyped-def]
         document_id = inputs["document_id"]
         return type(
             "Result",
@@ -133,6 +140,7 @@ class FakeProvider:
                         "token_completion": None,
                         "cost_usd": None,
                         "latency_ms": None,
+                        "cache": None,
                     },
                 )(),
             },
@@ -179,9 +187,183 @@ async def test_extract_facts_persists_uncertain(
     uncertain = next(fact for fact in facts if fact["is_uncertain"])
     assert uncertain["qualifiers"]["reason"] == "missing qualifier"
 
-    runs_response = await async_client.get(f"/api/v1/documents/{doc['id']}/runs", headers=headers)
+    runs_response = await async_client.get(
+        f"/api/v1/documents/{doc['id']}/runs?include=outputs_json", headers=headers
+    )
     assert runs_response.status_code == 200
     runs = runs_response.json()
     assert runs[0]["outputs_json"]["facts"][0]["content"] == "Real extracted fact."
 
     settings.storage_root = original_root
+
+
+class ManyFactsProvider:
+    def __init__(self, count: int) -> None:
+        self._count = count
+
+    async def extract_facts(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+        document_id = inputs["document_id"]
+        span = {
+            "document_id": document_id,
+            "page": 1,
+            "start_char": 0,
+            "end_char": 5,
+            "quote": "facts",
+        }
+        return LLMResult(
+            outputs={
+                "facts": [
+                    {
+                        "content": f"Bulk fact {index}.",
+                        "source_type": "PDF",
+                        "source_span": span,
+                        "qualifiers": {},
+                        "confidence": 0.8,
+                    }
+                    for index in range(self._count)
+                ],
+                "uncertain_facts": [
+                    {"content": "Bulk uncertain.", "reason": "unclear", "source_span": span}
+                ],
+            },
+            metadata=LLMMetadata(provider="test", model="test", prompt_version="v1"),
+        )
+
+
+async def _count_extraction_statements(
+    async_client: AsyncClient, headers: dict, monkeypatch: pytest.MonkeyPatch, fact_count: int
+) -> tuple[int, int]:
+    content = f"%PDF-1.4 {fact_count} facts".encode()
+    files = {"file": ("example.pdf", content, "application/pdf")}
+    doc = (await async_client.post("/api/v1/documents/upload", files=files, headers=headers)).json()
+    job = (
+        await async_client.post(f"/api/v1/documents/{doc['id']}/extract_facts", headers=headers)
+    ).json()
+    monkeypatch.setattr(
+        "opus_blocks.tasks.documents.get_llm_provider", lambda: ManyFactsProvider(fact_count)
+    )
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", _record)
+    try:
+        await run_extract_facts_job(uuid.UUID(job["id"]), uuid.UUID(doc["id"]))
+    finally:
+        event.remove(Engine, "before_cursor_execute", _record)
+
+    facts = (await async_client.get(f"/api/v1/documents/{doc['id']}/facts", headers=headers)).json()
+    return len(statements), len(facts)
+
+
+@pytest.mark.anyio
+async def test_extract_facts_round_trips_do_not_scale_with_fact_count(
+    async_client: AsyncClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "storage_root", str(tmp_path))
+    monkeypatch.setattr(settings, "database_url", os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"])
+    token = await _register_and_login(async_client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    small_statements, small_facts = await _count_extraction_statements(
+        async_client, headers, monkeypatch, 3
+    )
+    large_statements, large_facts = await _count_extraction_statements(
+        async_client, headers, monkeypatch, 300
+    )
+
+    assert small_facts == 4
+    assert large_facts == 301
+    assert large_statements == small_statements
+
+
+@pytest.mark.anyio
+async def test_upload_streams_to_storage_and_enforces_limits(
+    async_client: AsyncClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "storage_root", str(tmp_path))
+    monkeypatch.setattr(settings, "upload_max_bytes", 4096)
+    monkeypatch.setattr("opus_blocks.api.v1.routes.documents.UPLOAD_CHUNK_BYTES", 1000)
+    token = await _register_and_login(async_client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    file_content = b"%PDF-1.4 " + os.urandom(3000)
+    files = {"file": ("big.pdf", file_content, "application/pdf")}
+    upload_response = await async_client.post(
+        "/api/v1/documents/upload", files=files, headers=headers
+    )
+    assert upload_response.status_code == 201
+    doc = upload_response.json()
+    assert doc["content_hash"] == hashlib.sha256(file_content).hexdigest()
+    assert Path(doc["storage_uri"]).read_bytes() == file_content
+
+    duplicate_response = await async_client.post(
+        "/api/v1/documents/upload", files=files, headers=headers
+    )
+    assert duplicate_response.status_code == 201
+    assert duplicate_response.json()["id"] == doc["id"]
+
+    too_large = {"file": ("huge.pdf", b"x" * 4097, "application/pdf")}
+    too_large_response = await async_client.post(
+        "/api/v1/documents/upload", files=too_large, headers=headers
+    )
+    assert too_large_response.status_code == 413
+
+    empty = {"file": ("empty.pdf", b"", "application/pdf")}
+    empty_response = await async_client.post(
+        "/api/v1/documents/upload", files=empty, headers=headers
+    )
+    assert empty_response.status_code == 400
+
+    assert list((tmp_path / ".incoming").iterdir()) == []
+
+
+@pytest.mark.anyio
+async def test_stage_upload_stops_reading_past_limit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "storage_root", str(tmp_path))
+    produced: list[int] = []
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for index in range(10):
+            produced.append(index)
+            yield b"x" * 100
+
+    with pytest.raises(UploadTooLargeError):
+        await stage_upload(chunks(), max_bytes=250)
+    assert produced == [0, 1, 2]
+    assert list((tmp_path / ".incoming").iterdir()) == []
+
+
+@pytest.mark.anyio
+async def test_failed_commit_leaves_no_stored_file(
+    async_client: AsyncClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "storage_root", str(tmp_path))
+    register_response = await async_client.post(
+        "/api/v1/auth/register",
+        json={"email": f"user-{uuid.uuid4()}@example.com", "password": "Password123!"},
+    )
+    owner_id = uuid.UUID(register_response.json()["id"])
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield b"%PDF-1.4 " + os.urandom(100)
+
+    engine = create_async_engine(os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"])
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+
+            async def failing_commit() -> None:
+                raise OSError("connection lost")
+
+            monkeypatch.setattr(session, "commit", failing_commit)
+            with pytest.raises(OSError):
+                await create_document(session, owner_id, "lost.pdf", chunks())
+            await session.rollback()
+    finally:
+        await engine.dispose()
+
+    assert [path for path in tmp_path.rglob("*") if path.is_file()] == []
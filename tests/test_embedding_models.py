@@ -0,0 +1,113 @@
+import os
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from opus_blocks.core.config import settings
+from opus_blocks.models.embedding_model import EmbeddingModel
+from opus_blocks.models.fact_embedding import FactEmbedding
+from opus_blocks.retrieval.stub import StubRetriever
+from opus_blocks.services.embedding_models import EmbeddingModelError
+from opus_blocks.tools.reembed import run_activate, run_reembed, run_start_reembed
+
+
+@pytest.fixture()
+async def session_factory(monkeypatch: pytest.MonkeyPatch):  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(settings, "database_url", os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"])
+    engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    yield factory
+    # The active model is global state; put every other test back on EMBEDDINGS_MODEL.
+    async with factory() as session:
+        await session.execute(delete(EmbeddingModel))
+        await session.execute(
+            delete(FactEmbedding).where(FactEmbedding.embedding_model != settings.embeddings_model)
+        )
+        await session.commit()
+    await engine.dispose()
+
+
+async def _register(async_client: AsyncClient) -> dict[str, str]:
+    email = f"user-{uuid.uuid4()}@example.com"
+    password = "Password123!"
+    await async_client.post("/api/v1/auth/register", json={"email": email, "password": password})
+    login_response = await async_client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+
+@pytest.mark.anyio
+async def test_reembed_builds_new_model_and_switches_atomically(
+    async_client: AsyncClient, session_factory
+) -> None:
+    headers = await _register(async_client)
+    first = await async_client.post(
+        "/api/v1/facts/manual", json={"content": "alpha fact"}, headers=headers
+    )
+    first_id = uuid.UUID(first.json()["id"])
+    new_model = f"test-embedding-{uuid.uuid4().hex[:6]}"
+
+    # Re-embedding affects every user, so only the ops script can start or switch models.
+    forbidden = await async_client.post(
+        "/api/v1/embeddings/models", json={"model": new_model}, headers=headers
+    )
+    assert forbidden.status_code == 405
+    started = await run_start_reembed(new_model)
+    assert started.status == "BUILDING"
+    assert started.total_facts >= 1
+
+    # Facts created mid-build are written for both models.
+    second = await async_client.post(
+        "/api/v1/facts/manual", json={"content": "beta fact"}, headers=headers
+    )
+    second_id = uuid.UUID(second.json()["id"])
+    async with session_factory() as session:
+        models = await session.scalars(
+            select(FactEmbedding.embedding_model).where(FactEmbedding.fact_id == second_id)
+        )
+        assert set(models.all()) == {settings.embeddings_model, new_model}
+
+    with pytest.raises(EmbeddingModelError, match="not READY"):
+        await run_activate(new_model)
+
+    result = await run_reembed(new_model, batch_size=2)
+    assert result is not None and result["status"] == "READY"
+
+    progress = await async_client.get(f"/api/v1/embeddings/models/{new_model}", headers=headers)
+    assert progress.json()["status"] == "READY"
+    assert progress.json()["progress"] == 1.0
+
+    active = await async_client.get("/api/v1/embeddings/active", headers=headers)
+    assert active.json()["model"] == settings.embeddings_model
+    forbidden = await async_client.post(
+        f"/api/v1/embeddings/models/{new_model}/activate", headers=headers
+    )
+    assert forbidden.status_code == 404
+    activated = await run_activate(new_model)
+    assert activated.status == "ACTIVE"
+    active = await async_client.get("/api/v1/embeddings/active", headers=headers)
+    assert active.json()["model"] == new_model
+
+    models = await async_client.get("/api/v1/embeddings/models", headers=headers)
+    statuses = {item["model"]: item["status"] for item in models.json()}
+    assert statuses == {new_model: "ACTIVE", settings.embeddings_model: "RETIRED"}
+
+    async with session_factory() as session:
+        # Retrieval only reads the active model's vectors.
+        await session.execute(
+            delete(FactEmbedding).where(
+                FactEmbedding.fact_id == first_id, FactEmbedding.embedding_model == new_model
+            )
+        )
+        await session.commit()
+        retrieved = await StubRetriever().retrieve(
+            session=session,
+            owner_id=uuid.uuid4(),
+            query="alpha",
+            allowed_fact_ids=[first_id, second_id],
+        )
+    assert [fact.fact_id for fact in retrieved] == [second_id]
@@ -1,15 +1,27 @@
+import asyncio
+import json
 import os
+import types
 import uuid
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from opus_blocks.core.config import settings
+from opus_blocks.models.fact import Fact
 from opus_blocks.models.fact_embedding import FactEmbedding
+from opus_blocks.models.namespace_generation import NamespaceGeneration
+from opus_blocks.models.user import User
+from opus_blocks.retrieval.stub import StubRetriever
 from opus_blocks.retrieval.vector import VectorStoreRetriever
+from opus_blocks.services import embedding_cache, embeddings
+from opus_blocks.services.embedding_cache import EmbeddingCache
+from opus_blocks.tools.embedding_cache_warmup import run_warmup
 from opus_blocks.tools.embeddings_backfill import run_backfill
+from opus_blocks.vector_store.base import VectorUpsert
+from opus_blocks.vector_store.stub import StubVectorStore
 
 
 @pytest.mark.anyio
@@ -195,3 +207,329 @@ async def test_backfill_embeddings_recreates_missing(async_client: AsyncClient)
         await engine.dispose()
     finally:
         settings.database_url = original_url
+
+
+async def _seed_owner_facts(database_url: str, *, owners: int, facts_per_owner: int) -> list:
+    engine = create_async_engine(database_url)
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            users = [
+                User(email=f"user-{uuid.uuid4()}@example.com", password_hash="x")
+                for _ in range(owners)
+            ]
+            session.add_all(users)
+            await session.flush()
+            session.add_all(
+                Fact(
+                    owner_id=user.id,
+                    source_type="MANUAL",
+                    content=f"fact {index} of {user.email}",
+                    qualifiers={},
+                    confidence=1.0,
+                    created_by="USER",
+                )
+                for user in users
+                for index in range(facts_per_owner)
+            )
+            await session.commit()
+            return [user.id for user in users]
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_backfill_embeddings_checkpoints_and_skips_current(
+    scratch_database_url: str, tmp_path
+) -> None:
+    owner_ids = await _seed_owner_facts(scratch_database_url, owners=3, facts_per_owner=4)
+    checkpoint = tmp_path / "backfill.json"
+
+    first = await run_backfill(
+        limit=4, batch_size=2, concurrency=2, checkpoint_path=str(checkpoint)
+    )
+    resumed = await run_backfill(batch_size=3, concurrency=3, checkpoint_path=str(checkpoint))
+    current = await run_backfill(batch_size=5, concurrency=2)
+    forced = await run_backfill(batch_size=2, concurrency=3, force=True)
+
+    engine = create_async_engine(scratch_database_url)
+    try:
+        async with async_sessionmaker(engine)() as session:
+            fact_ids = sorted((await session.scalars(select(Fact.id))).all())
+            embedded = await session.scalar(select(func.count()).select_from(FactEmbedding))
+            namespaces = set((await session.scalars(select(NamespaceGeneration.namespace))).all())
+    finally:
+        await engine.dispose()
+
+    assert (first.processed, first.skipped, first.batches) == (4, 0, 2)
+    assert first.last_id == str(fact_ids[3])
+    assert (resumed.processed, resumed.skipped) == (8, 0)
+    assert json.loads(checkpoint.read_text())["last_id"] == str(fact_ids[-1])
+    assert (current.processed, current.skipped) == (0, 12)
+    assert forced.processed == 12
+    assert embedded == 12
+    assert namespaces == {f"user:{owner_id}" for owner_id in owner_ids}
+
+
+@pytest.mark.anyio
+async def test_concurrent_multi_owner_backfill_does_not_deadlock(
+    scratch_database_url: str,
+) -> None:
+    # Every batch spans most owners, so concurrent batches bump overlapping namespaces.
+    owner_ids = await _seed_owner_facts(scratch_database_url, owners=20, facts_per_owner=50)
+
+    for _ in range(2):
+        report = await run_backfill(batch_size=50, concurrency=4, force=True)
+        assert report.processed == 1000
+
+    engine = create_async_engine(scratch_database_url)
+    try:
+        async with async_sessionmaker(engine)() as session:
+            embedded = await session.scalar(select(func.count()).select_from(FactEmbedding))
+            generations = dict(
+                (
+                    await session.execute(
+                        select(NamespaceGeneration.namespace, NamespaceGeneration.generation)
+                    )
+                ).all()
+            )
+    finally:
+        await engine.dispose()
+
+    assert embedded == 1000
+    assert set(generations) == {f"user:{owner_id}" for owner_id in owner_ids}
+    assert all(generation >= 2 for generation in generations.values())
+
+
+class FakeEmbeddings:
+    def __init__(self) -> None:
+        self.inputs: list[list[str]] = []
+
+    async def create(self, *, model: str, input: list[str]):  # type: ignore[no-untyped-def]
+        self.inputs.append(list(input))
+        data = [
+            types.SimpleNamespace(index=index, embedding=[float(len(text)), 0.0, 1.0])
+            for index, text in enumerate(input)
+        ]
+        return types.SimpleNamespace(data=list(reversed(data)))
+
+
+@pytest.mark.anyio
+async def test_embed_texts_splits_batches_and_dedupes(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = FakeEmbeddings()
+    monkeypatch.setattr(settings, "embeddings_provider", "openai")
+    monkeypatch.setattr(settings, "embeddings_use_openai", True)
+    monkeypatch.setattr(settings, "embeddings_batch_max_items", 3)
+    monkeypatch.setattr(settings, "embeddings_cache_max_entries", 0)
+    monkeypatch.setattr(
+        embeddings, "_get_embedding_client", lambda: types.SimpleNamespace(embeddings=fake)
+    )
+
+    texts = [f"text {'x' * index}" for index in range(7)] + ["TEXT "]
+    results = await embeddings.embed_texts(texts)
+
+    assert [len(batch) for batch in fake.inputs] == [3, 3, 1]
+    assert [vector[0] for vector in results] == [float(len(text.strip())) for text in texts]
+
+
+@pytest.mark.anyio
+async def test_embedding_coalescer_merges_concurrent_requests() -> None:
+    calls: list[list[str]] = []
+
+    async def _embed_batch(texts: list[str]) -> list[list[float]]:
+        calls.append(texts)
+        return [[float(len(text))] for text in texts]
+
+    coalescer = embeddings.EmbeddingCoalescer(_embed_batch, window_ms=5, max_items=100)
+    results = await asyncio.gather(*(coalescer.embed("a" * index) for index in range(1, 11)))
+
+    assert len(calls) == 1
+    assert results == [[float(index)] for index in range(1, 11)]
+
+
+@pytest.mark.anyio
+async def test_embedding_coalescer_propagates_errors() -> None:
+    async def _embed_batch(texts: list[str]) -> list[list[float]]:
+        raise RuntimeError("upstream down")
+
+    coalescer = embeddings.EmbeddingCoalescer(_embed_batch, window_ms=1, max_items=2)
+    results = await asyncio.gather(
+        coalescer.embed("a"), coalescer.embed("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.anyio
+async def test_embedding_cache_evicts_least_recently_used() -> None:
+    cache = EmbeddingCache(max_entries=2)
+    await cache.set_many({"a": [1.0], "b": [2.0]})
+    assert await cache.get_many(["a"]) == {"a": [1.0]}
+    await cache.set_many({"c": [3.0]})
+
+    assert await cache.get_many(["a", "b", "c"]) == {"a": [1.0], "c": [3.0]}
+    stats = cache.stats.snapshot()
+    assert stats["evictions"] == 1
+    assert stats["memory_hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.75
+
+
+def _use_fake_openai(monkeypatch: pytest.MonkeyPatch) -> FakeEmbeddings:
+    fake = FakeEmbeddings()
+    monkeypatch.setattr(settings, "embeddings_provider", "openai")
+    monkeypatch.setattr(settings, "embeddings_use_openai", True)
+    monkeypatch.setattr(settings, "embeddings_cache_backend", "memory")
+    monkeypatch.setattr(embedding_cache, "_embedding_cache", None)
+    monkeypatch.setattr(
+        embeddings, "_get_embedding_client", lambda: types.SimpleNamespace(embeddings=fake)
+    )
+    return fake
+
+
+@pytest.mark.anyio
+async def test_embed_texts_serves_repeats_from_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = _use_fake_openai(monkeypatch)
+
+    first = await embeddings.embed_texts(["Methods - Summarize", "results"])
+    second = await embeddings.embed_texts(["  methods - summarize ", "new text"])
+
+    assert fake.inputs == [["methods - summarize", "results"], ["new text"]]
+    assert second[0] == first[0]
+    stats = embedding_cache.get_embedding_cache_stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 3
+
+
+@pytest.mark.anyio
+async def test_embedding_cache_warmup_preloads_fact_embeddings(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    email = f"user-{uuid.uuid4()}@example.com"
+    password = "Password123!"
+    await async_client.post("/api/v1/auth/register", json={"email": email, "password": password})
+    login_response = await async_client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    fact_response = await async_client.post(
+        "/api/v1/facts/manual", json={"content": "Warm alpha fact"}, headers=headers
+    )
+    fact = fact_response.json()
+
+    fake = _use_fake_openai(monkeypatch)
+    monkeypatch.setattr(settings, "database_url", os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"])
+    warmed = await run_warmup(owner_id=fact["owner_id"])
+    result = await embeddings.embed_texts(["warm alpha fact"])
+
+    assert warmed == 1
+    assert fake.inputs == []
+    assert result == [[1.0, 0.0, 0.0]]
+    assert embedding_cache.get_embedding_cache_stats()["warmed"] == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("batch_rows", [5000, 2])
+async def test_stub_retrieval_returns_true_top_k(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch, batch_rows: int
+) -> None:
+    email = f"user-{uuid.uuid4()}@example.com"
+    password = "Password123!"
+    await async_client.post("/api/v1/auth/register", json={"email": email, "password": password})
+    login_response = await async_client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    # The most similar fact is the oldest; newest-first truncation would miss it.
+    contents = ["alpha fact", "beta fact", "gamma fact", "delta fact", "epsilon fact"]
+    facts = []
+    for content in contents:
+        response = await async_client.post(
+            "/api/v1/facts/manual", json={"content": content}, headers=headers
+        )
+        facts.append(response.json())
+    fact_ids = [uuid.UUID(fact["id"]) for fact in facts]
+
+    monkeypatch.setattr(settings, "vector_exact_batch_rows", batch_rows)
+    monkeypatch.setattr(settings, "database_url", os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"])
+    engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with session_factory() as session:
+            store_matches = await StubVectorStore().query(
+                session=session,
+                query="alpha",
+                namespace=f"user:{facts[0]['owner_id']}",
+                allowed_fact_ids=fact_ids,
+                limit=1,
+            )
+            retrieved = await StubRetriever().retrieve(
+                session=session,
+                owner_id=uuid.UUID(facts[0]["owner_id"]),
+                query="alpha",
+                allowed_fact_ids=fact_ids,
+                limit=3,
+            )
+    finally:
+        await engine.dispose()
+
+    assert [match.fact_id for match in store_matches] == [fact_ids[0]]
+    assert retrieved[0].fact_id == fact_ids[0]
+    assert len(retrieved) == 3
+    assert retrieved[0].score >= retrieved[1].score >= retrieved[2].score
+
+
+@pytest.mark.anyio
+async def test_stub_store_batch_upsert_and_delete(async_client: AsyncClient) -> None:
+    email = f"user-{uuid.uuid4()}@example.com"
+    password = "Password123!"
+    await async_client.post("/api/v1/auth/register", json={"email": email, "password": password})
+    login_response = await async_client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    facts = []
+    for content in ("alpha fact", "beta fact", "gamma fact"):
+        response = await async_client.post(
+            "/api/v1/facts/manual", json={"content": content}, headers=headers
+        )
+        facts.append(response.json())
+    fact_ids = [uuid.UUID(fact["id"]) for fact in facts]
+    namespace = f"user:{facts[0]['owner_id']}"
+
+    engine = create_async_engine(os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"], pool_pre_ping=True)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    store = StubVectorStore()
+    try:
+        async with session_factory() as session:
+            await store.upsert_facts(
+                session=session,
+                items=[
+                    VectorUpsert(fact_id=fact_ids[0], content="gamma", namespace=namespace),
+                    VectorUpsert(
+                        fact_id=fact_ids[1],
+                        content="beta fact",
+                        namespace=namespace,
+                        embedding=[0.0, 0.0, 1.0],
+                    ),
+                ],
+            )
+            matches = await store.query(
+                session=session,
+                query="gamma",
+                namespace=namespace,
+                allowed_fact_ids=fact_ids,
+                limit=3,
+            )
+            await store.delete_facts(session=session, fact_ids=fact_ids[:2], namespace=namespace)
+            remaining = await session.scalars(
+                select(FactEmbedding.fact_id).where(FactEmbedding.fact_id.in_(fact_ids))
+            )
+            remaining_ids = set(remaining.all())
+    finally:
+        await engine.dispose()
+
+    assert matches[0].fact_id in {fact_ids[0], fact_ids[2]}
+    assert matches[0].score == pytest.approx(1.0)
+    assert {match.fact_id for match in matches} == set(fact_ids)
+    assert remaining_ids == {fact_ids[2]}
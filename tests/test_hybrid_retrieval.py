@@ -0,0 +1,96 @@
+import os
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from opus_blocks.core.config import settings
+from opus_blocks.retrieval import get_retriever
+from opus_blocks.retrieval.base import RetrievedFact
+from opus_blocks.retrieval.hybrid import HybridRetriever, reciprocal_rank_fusion
+from opus_blocks.retrieval.stats import get_retrieval_stats, reset_retrieval_stats
+from opus_blocks.retrieval.vector import VectorStoreRetriever
+
+
+def test_reciprocal_rank_fusion_rewards_agreement() -> None:
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    fused = reciprocal_rank_fusion([[a, b], [b, c]], k=60)
+    assert [fact_id for fact_id, _ in fused] == [b, a, c]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+    assert reciprocal_rank_fusion([[], []]) == []
+
+
+def test_get_retriever_selects_backend(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "retrieval_cache_max_entries", 0)
+    monkeypatch.setattr(settings, "retrieval_backend", "vector")
+    assert isinstance(get_retriever(), VectorStoreRetriever)
+    monkeypatch.setattr(settings, "retrieval_backend", "hybrid")
+    assert isinstance(get_retriever(), HybridRetriever)
+    monkeypatch.setattr(settings, "retrieval_backend", "bm25")
+    with pytest.raises(ValueError):
+        get_retriever()
+
+
+class FixedVectorRetriever:
+    def __init__(self, ranked: list[uuid.UUID]) -> None:
+        self._ranked = ranked
+
+    async def retrieve(self, **kwargs) -> list[RetrievedFact]:  # type: ignore[no-untyped-def]
+        return [RetrievedFact(fact_id=fact_id, score=0.5) for fact_id in self._ranked]
+
+
+@pytest.mark.anyio
+async def test_hybrid_retriever_surfaces_exact_terms(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    email = f"user-{uuid.uuid4()}@example.com"
+    password = "Password123!"
+    await async_client.post("/api/v1/auth/register", json={"email": email, "password": password})
+    login_response = await async_client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    facts = []
+    for content in (
+        "Tumour growth slowed in treated mice",
+        "BRCA1 expression doubled after 5 mg/kg dosing",
+        "Cell viability was unchanged",
+    ):
+        response = await async_client.post(
+            "/api/v1/facts/manual", json={"content": content}, headers=headers
+        )
+        facts.append(response.json())
+    owner_id = uuid.UUID(facts[0]["owner_id"])
+    growth, brca1, viability = (uuid.UUID(fact["id"]) for fact in facts)
+
+    monkeypatch.setattr(settings, "database_url", os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"])
+    engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    reset_retrieval_stats()
+    # Embeddings rank the gene fact last; the lexical stage must pull it up.
+    retriever = HybridRetriever(candidates=10, rrf_k=60)
+    retriever._vector = FixedVectorRetriever([growth, viability, brca1])  # type: ignore[assignment]
+    try:
+        async with session_factory() as session:
+            results = await retriever.retrieve(
+                session=session,
+                owner_id=owner_id,
+                query="Results - BRCA1 dosing",
+                allowed_fact_ids=[growth, brca1, viability],
+                limit=2,
+            )
+    finally:
+        await engine.dispose()
+
+    assert [item.fact_id for item in results] == [brca1, growth]
+    stats = get_retrieval_stats()
+    assert stats["lexical"]["candidates"] == 1
+    assert stats["vector"]["candidates"] == 3
+    assert stats["fusion"]["candidates"] == 2
+    assert stats["lexical"]["latency_ms"]["count"] == 1
+
+    response = await async_client.get("/api/v1/metrics/retrieval")
+    assert response.status_code == 200
+    assert set(response.json()) == {"fusion", "lexical", "vector"}
@@ -0,0 +1,208 @@
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from opus_blocks.core.config import settings
+from opus_blocks.llm.chunking import (
+    merge_librarian_outputs,
+    merge_librarian_results,
+    split_source_text,
+)
+from opus_blocks.llm.provider import LLMMetadata, LLMResult
+from opus_blocks.tasks.documents import run_extract_facts_job
+
+
+def _fact(content: str, start: int, end: int, confidence: float = 0.8) -> dict:
+    return {
+        "content": content,
+        "source_type": "PDF",
+        "source_span": {
+            "document_id": str(uuid.uuid4()),
+            "page": None,
+            "start_char": start,
+            "end_char": end,
+            "quote": None,
+        },
+        "qualifiers": {},
+        "confidence": confidence,
+    }
+
+
+def test_split_source_text_prefers_page_boundaries_with_overlap() -> None:
+    pages = ["a" * 90, "b" * 90, "c" * 90]
+    text = "\n\n".join(pages)
+    page_offsets = [
+        {"page": 1, "start_char": 0, "end_char": 90},
+        {"page": 2, "start_char": 92, "end_char": 182},
+        {"page": 3, "start_char": 184, "end_char": 274},
+    ]
+
+    chunks = split_source_text(text, page_offsets, max_chars=120, overlap_chars=10)
+
+    assert [chunk.end_char for chunk in chunks] == [90, 182, 274]
+    assert chunks[0].start_char == 0
+    assert chunks[1].start_char == 80
+    assert all(len(chunk.text) <= 120 for chunk in chunks)
+    assert chunks[1].page_offsets == [
+        {"page": 1, "start_char": 0, "end_char": 10},
+        {"page": 2, "start_char": 12, "end_char": 102},
+    ]
+
+
+def test_split_source_text_returns_single_chunk_under_budget() -> None:
+    chunks = split_source_text("short text", [], max_chars=100, overlap_chars=10)
+
+    assert len(chunks) == 1
+    assert chunks[0].text == "short text"
+
+
+def test_merge_librarian_outputs_remaps_spans_and_dedupes() -> None:
+    text = "alpha beta gamma delta " * 10
+    page_offsets = [
+        {"page": 1, "start_char": 0, "end_char": 115},
+        {"page": 2, "start_char": 115, "end_char": len(text)},
+    ]
+    chunks = split_source_text(text, page_offsets, max_chars=150, overlap_chars=20)
+    assert len(chunks) == 2
+
+    merged = merge_librarian_outputs(
+        [
+            {"facts": [_fact("Shared fact.", 0, 5, 0.6)], "uncertain_facts": []},
+            {
+                "facts": [_fact("  shared FACT. ", 0, 5, 0.9), _fact("Tail fact.", 30, 40)],
+                "uncertain_facts": [],
+            },
+        ],
+        chunks,
+        page_offsets,
+    )
+
+    assert [fact["content"] for fact in merged["facts"]] == ["  shared FACT. ", "Tail fact."]
+    tail_span = merged["facts"][1]["source_span"]
+    assert tail_span["start_char"] == chunks[1].start_char + 30
+    assert tail_span["end_char"] == chunks[1].start_char + 40
+    assert tail_span["page"] == 2
+
+
+def test_merged_chunk_results_carry_no_run_cache_key() -> None:
+    chunks = split_source_text("alpha beta " * 20, [], max_chars=120, overlap_chars=10)
+    results = [
+        LLMResult(
+            outputs={"facts": [], "uncertain_facts": []},
+            metadata=LLMMetadata(
+                provider="test",
+                model="test",
+                prompt_version="v1",
+                cache={"backend": "runs", "key": f"llm:chunk-{chunk.index}", "hits": 1},
+            ),
+        )
+        for chunk in chunks
+    ]
+
+    cache = merge_librarian_results(results, chunks, []).metadata.cache
+
+    assert cache is not None
+    assert cache["key"] is None
+    assert cache["chunk_keys"] == [f"llm:chunk-{chunk.index}" for chunk in chunks]
+    assert cache["hits"] == len(chunks)
+
+
+class ChunkRecordingProvider:
+    def __init__(self, *, valid: bool = True) -> None:
+        self.inputs: list[dict] = []
+        self.valid = valid
+
+    async def extract_facts(self, *, inputs: dict) -> LLMResult:
+        self.inputs.append(inputs)
+        chunk_index = inputs["span_map"]["chunk"]["index"]
+        facts = [
+            _fact("Repeated across chunks.", 0, 5),
+            _fact(f"Fact from chunk {chunk_index}.", 0, 4),
+        ]
+        if not self.valid:
+            for fact in facts:
+                fact["source_span"]["end_char"] = None
+        return LLMResult(
+            outputs={"facts": facts, "uncertain_facts": []},
+            metadata=LLMMetadata(
+                provider="test",
+                model="test",
+                prompt_version="v1",
+                token_prompt=10,
+                token_completion=5,
+            ),
+        )
+
+
+async def _register_and_login(async_client: AsyncClient) -> str:
+    email = f"user-{uuid.uuid4()}@example.com"
+    password = "Password123!"
+    await async_client.post("/api/v1/auth/register", json={"email": email, "password": password})
+    login_response = await async_client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    return login_response.json()["access_token"]
+
+
+@pytest.mark.anyio
+async def test_extract_facts_chunks_large_documents(
+    async_client: AsyncClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "storage_root", str(tmp_path))
+    monkeypatch.setattr(settings, "librarian_chunk_tokens", 25)
+    monkeypatch.setattr(settings, "librarian_chunk_overlap_tokens", 2)
+    token = await _register_and_login(async_client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    file_content = ("Sentence about measured outcomes. " * 12).encode()
+    files = {"file": ("example.pdf", file_content, "application/pdf")}
+    upload_response = await async_client.post(
+        "/api/v1/documents/upload", files=files, headers=headers
+    )
+    doc = upload_response.json()
+    extract_response = await async_client.post(
+        f"/api/v1/documents/{doc['id']}/extract_facts", headers=headers
+    )
+    job = extract_response.json()
+
+    provider = ChunkRecordingProvider()
+    monkeypatch.setattr("opus_blocks.tasks.documents.get_llm_provider", lambda: provider)
+    monkeypatch.setattr(settings, "database_url", os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"])
+    await run_extract_facts_job(uuid.UUID(job["id"]), uuid.UUID(doc["id"]))
+
+    chunk_count = len(provider.inputs)
+    assert chunk_count > 1
+    assert all(len(inputs["source_text"]) <= 100 for inputs in provider.inputs)
+
+    facts_response = await async_client.get(f"/api/v1/documents/{doc['id']}/facts", headers=headers)
+    assert len(facts_response.json()) == chunk_count + 1
+
+    runs_response = await async_client.get(
+        f"/api/v1/documents/{doc['id']}/runs?include=inputs_json&include=outputs_json",
+        headers=headers,
+    )
+    run = runs_response.json()[0]
+    assert len(run["inputs_json"]["chunks"]) == chunk_count
+    assert run["token_prompt"] == 10 * chunk_count
+    last_fact = next(
+        fact
+        for fact in run["outputs_json"]["facts"]
+        if fact["content"] == f"Fact from chunk {chunk_count - 1}."
+    )
+    assert last_fact["source_span"]["start_char"] == run["inputs_json"]["chunks"][-1]["start_char"]
+
+    # Re-extraction skips the contract check on both paths, so invalid spans are kept.
+    rerun_response = await async_client.post(
+        f"/api/v1/documents/{doc['id']}/extract_facts", headers=headers
+    )
+    rerun = rerun_response.json()
+    lenient = ChunkRecordingProvider(valid=False)
+    monkeypatch.setattr("opus_blocks.tasks.documents.get_llm_provider", lambda: lenient)
+    await run_extract_facts_job(uuid.UUID(rerun["id"]), uuid.UUID(doc["id"]))
+
+    assert len(lenient.inputs) == chunk_count
+    job_response = await async_client.get(f"/api/v1/jobs/{rerun['id']}", headers=headers)
+    assert job_response.json()["status"] == "SUCCEEDED"
@@ -0,0 +1,157 @@
+import json
+import os
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from opus_blocks.db.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from opus_blocks.services.metrics import create_snapshot
+from opus_blocks.services.runs import create_run
+
+
+async def _register_and_login(async_client: AsyncClient) -> tuple[str, uuid.UUID]:
+    email = f"user-{uuid.uuid4()}@example.com"
+    password = "Password123!"
+
+    register_response = await async_client.post(
+        "/api/v1/auth/register", json={"email": email, "password": password}
+    )
+    assert register_response.status_code == 201
+
+    login_response = await async_client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    assert login_response.status_code == 200
+    return login_response.json()["access_token"], uuid.UUID(register_response.json()["id"])
+
+
+async def _seed_runs(owner_id: uuid.UUID, count: int) -> list[str]:
+    engine = create_async_engine(os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"], pool_pre_ping=True)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    run_ids: list[str] = []
+    try:
+        async with session_factory() as session:
+            for index in range(count):
+                run = await create_run(
+                    session,
+                    owner_id=owner_id,
+                    run_type="WRITER",
+                    paragraph_id=None,
+                    document_id=None,
+                    provider="stub",
+                    model="stub",
+                    prompt_version="v1",
+                    inputs_json={"index": index},
+                    outputs_json={"text": "x" * 100},
+                )
+                run_ids.append(str(run.id))
+    finally:
+        await engine.dispose()
+    return run_ids
+
+
+def test_cursor_round_trip_and_rejects_garbage() -> None:
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=UTC)
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+    for cursor in ("not-a-cursor", "", encode_cursor(created_at, row_id)[:-4]):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+
+@pytest.mark.anyio
+async def test_runs_keyset_pages_and_projection(async_client: AsyncClient) -> None:
+    token, owner_id = await _register_and_login(async_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    run_ids = await _seed_runs(owner_id, 5)
+
+    seen: list[str] = []
+    cursor: str | None = None
+    pages = 0
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        response = await async_client.get("/api/v1/runs", params=params, headers=headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert all("inputs_json" not in run and "outputs_json" not in run for run in page)
+        seen.extend(run["id"] for run in page)
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == run_ids
+    assert pages == 3
+
+    included = await async_client.get(
+        "/api/v1/runs", params={"include": "outputs_json", "limit": 1}, headers=headers
+    )
+    assert included.status_code == 200
+    run = included.json()[0]
+    assert run["outputs_json"] == {"text": "x" * 100}
+    assert "inputs_json" not in run
+
+    rejected = await async_client.get(
+        "/api/v1/runs", params={"include": "owner_id"}, headers=headers
+    )
+    assert rejected.status_code == 422
+
+    invalid = await async_client.get("/api/v1/runs", params={"cursor": "bogus"}, headers=headers)
+    assert invalid.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_runs_ndjson_streams_after_cursor(async_client: AsyncClient) -> None:
+    token, owner_id = await _register_and_login(async_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    run_ids = await _seed_runs(owner_id, 4)
+
+    first = await async_client.get("/api/v1/runs", params={"limit": 1}, headers=headers)
+    cursor = first.headers["X-Next-Cursor"]
+
+    response = await async_client.get(
+        "/api/v1/runs",
+        params={"format": "ndjson", "cursor": cursor, "include": "inputs_json"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == run_ids[1:]
+    assert [line["inputs_json"]["index"] for line in lines] == [1, 2, 3]
+    assert all("outputs_json" not in line for line in lines)
+
+    limited = await async_client.get(
+        "/api/v1/runs", params={"format": "ndjson", "limit": 2}, headers=headers
+    )
+    assert len(limited.text.splitlines()) == 2
+
+
+@pytest.mark.anyio
+async def test_snapshots_page_newest_first(async_client: AsyncClient) -> None:
+    engine = create_async_engine(os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"], pool_pre_ping=True)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with session_factory() as session:
+            window_end = datetime.now(tz=UTC)
+            for _ in range(3):
+                await create_snapshot(
+                    session, window_start=window_end - timedelta(hours=1), window_end=window_end
+                )
+    finally:
+        await engine.dispose()
+
+    first = await async_client.get("/api/v1/metrics/snapshots", params={"limit": 2})
+    assert first.status_code == 200
+    first_page = first.json()
+    second = await async_client.get(
+        "/api/v1/metrics/snapshots",
+        params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+    )
+    assert second.status_code == 200
+    created = [item["created_at"] for item in first_page + second.json()]
+    assert created == sorted(created, reverse=True)
+    assert not {item["id"] for item in first_page} & {item["id"] for item in second.json()}
@@ -0,0 +1,104 @@
+import types
+
+import pytest
+
+from opus_blocks.core.config import settings
+from opus_blocks.llm import cache as llm_cache
+from opus_blocks.llm.cache import (
+    CachedResponse,
+    InMemoryLLMCache,
+    LLMCacheStats,
+    bypass_llm_cache,
+)
+from opus_blocks.llm.provider import OpenAIProvider
+
+
+class CountingCompletions:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def create(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+        self.calls += 1
+        return types.SimpleNamespace(
+            choices=[
+                types.SimpleNamespace(
+                    message=types.SimpleNamespace(content='{"facts": [], "uncertain_facts": []}')
+                )
+            ],
+            usage=types.SimpleNamespace(prompt_tokens=12, completion_tokens=34),
+        )
+
+
+def _provider(monkeypatch: pytest.MonkeyPatch) -> tuple[OpenAIProvider, CountingCompletions]:
+    monkeypatch.setattr(settings, "llm_cache_enabled", True)
+    monkeypatch.setattr(settings, "llm_cache_backend", "memory")
+    monkeypatch.setattr(llm_cache, "_caches", {})
+    monkeypatch.setattr(llm_cache, "_cache_stats", LLMCacheStats())
+    provider = OpenAIProvider(api_key="test", model="gpt-test", prompt_version="v1")
+    completions = CountingCompletions()
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+    monkeypatch.setattr(provider, "_client", client)
+    monkeypatch.setattr(provider._prompt_loader, "render", lambda *_: "prompt")
+    return provider, completions
+
+
+@pytest.mark.anyio
+async def test_memory_cache_evicts_lru_and_expired_entries(monkeypatch) -> None:
+    cache = InMemoryLLMCache(max_entries=2, ttl_seconds=60)
+    await cache.set("a", CachedResponse(outputs={"v": "a"}))
+    await cache.set("b", CachedResponse(outputs={"v": "b"}))
+    assert await cache.get("a") is not None
+    await cache.set("c", CachedResponse(outputs={"v": "c"}))
+
+    assert await cache.get("b") is None
+    assert (await cache.get("a")).outputs == {"v": "a"}  # type: ignore[union-attr]
+
+    now = llm_cache.time.monotonic()
+    monkeypatch.setattr(llm_cache.time, "monotonic", lambda: now + 61)
+    assert await cache.get("c") is None
+
+
+@pytest.mark.anyio
+async def test_cache_hit_skips_client_and_reports_savings(monkeypatch) -> None:
+    provider, completions = _provider(monkeypatch)
+    inputs = {"document_id": "doc", "source_text": "text"}
+
+    first = await provider.extract_facts(inputs=inputs)
+    second = await provider.extract_facts(inputs=inputs)
+
+    assert completions.calls == 1
+    assert first.metadata.cache is not None
+    assert first.metadata.cache["misses"] == 1
+    assert second.outputs == first.outputs
+    assert second.metadata.cache is not None
+    assert second.metadata.cache["hits"] == 1
+    assert second.metadata.cache["saved_token_prompt"] == 12
+    assert second.metadata.token_prompt == 0
+    stats = llm_cache.get_llm_cache_stats().snapshot()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["saved_tokens"] == 46
+    assert stats["by_stage"]["librarian"]["hits"] == 1
+
+
+@pytest.mark.anyio
+async def test_cache_key_changes_with_prompt_version(monkeypatch) -> None:
+    provider, completions = _provider(monkeypatch)
+    await provider.extract_facts(inputs={"document_id": "doc"})
+    provider._prompt_version = "v2"
+    await provider.extract_facts(inputs={"document_id": "doc"})
+
+    assert completions.calls == 2
+
+
+@pytest.mark.anyio
+async def test_bypass_forces_fresh_call(monkeypatch) -> None:
+    provider, completions = _provider(monkeypatch)
+    await provider.extract_facts(inputs={"document_id": "doc"})
+    with bypass_llm_cache():
+        result = await provider.extract_facts(inputs={"document_id": "doc"})
+
+    assert completions.calls == 2
+    assert result.metadata.cache is not None
+    assert result.metadata.cache["bypassed"] == 1
+    assert llm_cache.get_llm_cache_stats().snapshot()["bypassed"] == 1
@@ -59,7 +59,7 @@ class BadWriterProvider:
     def __init__(self) -> None:
         self.calls = 0
 
-    def generate_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+    async def generate_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
         self.calls += 1
         # Missing citations should fail contract validation, even on retry.
         return type(
@@ -92,6 +92,7 @@ class BadWriterProvider:
                         "token_completion": None,
                         "cost_usd": None,
                         "latency_ms": None,
+                        "cache": None,
                     },
                 )(),
             },
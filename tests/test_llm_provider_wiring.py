@@ -52,7 +52,7 @@ class FakeExtractProvider:
             provider="test-provider", model="test-model", prompt_version="test-v1"
         )
 
-    def extract_facts(self, *, inputs: dict) -> LLMResult:
+    async def extract_facts(self, *, inputs: dict) -> LLMResult:
         document_id = inputs["document_id"]
         self.calls.append(f"extract:{document_id}")
         outputs = {
@@ -83,7 +83,7 @@ class FakeParagraphProvider:
             provider="test-provider", model="test-model", prompt_version="test-v1"
         )
 
-    def generate_paragraph(self, *, inputs: dict) -> LLMResult:
+    async def generate_paragraph(self, *, inputs: dict) -> LLMResult:
         paragraph_id = inputs["paragraph_id"]
         paragraph_spec = inputs["paragraph_spec"]
         allowed_facts = inputs["allowed_facts"]
@@ -106,7 +106,7 @@ class FakeParagraphProvider:
         }
         return LLMResult(outputs=outputs, metadata=self.metadata)
 
-    def verify_paragraph(self, *, inputs: dict) -> LLMResult:
+    async def verify_paragraph(self, *, inputs: dict) -> LLMResult:
         paragraph_id = inputs["paragraph_id"]
         sentence_inputs = inputs["sentences"]
         self.calls.append(f"verify:{paragraph_id}")
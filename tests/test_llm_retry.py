@@ -16,19 +16,19 @@ class FlakyProvider:
     def __init__(self) -> None:
         self.calls: dict[str, int] = {"extract": 0, "generate": 0, "verify": 0}
 
-    def extract_facts(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+    async def extract_facts(self, *, inputs: dict):  # type: ignore[no-untyped-def]
         self.calls["extract"] += 1
         if self.calls["extract"] == 1:
             raise ValueError("bad json")
         return _fake_librarian_result(inputs["document_id"])
 
-    def generate_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+    async def generate_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
         self.calls["generate"] += 1
         if self.calls["generate"] == 1:
             raise ValueError("bad json")
         return _fake_writer_result(inputs.get("allowed_facts", []))
 
-    def verify_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+    async def verify_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
         self.calls["verify"] += 1
         if self.calls["verify"] == 1:
             raise ValueError("bad json")
@@ -49,6 +49,7 @@ class Result:
                 "token_completion": None,
                 "cost_usd": None,
                 "latency_ms": None,
+                "cache": None,
             },
         )()
 
@@ -270,7 +271,7 @@ async def test_extract_facts_retries_and_fails_on_non_json(
         def __init__(self) -> None:
             self.calls = 0
 
-        def extract_facts(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+        async def extract_facts(self, *, inputs: dict):  # type: ignore[no-untyped-def]
             self.calls += 1
             raise ValueError("bad json")
 
@@ -325,7 +326,7 @@ async def test_generate_retries_and_fails_on_non_json(
         def __init__(self) -> None:
             self.calls = 0
 
-        def generate_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+        async def generate_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
             self.calls += 1
             raise ValueError("bad json")
 
@@ -383,7 +384,7 @@ async def test_verify_retries_and_fails_on_non_json(
         def __init__(self) -> None:
             self.calls = 0
 
-        def verify_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+        async def verify_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
             self.calls += 1
             raise ValueError("bad json")
 
@@ -426,7 +427,7 @@ async def test_extract_facts_retries_and_fails_on_invalid_contract(
         def __init__(self) -> None:
             self.calls = 0
 
-        def extract_facts(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+        async def extract_facts(self, *, inputs: dict):  # type: ignore[no-untyped-def]
             self.calls += 1
             document_id = inputs["document_id"]
             return Result(
@@ -517,7 +518,7 @@ async def test_verify_retries_and_fails_on_invalid_contract(
         def __init__(self) -> None:
             self.calls = 0
 
-        def verify_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+        async def verify_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
             self.calls += 1
             return Result(
                 {
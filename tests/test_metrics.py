@@ -20,6 +20,15 @@ async def test_metrics_overview_endpoint(async_client: AsyncClient) -> None:
     assert "counts" in payload
 
 
+@pytest.mark.anyio
+async def test_metrics_vector_store_endpoint(async_client: AsyncClient) -> None:
+    response = await async_client.get("/api/v1/metrics/vector-store")
+    assert response.status_code == 200
+    payload = response.json()
+    assert set(payload) == {"wait_ms", "execution_ms", "rejected", "errors"}
+    assert "le_inf" in payload["wait_ms"]["buckets"]
+
+
 @pytest.mark.anyio
 async def test_metrics_snapshots_and_alerts(async_client: AsyncClient) -> None:
     original_url = settings.database_url
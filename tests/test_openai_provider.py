@@ -1,5 +1,9 @@
+import asyncio
 import types
 
+import pytest
+
+from opus_blocks.core.config import settings
 from opus_blocks.llm.provider import OpenAIProvider
 
 
@@ -10,7 +14,15 @@ class FakeResponse:
 
 
 class FakeCompletions:
-    def create(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
         return FakeResponse('{"facts": [], "uncertain_facts": []}')
 
 
@@ -24,19 +36,21 @@ class FakeClient:
         self.chat = FakeChat()
 
 
-def test_openai_provider_parses_json(monkeypatch) -> None:
+@pytest.mark.anyio
+async def test_openai_provider_parses_json(monkeypatch) -> None:
     provider = OpenAIProvider(api_key="test", model="gpt-test", prompt_version="v1")
     monkeypatch.setattr(provider, "_client", FakeClient())
     monkeypatch.setattr(provider._prompt_loader, "render", lambda *_: "prompt")
 
-    result = provider.extract_facts(inputs={"document_id": "doc", "source_text": ""})
+    result = await provider.extract_facts(inputs={"document_id": "doc", "source_text": ""})
 
     assert result.outputs["facts"] == []
     assert result.metadata.token_prompt == 12
     assert result.metadata.token_completion == 34
 
 
-def test_prompt_loader_used_for_writer(monkeypatch) -> None:
+@pytest.mark.anyio
+async def test_prompt_loader_used_for_writer(monkeypatch) -> None:
     provider = OpenAIProvider(api_key="test", model="gpt-test", prompt_version="v1")
     monkeypatch.setattr(provider, "_client", FakeClient())
 
@@ -49,6 +63,19 @@ def test_prompt_loader_used_for_writer(monkeypatch) -> None:
 
     monkeypatch.setattr(provider._prompt_loader, "render", _render)
 
-    provider.generate_paragraph(inputs={"paragraph_id": "p1"})
+    await provider.generate_paragraph(inputs={"paragraph_id": "p1"})
 
     assert captured["name"] == "writer"
+
+
+@pytest.mark.anyio
+async def test_openai_provider_caps_concurrent_requests(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "llm_max_concurrency", 2)
+    provider = OpenAIProvider(api_key="test", model="gpt-test", prompt_version="v1")
+    client = FakeClient()
+    monkeypatch.setattr(provider, "_client", client)
+    monkeypatch.setattr(provider._prompt_loader, "render", lambda *_: "prompt")
+
+    await asyncio.gather(*(provider.extract_facts(inputs={"document_id": "doc"}) for _ in range(6)))
+
+    assert client.chat.completions.max_in_flight == 2
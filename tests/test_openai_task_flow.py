@@ -83,7 +83,7 @@ async def test_openai_writer_and_verifier_flow(
     settings.llm_use_openai = True
     settings.openai_api_key = "test-key"
 
-    def fake_generate(self, *, inputs: dict) -> LLMResult:  # type: ignore[no-untyped-def]
+    async def fake_generate(self, *, inputs: dict) -> LLMResult:  # type: ignore[no-untyped-def]
         sentence = {
             "order": 1,
             "sentence_type": "topic",
@@ -101,7 +101,7 @@ async def test_openai_writer_and_verifier_flow(
         metadata = LLMMetadata(provider="openai", model="test", prompt_version="v1")
         return LLMResult(outputs=outputs, metadata=metadata)
 
-    def fake_verify(self, *, inputs: dict) -> LLMResult:  # type: ignore[no-untyped-def]
+    async def fake_verify(self, *, inputs: dict) -> LLMResult:  # type: ignore[no-untyped-def]
         results = [
             {
                 "order": sentence["order"],
@@ -1,7 +1,11 @@
 import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 
 async def _register_and_login(async_client: AsyncClient) -> str:
@@ -20,6 +24,20 @@ async def _register_and_login(async_client: AsyncClient) -> str:
     return login_response.json()["access_token"]
 
 
+@contextmanager
+def _count_queries() -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", _record)
+
+
 async def _create_paragraph(async_client: AsyncClient, token: str) -> dict:
     headers = {"Authorization": f"Bearer {token}"}
 
@@ -59,7 +77,7 @@ async def _create_paragraph(async_client: AsyncClient, token: str) -> dict:
     return paragraph_response.json()
 
 
-async def _create_fact(async_client: AsyncClient, token: str) -> dict:
+async def _create_fact(async_client: AsyncClient, token: str) -> tuple[dict, str]:
     headers = {"Authorization": f"Bearer {token}"}
     document_response = await async_client.post(
         "/api/v1/documents/upload",
@@ -133,3 +151,56 @@ async def test_paragraph_view_payload(async_client: AsyncClient) -> None:
     assert payload["sentences"][0]["id"] == sentence["id"]
     assert payload["links"][0]["fact_id"] == fact["id"]
     assert payload["facts"][0]["id"] == fact["id"]
+
+
+@pytest.mark.anyio
+async def test_paragraph_view_query_count_is_constant(async_client: AsyncClient) -> None:
+    token = await _register_and_login(async_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    paragraph = await _create_paragraph(async_client, token)
+    fact, _ = await _create_fact(async_client, token)
+
+    async def add_linked_sentences(start: int, count: int) -> None:
+        for order in range(start, start + count):
+            sentence_response = await async_client.post(
+                "/api/v1/sentences",
+                json={
+                    "paragraph_id": paragraph["id"],
+                    "order": order,
+                    "sentence_type": "evidence",
+                    "text": f"Evidence statement {order}.",
+                    "is_user_edited": False,
+                },
+                headers=headers,
+            )
+            assert sentence_response.status_code == 201
+            link_response = await async_client.post(
+                "/api/v1/sentences/links",
+                json={"sentence_id": sentence_response.json()["id"], "fact_id": fact["id"]},
+                headers=headers,
+            )
+            assert link_response.status_code == 201
+
+    async def view_queries() -> tuple[dict, int]:
+        with _count_queries() as statements:
+            response = await async_client.get(
+                f"/api/v1/paragraphs/{paragraph['id']}/view", headers=headers
+            )
+        assert response.status_code == 200
+        return response.json(), len(statements)
+
+    await add_linked_sentences(1, 2)
+    small_payload, small_count = await view_queries()
+    await add_linked_sentences(3, 18)
+    large_payload, large_count = await view_queries()
+
+    assert len(small_payload["links"]) == 2
+    assert len(large_payload["sentences"]) == 20
+    assert [link["sentence_id"] for link in large_payload["links"]] == [
+        sentence["id"] for sentence in large_payload["sentences"]
+    ]
+    # Linked facts are included even though the document is not attached to the manuscript.
+    assert [item["id"] for item in large_payload["facts"]] == [fact["id"]]
+    # Principal, paragraph, sentences, links and facts; independent of sentence count.
+    assert large_count == small_count
+    assert large_count <= 5
@@ -327,7 +327,7 @@ async def test_generate_uses_writer_output(
         paragraph = await _create_paragraph(async_client, token, [fact["id"]])
 
         class FakeProvider:
-            def generate_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+            async def generate_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
                 return type(
                     "Result",
                     (),
@@ -358,6 +358,7 @@ async def test_generate_uses_writer_output(
                                 "token_completion": None,
                                 "cost_usd": None,
                                 "latency_ms": None,
+                                "cache": None,
                             },
                         )(),
                     },
@@ -421,7 +422,7 @@ async def test_verify_uses_verifier_output(
             settings.database_url = original_url
 
         class FakeProvider:
-            def verify_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
+            async def verify_paragraph(self, *, inputs: dict):  # type: ignore[no-untyped-def]
                 return type(
                     "Result",
                     (),
@@ -451,6 +452,7 @@ async def test_verify_uses_verifier_output(
                                 "token_completion": None,
                                 "cost_usd": None,
                                 "latency_ms": None,
+                                "cache": None,
                             },
                         )(),
                     },
@@ -0,0 +1,215 @@
+import asyncio
+import uuid
+
+import asyncpg
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from opus_blocks.core.config import settings
+from opus_blocks.models.fact import Fact
+from opus_blocks.models.fact_embedding import FactEmbedding
+from opus_blocks.retrieval.stub import StubRetriever
+from opus_blocks.tools.pgvector_schema import enable_pgvector
+from opus_blocks.vector_store.pgvector import PgVectorStore
+
+
+async def _vector_available(database_url: str) -> bool:
+    url = make_url(database_url).set(drivername="postgresql")
+    connection = await asyncpg.connect(url.render_as_string(hide_password=False))
+    try:
+        return bool(
+            await connection.fetchval("SELECT 1 FROM pg_available_extensions WHERE name = 'vector'")
+        )
+    finally:
+        await connection.close()
+
+
+@pytest.fixture()
+def pgvector_database_url(scratch_database_url: str, monkeypatch: pytest.MonkeyPatch) -> str:
+    if not asyncio.run(_vector_available(scratch_database_url)):
+        pytest.skip("pgvector extension is not available")
+    monkeypatch.setattr(settings, "vector_backend", "pgvector")
+    monkeypatch.setattr(settings, "vector_dimensions", 3)
+    return scratch_database_url
+
+
+@pytest.mark.anyio
+async def test_pgvector_store_orders_by_distance_in_sql(pgvector_database_url: str) -> None:
+    engine = create_async_engine(pgvector_database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    store = PgVectorStore()
+    try:
+        async with session_factory() as session:
+            assert (await enable_pgvector(session))["converted"] is True
+            column_type = await session.scalar(
+                text(
+                    "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+                    "WHERE attrelid = 'fact_embeddings'::regclass AND attname = 'embedding'"
+                )
+            )
+            index_count = await session.scalar(
+                text(
+                    "SELECT count(*) FROM pg_indexes WHERE tablename = 'fact_embeddings' "
+                    "AND indexdef LIKE '%USING hnsw%vector_cosine_ops%'"
+                )
+            )
+            assert column_type == "vector(3)"
+            assert index_count == 1
+
+            facts = [
+                Fact(
+                    source_type="MANUAL",
+                    content=content,
+                    qualifiers={},
+                    confidence=1.0,
+                    created_by="USER",
+                )
+                for content in ("alpha fact", "beta fact", "gamma fact")
+            ]
+            session.add_all(facts)
+            await session.commit()
+            for fact in facts:
+                await store.upsert_fact(
+                    session=session, fact_id=fact.id, content=fact.content, namespace="user:x"
+                )
+            other = facts[2]
+            await store.upsert_fact(
+                session=session, fact_id=other.id, content="alpha", namespace="user:y"
+            )
+
+            matches = await store.query(
+                session=session,
+                query="alpha",
+                namespace="user:x",
+                allowed_fact_ids=[fact.id for fact in facts],
+                limit=2,
+            )
+            retrieved = await StubRetriever().retrieve(
+                session=session,
+                owner_id=uuid.uuid4(),
+                query="beta",
+                allowed_fact_ids=[fact.id for fact in facts],
+                limit=1,
+            )
+    finally:
+        await engine.dispose()
+
+    assert [match.fact_id for match in matches] == [facts[0].id, facts[1].id]
+    assert matches[0].score == pytest.approx(1.0)
+    assert retrieved[0].fact_id == facts[1].id
+
+
+@pytest.mark.anyio
+async def test_enable_pgvector_is_explicit_and_refuses_mismatched_dimensions(
+    pgvector_database_url: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "stub_ann_enabled", True)
+    engine = create_async_engine(pgvector_database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    store = PgVectorStore()
+    assert store._ann is None
+    try:
+        async with session_factory() as session:
+            fact = Fact(
+                source_type="MANUAL",
+                content="old model fact",
+                qualifiers={},
+                confidence=1.0,
+                created_by="USER",
+            )
+            session.add(fact)
+            await session.commit()
+            fact_id = fact.id
+            session.add(
+                FactEmbedding(
+                    fact_id=fact_id,
+                    vector_id=str(fact_id),
+                    embedding_model="old",
+                    namespace="user:x",
+                    embedding=[1.0, 0.0],
+                )
+            )
+            await session.commit()
+
+            with pytest.raises(RuntimeError, match="enable_pgvector"):
+                await store.query(
+                    session=session, query="alpha", namespace="user:x", allowed_fact_ids=[fact_id]
+                )
+            with pytest.raises(RuntimeError, match="1 embeddings"):
+                await enable_pgvector(session)
+            await session.rollback()
+
+            result = await enable_pgvector(session, drop_mismatched=True)
+            assert result == {"converted": True, "dropped": 1, "column_type": "vector(3)"}
+            assert (await enable_pgvector(session))["converted"] is False
+            matches = await store.query(
+                session=session, query="alpha", namespace="user:x", allowed_fact_ids=[fact_id]
+            )
+    finally:
+        await engine.dispose()
+
+    assert matches == []
+
+
+@pytest.mark.anyio
+async def test_pgvector_store_ranks_small_allowed_sets_past_other_namespaces(
+    pgvector_database_url: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def _query_embedding(text: str, *, model: str | None = None) -> list[float]:
+        return [1.0, 0.0, 0.0]
+
+    monkeypatch.setattr("opus_blocks.vector_store.pgvector.embed_text", _query_embedding)
+    engine = create_async_engine(pgvector_database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    store = PgVectorStore()
+    # Other users' facts sit right on the query vector; this user's facts are far from it.
+    vectors = [([1.0, index / 1000, 0.0], "user:y") for index in range(200)] + [
+        ([0.5, 1.0, 0.0], "user:x"),
+        ([-1.0, 1.0, 0.0], "user:x"),
+        ([0.0, 1.0, 0.0], "user:x"),
+    ]
+    try:
+        async with session_factory() as session:
+            await enable_pgvector(session)
+            facts = [
+                Fact(
+                    source_type="MANUAL",
+                    content=f"fact {index}",
+                    qualifiers={},
+                    confidence=1.0,
+                    created_by="USER",
+                )
+                for index in range(len(vectors))
+            ]
+            session.add_all(facts)
+            await session.flush()
+            session.add_all(
+                FactEmbedding(
+                    fact_id=fact.id,
+                    vector_id=str(fact.id),
+                    embedding_model=settings.embeddings_model,
+                    namespace=namespace,
+                    embedding=embedding,
+                )
+                for fact, (embedding, namespace) in zip(facts, vectors, strict=True)
+            )
+            await session.commit()
+            await session.execute(text("ANALYZE fact_embeddings"))
+            # Make the planner reach for the HNSW index whenever the query allows it.
+            await session.execute(text("SET LOCAL enable_seqscan = off"))
+            await session.execute(text("SET LOCAL enable_sort = off"))
+
+            own = facts[-3:]
+            matches = await store.query(
+                session=session,
+                query="alpha",
+                namespace="user:x",
+                allowed_fact_ids=[fact.id for fact in own],
+                limit=2,
+            )
+    finally:
+        await engine.dispose()
+
+    assert [match.fact_id for match in matches] == [own[0].id, own[2].id]
@@ -0,0 +1,161 @@
+import os
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from opus_blocks.core.config import settings
+from opus_blocks.retrieval import get_retriever
+from opus_blocks.retrieval.base import RetrievedFact
+from opus_blocks.retrieval.cache import (
+    CachedRetriever,
+    RetrievalCache,
+    get_retrieval_cache,
+    retrieval_cache_key,
+)
+from opus_blocks.services.namespace_generations import (
+    bump_namespace_generation,
+    get_namespace_generation,
+)
+
+
+def test_retrieval_cache_key_normalizes_query_and_fact_set() -> None:
+    owner_id = uuid.uuid4()
+    a, b = uuid.uuid4(), uuid.uuid4()
+    key = retrieval_cache_key(
+        backend="vector",
+        owner_id=owner_id,
+        query="Intro - Background",
+        allowed_fact_ids=[a, b],
+        limit=5,
+    )
+    assert key == retrieval_cache_key(
+        backend="vector",
+        owner_id=owner_id,
+        query="  intro - background ",
+        allowed_fact_ids=[b, a, b],
+        limit=5,
+    )
+    assert key != retrieval_cache_key(
+        backend="vector",
+        owner_id=owner_id,
+        query="Intro - Background",
+        allowed_fact_ids=[a],
+        limit=5,
+    )
+    assert key != retrieval_cache_key(
+        backend="hybrid",
+        owner_id=owner_id,
+        query="Intro - Background",
+        allowed_fact_ids=[a, b],
+        limit=5,
+    )
+
+
+def test_retrieval_cache_drops_entries_from_older_generations() -> None:
+    cache = RetrievalCache(max_entries=2)
+    result = [RetrievedFact(fact_id=uuid.uuid4(), score=1.0)]
+    cache.set("a", 3, result)
+    assert cache.get("a", 3) == result
+    assert cache.get("a", 4) is None
+    assert cache.get("a", 3) is None
+    cache.set("a", 1, result)
+    cache.set("b", 1, result)
+    cache.set("c", 1, result)
+    assert len(cache) == 2
+    assert cache.stats.snapshot() == {
+        "hits": 1,
+        "misses": 2,
+        "stale": 1,
+        "evictions": 1,
+        "hit_rate": pytest.approx(1 / 3),
+    }
+
+
+def test_get_retriever_wraps_in_cache(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "retrieval_backend", "vector")
+    monkeypatch.setattr(settings, "retrieval_cache_max_entries", 16)
+    assert isinstance(get_retriever(), CachedRetriever)
+
+
+@pytest.mark.anyio
+async def test_suggestions_are_cached_until_a_fact_changes(async_client: AsyncClient) -> None:
+    email = f"user-{uuid.uuid4()}@example.com"
+    password = "Password123!"
+    await async_client.post("/api/v1/auth/register", json={"email": email, "password": password})
+    login_response = await async_client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    fact_ids = []
+    for content in ("alpha evidence", "beta evidence"):
+        response = await async_client.post(
+            "/api/v1/facts/manual", json={"content": content}, headers=headers
+        )
+        fact_ids.append(response.json()["id"])
+    manuscript = await async_client.post(
+        "/api/v1/manuscripts", json={"title": "Cached Manuscript"}, headers=headers
+    )
+    paragraph = await async_client.post(
+        "/api/v1/paragraphs",
+        json={
+            "manuscript_id": manuscript.json()["id"],
+            "spec": {
+                "section": "Introduction",
+                "intent": "Background Context",
+                "required_structure": {
+                    "topic_sentence": True,
+                    "evidence_sentences": 1,
+                    "conclusion_sentence": True,
+                },
+                "allowed_fact_ids": fact_ids,
+                "style": {
+                    "tense": "present",
+                    "voice": "academic",
+                    "target_length_words": [60, 90],
+                },
+                "constraints": {"forbidden_claims": [], "allowed_scope": "facts only"},
+            },
+        },
+        headers=headers,
+    )
+    assert paragraph.status_code == 201
+    url = f"/api/v1/paragraphs/{paragraph.json()['id']}/suggest-facts"
+
+    cache = get_retrieval_cache()
+    assert cache is not None
+    first = await async_client.get(url, headers=headers)
+    hits = cache.stats.hits
+    second = await async_client.get(url, headers=headers)
+    assert second.json() == first.json()
+    assert cache.stats.hits == hits + 1
+
+    deleted = await async_client.delete(f"/api/v1/facts/{fact_ids[0]}", headers=headers)
+    assert deleted.status_code == 204
+    stale = cache.stats.stale
+    third = await async_client.get(url, headers=headers)
+    assert [item["fact_id"] for item in third.json()] == [fact_ids[1]]
+    assert cache.stats.stale == stale + 1
+
+
+@pytest.mark.anyio
+async def test_namespace_bumps_apply_once_at_commit_and_drop_on_rollback() -> None:
+    namespace = f"user:{uuid.uuid4()}"
+    engine = create_async_engine(os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"])
+    try:
+        async with async_sessionmaker(engine)() as session:
+            base = await get_namespace_generation(session, namespace)
+            bump_namespace_generation(session, namespace)
+            await session.rollback()
+            await session.commit()
+            assert await get_namespace_generation(session, namespace) == base
+
+            bump_namespace_generation(session, namespace)
+            bump_namespace_generation(session, namespace)
+            assert await get_namespace_generation(session, namespace) == base
+            await session.commit()
+            assert await get_namespace_generation(session, namespace) == base + 1
+    finally:
+        await engine.dispose()
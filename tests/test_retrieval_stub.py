@@ -13,10 +13,22 @@ class FakeResult:
         return []
 
 
+class FakeStreamResult:
+    async def partitions(self):  # type: ignore[no-untyped-def]
+        for rows in []:
+            yield rows
+
+
 class FakeSession:
     async def execute(self, *args, **kwargs):  # type: ignore[no-untyped-def]
         return FakeResult()
 
+    async def stream(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+        return FakeStreamResult()
+
+    async def scalar(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+        return None
+
 
 @pytest.mark.anyio
 async def test_stub_retriever_returns_empty() -> None:
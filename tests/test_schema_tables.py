@@ -12,6 +12,8 @@ def test_expected_tables_are_registered() -> None:
         "spans",
         "facts",
         "fact_embeddings",
+        "embedding_models",
+        "namespace_generations",
         "manuscripts",
         "manuscript_documents",
         "paragraphs",
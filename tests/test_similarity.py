@@ -0,0 +1,46 @@
+import numpy as np
+
+from opus_blocks.vector_store.similarity import (
+    TopKAccumulator,
+    embedding_matrix,
+    rank_by_cosine,
+    top_k,
+)
+
+
+def test_embedding_matrix_is_normalized_float32() -> None:
+    matrix = embedding_matrix([[3.0, 4.0], [0.0, 0.0]], 2)
+
+    assert matrix.dtype == np.float32
+    assert matrix.flags["C_CONTIGUOUS"]
+    assert np.allclose(matrix[0], [0.6, 0.8])
+    assert np.allclose(matrix[1], [0.0, 0.0])
+
+
+def test_top_k_orders_by_score_and_keeps_ties_stable() -> None:
+    scores = np.array([0.2, 0.9, 0.5, 0.9, 0.1], dtype=np.float32)
+
+    assert [index for index, _ in top_k(scores, 3)] == [1, 3, 2]
+    assert [index for index, _ in top_k(scores, 10)] == [1, 3, 2, 0, 4]
+
+
+def test_rank_by_cosine_matches_reference_and_ignores_other_dimensions() -> None:
+    rows = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.7, 0.7, 0.0], [1.0, 0.0]]
+
+    ranked = rank_by_cosine([1.0, 0.1, 0.0], rows, 3)
+
+    assert [index for index, _ in ranked] == [0, 2, 1]
+    assert abs(ranked[0][1] - 1.0 / np.sqrt(1.01)) < 1e-6
+    assert rank_by_cosine([1.0, 0.0, 0.0], rows, 4)[-1] == (3, 0.0)
+
+
+def test_top_k_accumulator_matches_single_pass() -> None:
+    rng = np.random.default_rng(1)
+    scores = rng.random(50).astype(np.float32)
+    keys = [f"fact-{index}" for index in range(50)]
+    accumulator: TopKAccumulator[str] = TopKAccumulator(5)
+    for start in range(0, 50, 7):
+        accumulator.push(keys[start : start + 7], scores[start : start + 7])
+
+    expected = [(keys[index], score) for index, score in top_k(scores, 5)]
+    assert accumulator.results() == expected
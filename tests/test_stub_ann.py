@@ -0,0 +1,151 @@
+import os
+import uuid
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from opus_blocks.core.config import settings
+from opus_blocks.services.embeddings import embed_text
+from opus_blocks.vector_store.hnsw import HnswIndex
+from opus_blocks.vector_store.stub import StubVectorStore
+
+
+def _clustered(rng: np.random.Generator, count: int, dim: int) -> np.ndarray:
+    centres = rng.standard_normal((8, dim))
+    return (centres[rng.integers(0, 8, count)] + 0.3 * rng.standard_normal((count, dim))).astype(
+        np.float32
+    )
+
+
+def test_hnsw_recall_against_exact_search() -> None:
+    rng = np.random.default_rng(0)
+    vectors = _clustered(rng, 600, 16)
+    keys = [uuid.uuid4() for _ in range(len(vectors))]
+    index = HnswIndex(16, m=8, ef_construction=64)
+    assert index.add_many(zip(keys, vectors, strict=True)) == 600
+
+    recall = 0.0
+    queries = _clustered(rng, 20, 16)
+    for query in queries:
+        exact = {key for key, _ in index.exact(query, 10)}
+        found = {key for key, _ in index.search(query, 10, ef=64)}
+        recall += len(exact & found) / 10
+    assert recall / len(queries) >= 0.9
+
+
+def test_hnsw_deletes_filters_and_snapshots(tmp_path) -> None:
+    rng = np.random.default_rng(1)
+    vectors = _clustered(rng, 200, 8)
+    keys = [uuid.uuid4() for _ in range(len(vectors))]
+    index = HnswIndex(8, m=8, ef_construction=32)
+    index.add_many(zip(keys, vectors, strict=True))
+    query = vectors[0]
+
+    assert index.search(query, 1)[0][0] == keys[0]
+    assert index.remove(keys[0])
+    assert keys[0] not in {key for key, _ in index.search(query, 10)}
+    allowed = set(keys[100:])
+    assert {key for key, _ in index.search(query, 5, ef=200, allowed=allowed)} <= allowed
+
+    path = tmp_path / "index.npz"
+    index.save(path, metadata={"generation": 7})
+    loaded, metadata = HnswIndex.load(path)
+    assert metadata == {"generation": 7}
+    assert len(loaded) == 199 and loaded.tombstones == 1
+    assert loaded.search(query, 5) == index.search(query, 5)
+
+    loaded.compact()
+    assert loaded.tombstones == 0
+    assert [key for key, _ in loaded.exact(query, 5)] == [key for key, _ in index.exact(query, 5)]
+
+
+@pytest.mark.anyio
+async def test_stub_store_ann_tracks_writes_and_reloads_snapshot(
+    async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    email = f"user-{uuid.uuid4()}@example.com"
+    password = "Password123!"
+    await async_client.post("/api/v1/auth/register", json={"email": email, "password": password})
+    login_response = await async_client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    facts = []
+    for content in ("alpha evidence", "beta evidence", "gamma evidence"):
+        response = await async_client.post(
+            "/api/v1/facts/manual", json={"content": content}, headers=headers
+        )
+        facts.append(response.json())
+    namespace = f"user:{facts[0]['owner_id']}"
+    alpha, beta, gamma = (uuid.UUID(fact["id"]) for fact in facts)
+
+    monkeypatch.setattr(settings, "database_url", os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"])
+    monkeypatch.setattr(settings, "vector_persist_path", str(tmp_path))
+    monkeypatch.setattr(settings, "stub_ann_enabled", True)
+    # Force the graph walk even for this tiny allowed set.
+    monkeypatch.setattr(settings, "stub_ann_exact_threshold", 0)
+    engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    store = StubVectorStore()
+    ann = store._ann
+    assert ann is not None
+    model = settings.embeddings_model
+    alpha_embedding = await embed_text("alpha")
+    try:
+        async with session_factory() as session:
+            # The first query is answered exactly while the index builds in the background
+            # from fact_embeddings, which the API wrote through its own store.
+            matches = await store.query(
+                session=session, query="alpha", namespace=namespace, allowed_fact_ids=[alpha, beta]
+            )
+            assert [match.fact_id for match in matches] == [alpha, beta]
+            await ann.warm(session, namespace, model)
+            ranked = await ann.query(
+                session,
+                alpha_embedding,
+                namespace=namespace,
+                model=model,
+                allowed_fact_ids=[alpha, beta],
+                limit=2,
+            )
+            assert ranked is not None
+            assert [fact_id for fact_id, _ in ranked] == [alpha, beta]
+
+        deleted = await async_client.delete(f"/api/v1/facts/{alpha}", headers=headers)
+        assert deleted.status_code == 204
+        async with session_factory() as session:
+            # Another process wrote, so the index declines until it has caught up.
+            allowed = [alpha, beta, gamma]
+            assert (
+                await ann.query(
+                    session,
+                    alpha_embedding,
+                    namespace=namespace,
+                    model=model,
+                    allowed_fact_ids=allowed,
+                    limit=10,
+                )
+                is None
+            )
+            await ann.warm(session, namespace, model)
+            matches = await store.query(
+                session=session, query="alpha", namespace=namespace, allowed_fact_ids=allowed
+            )
+            assert alpha not in {match.fact_id for match in matches}
+            assert len(matches) == 2
+        store.close()
+        assert list((tmp_path / "stub_hnsw").glob("*.npz"))
+
+        reloaded = StubVectorStore()
+        assert reloaded._ann is not None
+        async with session_factory() as session:
+            await reloaded._ann.warm(session, namespace, model)
+            matches = await reloaded.query(
+                session=session, query="beta", namespace=namespace, allowed_fact_ids=[beta, gamma]
+            )
+            assert matches[0].fact_id == beta
+        reloaded.close()
+    finally:
+        await engine.dispose()
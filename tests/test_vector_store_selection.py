@@ -1,8 +1,19 @@
+import pytest
+
+from opus_blocks import vector_store
 from opus_blocks.core.config import settings
-from opus_blocks.vector_store import get_vector_store
+from opus_blocks.vector_store import close_vector_stores, get_vector_store
+from opus_blocks.vector_store.chroma import ChromaVectorStore
 from opus_blocks.vector_store.stub import StubVectorStore
 
 
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    vector_store._stores.clear()
+    yield
+    vector_store._stores.clear()
+
+
 def test_vector_store_defaults_to_stub(monkeypatch) -> None:
     monkeypatch.setattr(settings, "vector_backend", "stub")
     store = get_vector_store()
@@ -17,3 +28,49 @@ def test_vector_store_uses_chroma(monkeypatch) -> None:
     monkeypatch.setattr("opus_blocks.vector_store.ChromaVectorStore", DummyChroma)
     store = get_vector_store()
     assert isinstance(store, DummyChroma)
+
+
+def test_vector_store_is_created_once_per_process(monkeypatch) -> None:
+    created: list[object] = []
+    closed: list[object] = []
+
+    class DummyChroma:
+        def __init__(self) -> None:
+            created.append(self)
+
+        def close(self) -> None:
+            closed.append(self)
+
+    monkeypatch.setattr(settings, "vector_backend", "chroma")
+    monkeypatch.setattr("opus_blocks.vector_store.ChromaVectorStore", DummyChroma)
+    discarded: list[bool] = []
+    monkeypatch.setattr(
+        "opus_blocks.vector_store.discard_inherited_clients", lambda: discarded.append(True)
+    )
+
+    first = get_vector_store()
+    assert get_vector_store() is first
+    assert len(created) == 1
+
+    # A forked child sees a new pid and must not reuse the parent's client.
+    monkeypatch.setattr(vector_store.os, "getpid", lambda: -1)
+    child = get_vector_store()
+    assert child is not first
+    assert discarded == [True]
+    assert closed == []
+
+    close_vector_stores()
+    assert closed == [child]
+    assert get_vector_store() is not child
+
+
+def test_chroma_store_reuses_client_and_closes(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "vector_backend", "chroma")
+    monkeypatch.setattr(settings, "vector_persist_path", str(tmp_path))
+    monkeypatch.setattr(settings, "vector_collection", "registry_test")
+
+    store = get_vector_store()
+    assert isinstance(store, ChromaVectorStore)
+    assert get_vector_store() is store
+    close_vector_stores()
+    assert store._client._closed
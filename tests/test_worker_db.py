@@ -0,0 +1,42 @@
+import os
+
+import pytest
+from sqlalchemy import text
+
+from opus_blocks.core.config import settings
+from opus_blocks.db import worker
+from opus_blocks.db.worker import PoolStats
+
+
+def test_pool_stats_snapshot_tracks_wait_and_saturation() -> None:
+    stats = PoolStats()
+    stats.record_checkout(2.0, saturated=False, exhausted=False)
+    stats.record_checkout(6.0, saturated=True, exhausted=True)
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["checkouts"] == 2
+    assert snapshot["checkout_wait_ms_max"] == 6.0
+    assert snapshot["checkout_wait_ms_avg"] == 4.0
+    assert snapshot["saturated_checkouts"] == 1
+    assert snapshot["exhausted_checkouts"] == 1
+
+
+@pytest.mark.anyio
+async def test_worker_session_reuses_shared_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "database_url", os.environ["OPUS_BLOCKS_TEST_DATABASE_URL"])
+    monkeypatch.setattr(settings, "worker_db_pool_size", 1)
+    worker.reset_pool_stats()
+    worker.init_worker_engine()
+    try:
+        for _ in range(3):
+            async with worker.worker_session() as session:
+                assert await session.scalar(text("SELECT 1")) == 1
+
+        stats = worker.get_pool_stats()
+        assert stats["checkouts"] == 3
+        assert stats["pool_size"] == 1
+        assert stats["checked_in"] == 1
+        assert stats["checked_out"] == 0
+    finally:
+        await worker.dispose_worker_engine()
@@ -0,0 +1,33 @@
+import asyncio
+
+from opus_blocks.tasks.runtime import WorkerRuntime
+
+
+async def _current_loop() -> asyncio.AbstractEventLoop:
+    return asyncio.get_running_loop()
+
+
+def test_worker_runtime_reuses_loop_across_tasks() -> None:
+    runtime = WorkerRuntime()
+    try:
+        first = runtime.run(_current_loop())
+        second = runtime.run(_current_loop())
+        assert first is second
+        assert not first.is_closed()
+    finally:
+        runtime.stop()
+    assert first.is_closed()
+
+
+def test_worker_runtime_runs_shutdown_callbacks_on_loop() -> None:
+    runtime = WorkerRuntime()
+    loop = runtime.run(_current_loop())
+    seen: list[asyncio.AbstractEventLoop] = []
+
+    async def _close() -> None:
+        seen.append(asyncio.get_running_loop())
+
+    runtime.on_shutdown(_close)
+    runtime.stop()
+
+    assert seen == [loop]